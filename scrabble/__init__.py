@@ -1,4 +1,11 @@
 from .src.board_pos import Pos, Direction
-from .src.board import Board, MoveInfo, SquareType
+from .src.board import Board, MoveInfo, MoveEvaluation, MoveError, SquareType, SQUARE_MULTIPLIERS, GridChange, GridInference, BoardView
 from .src.move import Move
-from .src.tile import Tile
\ No newline at end of file
+from .src.tile import Tile
+from .src.lexicon import Lexicon
+from .src.gcg import parse_gcg, read_gcg, replay, Turn, TurnType, GameSummary, GCGError
+from .src.corpus import verify_corpus, verify_file, find_games, GameReport, CorpusSummary
+from .src.cache import EvaluationCache
+from .src.journal import Journal
+from .src.decoder import DecodedMove
+from .src.session import SessionManager, Subscription, TableEvent, TableUpdate, EventType
\ No newline at end of file
@@ -0,0 +1,22 @@
+from typing import Callable, Dict, List, Optional
+import sys
+
+from .lexicon import main as compile_lexicon
+from .corpus import main as verify_corpus
+
+# Command line tools, run with python -m scrabble.src <command> [arguments]. They live here rather than under
+# if __name__ == '__main__' in their modules, which the package imports eagerly, so runpy would execute them twice.
+COMMANDS: Dict[str, Callable[[Optional[List[str]]], int]] = {
+    'compile-lexicon': compile_lexicon,
+    'verify-corpus': verify_corpus,
+}
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] not in COMMANDS:
+        print(f"usage: python -m scrabble.src {{{','.join(COMMANDS)}}} [arguments]", file=sys.stderr)
+        return 2
+    return COMMANDS[argv[0]](argv[1:])
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,9 +1,37 @@
-from typing import Optional, List, Set
+from typing import TYPE_CHECKING, Optional, List, Set, Tuple, Iterable, Iterator, Mapping, Union
 from enum import Enum
+import random
+import struct
 
 from .board_pos import Pos
-from .tile import Tile
+from .tile import Tile, EMPTY_CODE, BLANK_FLAG, N_CODES, ANY_LETTER, CODE_VALUES, CODE_LETTERS
 from .move import Move, Direction
+from .lexicon import Lexicon
+from .movegen import generate_moves
+from .decoder import decode_move, DecodedMove
+from .cache import EvaluationCache
+
+if TYPE_CHECKING:
+    from .journal import Journal
+
+# (prefix, prefix_sum, suffix, suffix_sum), see Board._get_adjacent_words
+AdjacentWords = Tuple[str, int, str, int]
+# (error, score, main_word, cross_words) of a MoveEvaluation, stored independently of the move object (see Board.evaluate)
+CachedEvaluation = Tuple[Optional['MoveError'], int, Optional[str], Tuple[str, ...]]
+_NO_ADJACENT_WORDS: AdjacentWords = ('', 0, '', 0)
+
+def _run_start(mask: int, bit: int) -> int:
+    """
+    Returns the lowest bit of the run of set bits in mask which ends just below the given bit (the bit itself if the one below it is unset)
+    """
+    return (~mask & ((1 << bit) - 1)).bit_length()
+
+def _run_end(mask: int, bit: int) -> int:
+    """
+    Returns the highest bit of the run of set bits in mask which starts just above the given bit (the bit itself if the one above it is unset)
+    """
+    above = mask >> (bit + 1)
+    return bit + (~above & (above + 1)).bit_length() - 1
 
 class SquareType(Enum):
     Plain = 0
@@ -12,24 +40,324 @@ class SquareType(Enum):
     WordX2 = 3
     WordX3 = 4
 
+    @property
+    def multipliers(self):
+        """
+        Returns the (letter_multiplier, word_multiplier) applied to a tile newly placed on a square of this type
+        """
+        match self:
+            case SquareType.LetterX2:
+                return 2, 1
+            case SquareType.LetterX3:
+                return 3, 1
+            case SquareType.WordX2:
+                return 1, 2
+            case SquareType.WordX3:
+                return 1, 3
+            case SquareType.Plain:
+                return 1, 1
+
+# 225-bit masks over Pos.index
+_ALL_SQUARES = (1 << (Pos.MAX_SIZE * Pos.MAX_SIZE)) - 1
+_FIRST_COLUMN = sum(1 << (row * Pos.MAX_SIZE) for row in range(Pos.MAX_SIZE))
+_LAST_COLUMN = _FIRST_COLUMN << (Pos.MAX_SIZE - 1)
+
+# Zobrist keys: a random 64-bit value per (square, tile code), indexed by Pos.index * N_CODES + code. The hash of a
+# position is the XOR of the keys of its tiles, so placing or removing a tile updates it with a single XOR. The seed is
+# fixed so hashes are stable across processes and runs.
+def _zobrist_keys(seed: int) -> Tuple[int, ...]:
+    rng = random.Random(seed)
+    return tuple(0 if code == EMPTY_CODE else rng.getrandbits(64) for _ in range(Pos.MAX_SIZE * Pos.MAX_SIZE) for code in range(N_CODES))
+
+_ZOBRIST_KEYS = _zobrist_keys(0x5C7A8B1E)
+
+# Binary snapshot format (see Board.to_bytes): header (magic, version, reserved, number of moves), the 225 tile codes of
+# the board in row-major order, then each move as a header (number of tiles, score) followed by its (index, code) pairs
+_SNAPSHOT_MAGIC = b'SCRB'
+_SNAPSHOT_VERSION = 1
+_SNAPSHOT_HEADER = struct.Struct('<4sBBH')
+_MOVE_HEADER = struct.Struct('<Bi')
+# Codes which can appear on the board, including EMPTY_CODE
+_SQUARE_CODES = bytes(code for code in range(N_CODES) if code == EMPTY_CODE or CODE_LETTERS[code])
+# Translation table from tile codes to the ASCII letters of CODE_LETTERS, for reading runs of tiles with bytes.translate
+_CODE_LETTER_BYTES = bytes(ord(CODE_LETTERS[code]) if code < N_CODES and CODE_LETTERS[code] else 0 for code in range(256))
+
 class MoveInfo:
-    def __init__(self, move: Move, score: int):
+    def __init__(self, move: Move, score: int, footprint: Optional[int] = None):
+        self._move: Optional[Move] = move
+        self._score = score
+        self._footprint = footprint
+        self._encoded: Optional[bytes] = None
+
+    @classmethod
+    def _fromencoded(cls, encoded: bytes, score: int):
+        """
+        Constructs a MoveInfo from the (index, code) pairs of its tiles, which are only decoded into a Move when first accessed
+        """
+        info = cls(None, score) # type: ignore
+        info._encoded = encoded
+        return info
+
+    @property
+    def move(self) -> Move:
+        move = self._move
+        if move is None:
+            encoded = self._encoded
+            if encoded is None:
+                # Decoded concurrently by another reader of a shared view (see Board.snapshot), which sets _move before clearing _encoded
+                move = self._move
+                assert move is not None
+                return move
+            move = Move([Tile.fromcode(code) for code in encoded[1::2]], [Pos.fromindex(idx) for idx in encoded[::2]])
+            self._move = move
+            self._encoded = None # The move's tiles may now change (see Board.set_blanks)
+        return move
+    
+    @property
+    def score(self):
+        return self._score
+
+    @property
+    def footprint(self) -> Optional[int]:
+        """
+        Mask (indexed by Pos.index) of the squares the move's validity and score depend on, or None if unknown (see Board.retract_move)
+        """
+        return self._footprint
+
+    def _frozen(self) -> 'MoveInfo':
+        """
+        Returns this info if its move can no longer change, or otherwise a copy with a move of its own, as only unset blanks are ever modified (see Board.set_blanks)
+        """
+        if self._move is None:
+            assert self._encoded is not None
+            if BLANK_FLAG not in self._encoded[1::2]:
+                return self
+            frozen = MoveInfo._fromencoded(self._encoded, self._score)
+            frozen._footprint = self._footprint
+            return frozen
+        if self._move.n_of_unset_blanks == 0:
+            return self
+        return MoveInfo(self._move.copy(), self._score, self._footprint)
+
+    def _encode(self) -> bytes:
+        """
+        Returns the (index, code) pairs of the move's tiles, packed into bytes
+        """
+        if self._move is None:
+            assert self._encoded is not None
+            return self._encoded
+        return bytes(b for tile, pos in self._move for b in (pos.index, tile.code))
+
+class MoveError(Enum):
+    InvalidShape = 0 # Tiles are not along a single line, or share a position
+    OutOfBounds = 1
+    NoAnchor = 2
+    Discontinuous = 3
+    Occupied = 4
+
+class MoveEvaluation:
+    """
+    Result of evaluating a move against a board position without applying it.
+    """
+    def __init__(self, move: Move, error: Optional[MoveError], score: int = 0, main_word: Optional[str] = None, cross_words: Tuple[str, ...] = ()):
         self._move = move
+        self._error = error
         self._score = score
+        self._main_word = main_word
+        self._cross_words = cross_words
 
     @property
     def move(self):
         return self._move
-    
+
+    @property
+    def is_valid(self):
+        return self._error is None
+
+    @property
+    def error(self):
+        """
+        The reason the move is invalid, or None if it is valid
+        """
+        return self._error
+
     @property
     def score(self):
         return self._score
 
+    @property
+    def main_word(self):
+        """
+        The word formed along the direction of play (unset blanks shown as '?'), or None if the move is invalid
+        """
+        return self._main_word
+
+    @property
+    def cross_words(self):
+        """
+        The words formed perpendicular to the direction of play, in board order (unset blanks shown as '?')
+        """
+        return self._cross_words
+
+    @property
+    def words(self) -> Optional[Set[str]]:
+        """
+        The set of words formed by the move, or None if the move is invalid or has unset blanks (matching Board.get_challenge_words)
+        """
+        if self._main_word is None or '?' in self._main_word or any('?' in word for word in self._cross_words):
+            return None
+        return set((self._main_word,) + self._cross_words)
+
+    def __repr__(self) -> str:
+        if self._error is not None:
+            return f"MoveEvaluation({self._move}, {self._error})"
+        return f"MoveEvaluation({self._move}, score={self._score}, words={[self._main_word, *self._cross_words]})"
+
+class GridChange(Enum):
+    NoChange = 0
+    NewMove = 1 # Tiles were added on empty squares, forming a valid move
+    Retraction = 2 # The tiles of a move were removed, and nothing else changed
+    Inconsistent = 3 # Any other difference, or added tiles which don't form a valid move
+
+class GridInference:
+    """
+    Result of comparing a full-grid reading with the board position (see Board.infer_move).
+    """
+    def __init__(self, change: GridChange, move: Optional[Move] = None, move_index: Optional[int] = None,
+                 squares: Tuple[Pos, ...] = (), evaluation: Optional[MoveEvaluation] = None):
+        self._change = change
+        self._move = move
+        self._move_index = move_index
+        self._squares = squares
+        self._evaluation = evaluation
+
+    @property
+    def change(self):
+        return self._change
+
+    @property
+    def move(self) -> Optional[Move]:
+        """
+        The new move, or the retracted move
+        """
+        return self._move
+
+    @property
+    def move_index(self) -> Optional[int]:
+        """
+        The index in the history of the retracted move (see Board.retract_move)
+        """
+        return self._move_index
+
+    @property
+    def squares(self) -> Tuple[Pos, ...]:
+        """
+        The squares which differ from the board position, in board order
+        """
+        return self._squares
+
+    @property
+    def evaluation(self) -> Optional[MoveEvaluation]:
+        """
+        The evaluation of the tiles added, if no tiles were removed or changed
+        """
+        return self._evaluation
+
+    def __repr__(self) -> str:
+        if self._change is GridChange.Inconsistent:
+            return f"GridInference({self._change.name}, squares={list(self._squares)})"
+        elif self._move is not None:
+            return f"GridInference({self._change.name}, {self._move})"
+        return f"GridInference({self._change.name})"
+
+class BoardView:
+    """
+    Immutable view of a board as of one of its modifications (see Board.snapshot), holding a copy of its tile codes and the moves of its history at the time. Safe to read from any thread while the board keeps being modified.
+    """
+    __slots__ = ('_squares', '_move_info', '_hash', '_version')
+
+    def __init__(self, squares: bytes, move_info: Tuple[MoveInfo, ...], position_hash: int, version: int):
+        self._squares = squares
+        self._move_info = move_info
+        self._hash = position_hash
+        self._version = version
+
+    @property
+    def version(self) -> int:
+        """
+        Number of modifications of the board before this view was published, which increases with every modification
+        """
+        return self._version
+
+    @property
+    def position_hash(self) -> int:
+        return self._hash
+
+    @property
+    def n_moves(self) -> int:
+        return len(self._move_info)
+
+    @property
+    def grid(self) -> memoryview:
+        """
+        Read-only view of the tile codes of the board (see Board.grid)
+        """
+        return memoryview(self._squares)
+
+    def moves(self):
+        """
+        Generates all the moves that had been performed on the board in order
+        """
+        for m in self._move_info:
+            yield m.move
+
+    def get_score(self, n: int = -1):
+        """
+        Returns the score of the n-th move (latest by default)
+        """
+        return self._move_info[n].score
+
+    def get_tile(self, pos: Pos) -> Optional[Tile]:
+        return Board._decode(self._squares[pos.index])
+
+    def __iter__(self):
+        """
+        Generates the rows of the board, with each square holding a Tile or None if empty
+        """
+        for row in range(Board.DIM):
+            offset = row * Board.DIM
+            yield [Board._decode(code) for code in self._squares[offset:offset + Board.DIM]]
+
+    def __repr__(self) -> str:
+        return f"BoardView(version={self._version}, {len(self._move_info)} moves)"
+
+_EMPTY_VIEW = BoardView(bytes(Pos.MAX_SIZE * Pos.MAX_SIZE), (), 0, 0)
+
 class Board:
     DIM = Pos.MAX_SIZE
-    def __init__(self):
-        self._board: List[List[Optional[Tile]]] = [[None] * Board.DIM for _ in range(Board.DIM)]
+    N_SQUARES = DIM * DIM
+    CENTER = Pos(7, 7)
+
+    def __init__(self, cache: Optional[EvaluationCache[CachedEvaluation]] = None):
+        # Flat row-major array of tile codes (see Tile.code), with EMPTY_CODE marking empty squares. May be a writable memoryview of an external buffer (see from_bytes).
+        self._board: Union[bytearray, memoryview] = bytearray(Board.N_SQUARES)
+        # Occupancy bitmask of each row (indexed by Direction.Horizontal) and column (Direction.Vertical), where bit i is set if the i-th square along the line holds a tile
+        self._line_masks: List[List[int]] = [[0] * Board.DIM for _ in Direction]
         self._move_info: List[MoveInfo] = []
+        # For each direction and empty square, the runs of tiles adjacent to it along that direction (see _get_adjacent_words), maintained incrementally as tiles are placed and removed
+        self._adjacent_words: List[List[AdjacentWords]] = [[_NO_ADJACENT_WORDS] * Board.N_SQUARES for _ in Direction]
+        # 225-bit masks indexed by Pos.index of occupied squares, and of anchor squares (see anchors)
+        self._occupied = 0
+        self._anchors = 1 << Board.CENTER.index
+        self._hash = 0
+        self._cache = cache
+        self._journal: Optional['Journal'] = None
+        # Set if the containers above may be shared with a fork (see fork), in which case they are copied before being written to
+        self._shared = False
+        # Number of leading entries of _move_info whose moves may be shared with a fork
+        self._n_shared_moves = 0
+        # View of the board as of its latest modification, replaced rather than modified (see snapshot)
+        self._view = _EMPTY_VIEW
 
     def moves(self):
         """
@@ -38,26 +366,277 @@ class Board:
         for m in self._move_info:
             yield m.move
 
+    @property
+    def anchors(self) -> int:
+        """
+        Bitmask (indexed by Pos.index) of the anchor squares: empty squares adjacent to a tile, or the center square on an empty board. Every valid move places at least one tile on an anchor.
+        """
+        return self._anchors
+
+    @property
+    def cache(self) -> Optional[EvaluationCache[CachedEvaluation]]:
+        """
+        The cache of move evaluations used by evaluate, if any. May be shared between boards.
+        """
+        return self._cache
+
+    @cache.setter
+    def cache(self, cache: Optional[EvaluationCache[CachedEvaluation]]):
+        self._cache = cache
+
+    @property
+    def journal(self) -> Optional['Journal']:
+        """
+        The journal every modification of the board is logged to, if any (see Journal.recover). A snapshot of the board is written when attaching an empty journal to a board with moves, so the journal describes its whole history.
+        """
+        return self._journal
+
+    @journal.setter
+    def journal(self, journal: Optional['Journal']):
+        if journal is not None and journal.n_records == 0 and self._move_info:
+            journal.checkpoint(self)
+        self._journal = journal
+
+    @property
+    def position_hash(self) -> int:
+        """
+        64-bit Zobrist hash of the tiles on the board (including blank designations), maintained incrementally as tiles are placed and removed. Equal positions have equal hashes, regardless of the moves which led to them.
+        """
+        return self._hash
+
+    def fork(self) -> 'Board':
+        """
+        Returns a logically independent copy of the board, sharing its tile storage and move history until either board is modified. Only the containers touched by a modification are copied, and the moves of the history are shared rather than copied.
+        """
+        fork = Board.__new__(Board)
+        # A board wrapping an external buffer keeps writing through to it, so the fork gets its own copy of the squares
+        fork._board = self._board if isinstance(self._board, bytearray) else bytearray(self._board)
+        fork._line_masks = self._line_masks
+        fork._move_info = self._move_info
+        fork._adjacent_words = self._adjacent_words
+        fork._occupied = self._occupied
+        fork._anchors = self._anchors
+        fork._hash = self._hash
+        fork._cache = self._cache
+        fork._journal = None # Only the original is logged
+        fork._shared = self._shared = True
+        fork._n_shared_moves = self._n_shared_moves = len(self._move_info)
+        fork._view = self._view
+        return fork
+
+    def snapshot(self) -> BoardView:
+        """
+        Returns an immutable view of the board as of its latest modification. A new view is published at the end of every modification, so taking a snapshot copies nothing and never waits for a modification in progress: readers on other threads see either the state before it or after it, never a mix of both.
+        """
+        return self._view
+
+    def __copy__(self):
+        return self.fork()
+
+    def __deepcopy__(self, memo):
+        return self.fork()
+
+    def anchor_positions(self):
+        """
+        Generates the positions of all anchor squares in board order
+        """
+        anchors = self._anchors
+        while anchors:
+            lowest = anchors & -anchors
+            yield Pos.fromindex(lowest.bit_length() - 1)
+            anchors ^= lowest
+
     def apply_move(self, move: Move) -> bool:
         """
-        Applies the specified move to the board. Returns true if move was applied successfully, false if move was invalid (application did not take place)
+        Applies the specified move to the board. Returns true if move was applied successfully, false if move was invalid (application did not take place). The board keeps the move itself, so its blanks may also be designated through the move (with Move.set_blanks), which the board picks up the next time it is used.
         """
-        if not (move.is_valid and self._has_anchor(move) and self._is_continuous(move)):
+        self._sync_blanks()
+        evaluation = self.evaluate(move)
+        if evaluation.error is MoveError.Occupied:
+            raise ValueError(f"Tried to place tile on non-empty board position in move {move}")
+        elif not evaluation.is_valid:
             return False
 
-        for (tile, pos) in move: # type: ignore
-            self._place_tile(tile, pos)
-        
-        score = self._get_score(move)
-        self._move_info.append(MoveInfo(move, score))
+        self._commit_move(move, evaluation.score)
+        self._publish()
+        if self._journal is not None:
+            self._journal.log_apply(move, evaluation.score)
         return True
+
+    def retract_move(self, index: int) -> List[Move]:
+        """
+        Removes the move at the given index of the history (e.g. a misread move found several turns later), keeping the moves after it. Only the later moves which depend on the squares of the retracted move are re-validated and rescored, and those which became invalid are removed as well. Returns the removed later moves in order.
+        """
+        return self._rewrite_history(index, None)
+
+    def replace_move(self, index: int, new_move: Move) -> List[Move]:
+        """
+        Replaces the move at the given index of the history with new_move, which must be valid on the position it was played on (raises ValueError otherwise, leaving the board unchanged). Only the later moves which depend on the changed squares are re-validated and rescored, and those which became invalid are removed. Returns the removed later moves in order.
+        """
+        return self._rewrite_history(index, new_move)
+
+    def evaluate(self, move: Move) -> MoveEvaluation:
+        """
+        Validates and scores the specified move against the current board position without modifying the board, returning the score and words formed if the move is valid, or the reason it is invalid otherwise. If the board has a cache, results are looked up by position hash and move, and only computed on a miss.
+        """
+        self._sync_blanks()
+        cache = self._cache
+        if cache is None:
+            return self._evaluate(move)
+
+        key = (self._hash, tuple((pos, tile.code) for tile, pos in move))
+        cached = cache.get(key)
+        if cached is not None:
+            return MoveEvaluation(move, *cached)
+
+        evaluation = self._evaluate(move)
+        cache.put(key, (evaluation.error, evaluation.score, evaluation.main_word, evaluation.cross_words))
+        return evaluation
+
+    def _evaluate(self, move: Move) -> MoveEvaluation:
+        if not move.is_valid:
+            return MoveEvaluation(move, MoveError.InvalidShape)
+        elif not move.in_bounds:
+            return MoveEvaluation(move, MoveError.OutOfBounds)
+        
+        move_mask = move.mask
+        if move_mask & self._occupied:
+            return MoveEvaluation(move, MoveError.Occupied)
+        elif not move_mask & self._anchors:
+            return MoveEvaluation(move, MoveError.NoAnchor)
+        elif not self._is_continuous(move):
+            return MoveEvaluation(move, MoveError.Discontinuous)
+        
+        board = self._board
+        overlay = {pos.index: tile.code for tile, pos in move}
+
+        # Tiles between the start and end of the move are either newly placed or already on the board (the move is continuous), and the adjacent words give the rest of the main word
+        direction = self._get_main_direction(move)
+        start, end = move.start.index, move.end.index
+        prefix, prefix_sum, _, _ = self._get_adjacent_words(start, direction)
+        _, _, suffix, suffix_sum = self._get_adjacent_words(end, direction)
+        main_score = prefix_sum + suffix_sum
+        main_word_multiplier = 1
+        letters = [prefix]
+        for idx in range(start, end + 1, Board._stride(direction)):
+            code = board[idx]
+            if code == EMPTY_CODE: # Only newly placed tiles (checked against the occupancy mask above) can be on empty squares
+                code = overlay[idx]
+                letter_multiplier, word_multiplier = SQUARE_MULTIPLIERS[idx]
+                main_score += letter_multiplier * CODE_VALUES[code]
+                main_word_multiplier *= word_multiplier
+            else:
+                main_score += CODE_VALUES[code]
+            letters.append(CODE_LETTERS[code])
+        letters.append(suffix)
+        main_score *= main_word_multiplier
+        bingo_bonus = 50 * (len(overlay) == 7)
+
+        cross_score = 0
+        cross_words = []
+        opposite = direction.opposite
+        for idx, code in overlay.items():
+            prefix, prefix_sum, suffix, suffix_sum = self._get_adjacent_words(idx, opposite)
+            if prefix or suffix:
+                letter_multiplier, word_multiplier = SQUARE_MULTIPLIERS[idx]
+                cross_score += (prefix_sum + letter_multiplier * CODE_VALUES[code] + suffix_sum) * word_multiplier
+                cross_words.append(prefix + CODE_LETTERS[code] + suffix)
+
+        return MoveEvaluation(move, None, main_score + cross_score + bingo_bonus, ''.join(letters), tuple(cross_words))
+
+    def score_many(self, moves: Iterable[Move]):
+        """
+        Generates the evaluation (see evaluate) of each move in moves against the current board position, in order. Moves may be given as any iterable, including a lazy stream. The words adjacent to each square are maintained with the board position and shared between all candidates.
+        """
+        for move in moves:
+            yield self.evaluate(move)
     
+    def generate_moves(self, rack: Iterable[str], lexicon: Lexicon) -> Iterator[MoveEvaluation]:
+        """
+        Returns a generator of the evaluations (see evaluate) of every legal move that can be played from the rack on the current board position, such that all words formed are in the lexicon. The rack is given as 1-7 letters in Woogles format, with '?' for blanks (e.g. "AEINST?"), and moves using blanks are generated for every designation. Raises ValueError straight away if the rack is invalid.
+        """
+        self._sync_blanks()
+        return generate_moves(self, rack, lexicon)
+
+    def decode_move(self, squares: Mapping[Pos, Mapping[str, float]], k: int = 5, lexicon: Optional[Lexicon] = None,
+                    beam_width: int = 64, invalid_word_penalty: Optional[float] = None) -> List[DecodedMove]:
+        """
+        Returns the k most likely legal moves on the current board position (most likely first), given for each newly occupied square a probability distribution over the tile read on it, keyed by 'A'-'Z' for letters, 'a'-'z' for designated blanks and '?' for an undesignated blank (e.g. from a tile classifier). Tiles are decoded with a beam search along the main word, keeping the beam_width most likely partial readings. If a lexicon is given, readings forming words which aren't in it are pruned as early as possible, or if invalid_word_penalty is set, kept with their log likelihood reduced by the penalty for each invalid word.
+        """
+        self._sync_blanks()
+        return decode_move(self, squares, k, lexicon, beam_width, invalid_word_penalty)
+
+    def infer_move(self, grid) -> GridInference:
+        """
+        Compares a full-grid reading of the board (e.g. from a camera) with the current position, and classifies the difference as no change, a new move, the retraction of a move in the history, or an inconsistent reading. The grid is given as any buffer (bytes, bytearray, memoryview, or a uint8 array) of the 225 tile codes (see Tile.code) in row-major order, matching grid. A blank read without its designation matches a blank with any designation.
+        """
+        self._sync_blanks()
+        codes = bytes(memoryview(grid).cast('B'))
+        if len(codes) != Board.N_SQUARES:
+            raise ValueError(f"Grid readings must contain {Board.N_SQUARES} tile codes, got {len(codes)}")
+        board = bytes(self._board)
+        if codes == board:
+            return GridInference(GridChange.NoChange)
+        elif codes.translate(None, _SQUARE_CODES):
+            raise ValueError("Grid reading contains invalid tile codes")
+
+        # Compare whole rows first, then the squares of the rows which differ
+        added, removed, changed = [], [], []
+        for offset in range(0, Board.N_SQUARES, Board.DIM):
+            if codes[offset:offset + Board.DIM] == board[offset:offset + Board.DIM]:
+                continue
+            for idx in range(offset, offset + Board.DIM):
+                read, current = codes[idx], board[idx]
+                if read == current:
+                    continue
+                elif current == EMPTY_CODE:
+                    added.append(idx)
+                elif read == EMPTY_CODE:
+                    removed.append(idx)
+                elif not (read & current & BLANK_FLAG and (read == BLANK_FLAG or current == BLANK_FLAG)):
+                    changed.append(idx)
+
+        if not (added or removed or changed):
+            return GridInference(GridChange.NoChange) # Only blank designations which weren't read differ
+        elif added and not (removed or changed):
+            squares = tuple(Pos.fromindex(idx) for idx in added)
+            if len(added) > 7:
+                return GridInference(GridChange.Inconsistent, squares=squares)
+            move = Move([Tile.fromcode(codes[idx]) for idx in added], list(squares))
+            evaluation = self.evaluate(move)
+            if evaluation.is_valid:
+                return GridInference(GridChange.NewMove, move, squares=squares, evaluation=evaluation)
+            return GridInference(GridChange.Inconsistent, move, squares=squares, evaluation=evaluation)
+        elif removed and not (added or changed):
+            removed_mask = sum(1 << idx for idx in removed)
+            for index in range(len(self._move_info) - 1, -1, -1):
+                move = self._move_info[index].move
+                if move.mask == removed_mask:
+                    return GridInference(GridChange.Retraction, move, index, tuple(Pos.fromindex(idx) for idx in removed))
+
+        return GridInference(GridChange.Inconsistent, squares=tuple(Pos.fromindex(idx) for idx in sorted(added + removed + changed)))
+
     def set_blanks(self, blanks: str) -> bool:
         """
         Sets the blank tiles for the last move specified by blanks in word order. Returns true if operation completed successfully, false otherwise.
         """
+        self._unshare()
+        if len(self._move_info) <= self._n_shared_moves:
+            # Blanks are set on the move itself, so give this board its own copy first
+            move_info = self._move_info[-1]
+            self._move_info[-1] = MoveInfo(move_info.move.copy(), move_info.score, move_info.footprint)
+            self._n_shared_moves = len(self._move_info) - 1
+
         move = self._move_info[-1].move
-        return move.set_blanks(blanks)
+        # Nothing is changed unless there is a letter for each unset blank
+        modifies = move.n_of_unset_blanks == len(blanks)
+        success = move.set_blanks(blanks)
+        # Keep stored codes in sync with the move's tiles, even if only some blanks could be set
+        self._copy_blank_codes(move)
+        self._publish()
+        if self._journal is not None and modifies:
+            self._journal.log_set_blanks(blanks)
+        return success
         
     def get_score(self, n: int = -1):
         """
@@ -69,28 +648,104 @@ class Board:
         """
         Returns the set of words formed by the latest move, or None if an error is encountered.
         """
+        self._sync_blanks()
         move = self._move_info[-1].move
         if move.n_of_unset_blanks > 0:
             return None
         
         return self._get_words_formed(move)
     
+    def get_invalid_words(self, lexicon: Lexicon) -> Optional[Set[str]]:
+        """
+        Returns the set of words formed by the latest move which aren't in the lexicon (empty if the move can't be challenged off), or None if an error is encountered.
+        """
+        words = self.get_challenge_words()
+        if words is None:
+            return None
+        return set(word for word in words if word not in lexicon)
+
+    def infer_blanks(self, lexicon: Lexicon) -> List[str]:
+        """
+        Returns every designation of the unset blanks of the latest move (as lowercase letters in word order, which can be passed to set_blanks) such that all the words formed are in the lexicon, in alphabetical order. Raises ValueError if no move has been applied. The letters of each blank are restricted by its perpendicular word, then the main word is followed through the lexicon, so only designations forming valid prefixes are explored.
+        """
+        if not self._move_info:
+            raise ValueError("No move has been applied to infer blanks for")
+        self._sync_blanks()
+        move = self._move_info[-1].move
+        board = self._board
+        direction = self._get_main_direction(move)
+        opposite = direction.opposite
+
+        # Letters allowed on each unset blank of the move by its perpendicular word
+        allowed = {}
+        for tile, pos in move:
+            idx = pos.index
+            blank = tile.is_blank and not tile.is_set
+            if blank:
+                allowed[idx] = ANY_LETTER
+            if not self._forms_new_word(idx, opposite):
+                continue
+
+            word_range = self._get_word_range(idx, opposite)
+            prefix = ''.join(CODE_LETTERS[board[i]] for i in word_range if i < idx)
+            suffix = ''.join(CODE_LETTERS[board[i]] for i in word_range if i > idx)
+            if '?' in prefix + suffix:
+                continue # Contains a blank from an earlier move, which can't be checked
+            elif blank:
+                allowed[idx] = lexicon.cross_check_mask(prefix, suffix)
+            elif prefix + CODE_LETTERS[board[idx]] + suffix not in lexicon:
+                return [] # No designation can make this word valid
+
+        designations: List[str] = []
+        indices = list(self._get_word_range(move.start.index, direction))
+        def extend(i: int, node: int, is_word: bool, designation: List[str]):
+            if i == len(indices):
+                if is_word:
+                    designations.append(''.join(designation))
+                return
+
+            idx = indices[i]
+            code = board[idx]
+            if code != BLANK_FLAG:
+                step = lexicon.follow(node, code & ~BLANK_FLAG)
+                if step is not None:
+                    extend(i + 1, step[0], step[1], designation)
+                return
+
+            # Unset blanks from earlier moves may stand for any letter, but aren't designated
+            letters = allowed.get(idx, ANY_LETTER)
+            for letter, child, child_is_word in lexicon.edges(node):
+                if letters >> letter & 1:
+                    if idx in allowed:
+                        designation.append(chr(ord('a') + letter - 1))
+                    extend(i + 1, child, child_is_word, designation)
+                    if idx in allowed:
+                        designation.pop()
+
+        extend(0, lexicon.root, False, [])
+        return sorted(set(designations))
+    
     def undo_move(self) -> MoveInfo:
         """
         Undoes the latest move and returns its related info
         """
         if len(self._move_info) == 0:
             raise RuntimeError("Called undo move when no moves have been applied")
+        self._sync_blanks()
         
-        move_info = self._move_info[-1]
-        for pos in move_info.move.coordinates:
-            self._board[pos.row][pos.col] = None
-
-        del self._move_info[-1]
+        move_info = self._pop_move()
+        self._publish()
+        if self._journal is not None:
+            self._journal.log_undo()
         return move_info
     
     def __iter__(self):
-        return iter(self._board)
+        """
+        Generates the rows of the board, with each square holding a Tile or None if empty
+        """
+        for row in range(Board.DIM):
+            offset = row * Board.DIM
+            yield [Board._decode(code) for code in self._board[offset:offset + Board.DIM]]
     
     def __repr__(self) -> str:
         res = "    " + "   ".join(chr(ord('A') + i) for i in range(15)) + "\n"
@@ -107,128 +762,438 @@ class Board:
         return res
     
     def get_tile(self, pos: Pos) -> Optional[Tile]:
-        return self._board[pos.row][pos.col]
+        return Board._decode(self._board[pos.index])
+
+    @property
+    def grid(self) -> memoryview:
+        """
+        Read-only view of the tile codes of the board (see Tile.code) in row-major order, indexed by Pos.index. Reflects later changes to the board.
+        """
+        return memoryview(self._board).toreadonly()
+
+    def to_bytes(self) -> bytes:
+        """
+        Serialises the board into a compact binary snapshot: the tile code of each square followed by a packed log of the moves applied, with their scores. Restore it with from_bytes.
+        """
+        self._sync_blanks()
+        parts = [_SNAPSHOT_HEADER.pack(_SNAPSHOT_MAGIC, _SNAPSHOT_VERSION, 0, len(self._move_info)), bytes(self._board)]
+        for move_info in self._move_info:
+            encoded = move_info._encode()
+            parts.append(_MOVE_HEADER.pack(len(encoded) // 2, move_info.score))
+            parts.append(encoded)
+        return b''.join(parts)
+
+    @classmethod
+    def from_bytes(cls, data, copy: bool = True):
+        """
+        Restores a board from a snapshot written by to_bytes, given as any bytes-like object. The tiles of each square are read directly from the snapshot and moves are only decoded when accessed. If copy is False, the board wraps the squares of the given (writable) buffer rather than copying them, so later changes to the board are written through to it.
+        """
+        view = memoryview(data).cast('B')
+        if len(view) < _SNAPSHOT_HEADER.size + Board.N_SQUARES:
+            raise ValueError("Board snapshot is truncated")
+        magic, version, _, n_moves = _SNAPSHOT_HEADER.unpack_from(view)
+        if magic != _SNAPSHOT_MAGIC or version != _SNAPSHOT_VERSION:
+            raise ValueError(f"Not a valid board snapshot (version {_SNAPSHOT_VERSION})")
+
+        offset = _SNAPSHOT_HEADER.size
+        squares = view[offset:offset + Board.N_SQUARES]
+        if bytes(squares).translate(None, _SQUARE_CODES):
+            raise ValueError("Board snapshot contains invalid tile codes")
+        offset += Board.N_SQUARES
+
+        move_info = []
+        n_tiles = 0
+        for _ in range(n_moves):
+            if offset + _MOVE_HEADER.size > len(view):
+                raise ValueError("Board snapshot is truncated")
+            n, score = _MOVE_HEADER.unpack_from(view, offset)
+            offset += _MOVE_HEADER.size
+            encoded = bytes(view[offset:offset + 2 * n])
+            offset += 2 * n
+            if not 0 < n <= 7 or len(encoded) != 2 * n or any(idx >= Board.N_SQUARES or squares[idx] != code for idx, code in zip(encoded[::2], encoded[1::2])):
+                raise ValueError("Board snapshot contains a move inconsistent with its squares")
+            move_info.append(MoveInfo._fromencoded(encoded, score))
+            n_tiles += n
+        if offset != len(view) or n_tiles != Board.N_SQUARES - bytes(squares).count(EMPTY_CODE):
+            raise ValueError("Board snapshot is inconsistent")
+
+        board = cls()
+        if copy:
+            board._board = bytearray(squares)
+        elif squares.readonly:
+            raise ValueError("Can only wrap a writable buffer, copy the snapshot instead")
+        else:
+            board._board = squares
+        board._move_info = move_info
+        board._rebuild()
+        board._publish()
+        return board
+
+    def __reduce__(self):
+        return (Board.from_bytes, (self.to_bytes(),))
+
+    @staticmethod
+    def _decode(code: int) -> Optional[Tile]:
+        return None if code == EMPTY_CODE else Tile.fromcode(code)
+
+    def _commit_move(self, move: Move, score: int):
+        """
+        Places the tiles of a validated move and appends it to the history
+        """
+        for tile, pos in move:
+            self._place_tile(tile, pos)
+        self._move_info.append(MoveInfo(move, score, self._get_footprint(move)))
+
+    def _push_move(self, move_info: MoveInfo):
+        """
+        Places the tiles of a move from the history and appends it as is, without re-evaluating it
+        """
+        for tile, pos in move_info.move:
+            self._place_tile(tile, pos)
+        self._move_info.append(move_info)
+
+    def _pop_move(self) -> MoveInfo:
+        """
+        Removes the tiles of the latest move and pops it from the history
+        """
+        move_info = self._move_info[-1]
+        for pos in move_info.move.coordinates:
+            self._remove_tile(pos)
+
+        del self._move_info[-1]
+        self._n_shared_moves = min(self._n_shared_moves, len(self._move_info))
+        return move_info
+
+    def _rewrite_history(self, index: int, new_move: Optional[Move]) -> List[Move]:
+        """
+        Retracts the move at index of the history, or replaces it with new_move, then re-applies the moves after it. A later move is only re-evaluated if its footprint contains a changed square (or if it becomes the first move), as its evaluation can't have changed otherwise.
+        """
+        n_moves = len(self._move_info)
+        if not -n_moves <= index < n_moves:
+            raise IndexError(f"No move at index {index}, {n_moves} moves have been applied")
+        index %= n_moves
+        self._sync_blanks()
+
+        n_shared_moves = self._n_shared_moves
+        later = [self._pop_move() for _ in range(n_moves - index - 1)][::-1]
+        old_info = self._pop_move()
+        changed = {pos.index: tile.code for tile, pos in old_info.move}
+        if new_move is not None:
+            evaluation = self.evaluate(new_move)
+            if not evaluation.is_valid:
+                for move_info in [old_info] + later:
+                    self._push_move(move_info)
+                self._n_shared_moves = n_shared_moves
+                raise ValueError(f"Invalid replacement {new_move} for move {index}: {evaluation.error}")
+
+            self._commit_move(new_move, evaluation.score)
+            for tile, pos in new_move:
+                if changed.get(pos.index) == tile.code:
+                    del changed[pos.index] # Same tile on the same square
+                else:
+                    changed[pos.index] = tile.code
+        changed_mask = sum(1 << idx for idx in changed)
+
+        invalid_moves = []
+        for i, move_info in enumerate(later, start=index + 1):
+            if move_info.footprint is not None and not move_info.footprint & changed_mask and self._move_info:
+                self._push_move(move_info)
+                if i < n_shared_moves:
+                    self._n_shared_moves = len(self._move_info)
+                continue
+
+            move = move_info.move
+            evaluation = self.evaluate(move)
+            if evaluation.is_valid:
+                self._commit_move(move, evaluation.score)
+                if i < n_shared_moves:
+                    self._n_shared_moves = len(self._move_info)
+            else:
+                invalid_moves.append(move)
+                changed_mask |= move.mask
+
+        self._publish()
+        if self._journal is not None:
+            if new_move is None:
+                self._journal.log_retract(index)
+            else:
+                self._journal.log_replace(index, new_move)
+        return invalid_moves
+
+    def _sync_blanks(self):
+        """
+        Picks up blanks of the latest move which were designated through the move itself rather than set_blanks (see apply_move), updating the stored codes, logging the designation and publishing a new view
+        """
+        if not self._move_info or BLANK_FLAG not in self._board:
+            return # No unset blanks are stored
+        move = self._move_info[-1].move
+        designated = ''.join(tile.format() for tile, pos in move if tile.is_blank and self._board[pos.index] != tile.code)
+        if not designated:
+            return
+        self._unshare()
+        self._copy_blank_codes(move)
+        self._publish()
+        if self._journal is not None:
+            self._journal.log_set_blanks(designated)
+
+    def _copy_blank_codes(self, move: Move):
+        """
+        Updates the stored codes of the blanks of a move on the board to match its tiles
+        """
+        for tile, pos in move:
+            if tile.is_blank and self._board[pos.index] != tile.code:
+                idx = pos.index
+                self._hash ^= _ZOBRIST_KEYS[idx * N_CODES + self._board[idx]] ^ _ZOBRIST_KEYS[idx * N_CODES + tile.code]
+                self._board[idx] = tile.code
+                self._update_adjacent_words(idx)
+
+    def _publish(self):
+        """
+        Replaces the view returned by snapshot with one of the current state. The view shares the moves of the history which can no longer change, and holds copies of those with unset blanks, so set_blanks still designates the board's moves in place.
+        """
+        move_info = tuple(info._frozen() for info in self._move_info)
+        self._view = BoardView(bytes(self._board), move_info, self._hash, self._view.version + 1)
+
+    def _get_footprint(self, move: Move) -> int:
+        """
+        Returns a mask (indexed by Pos.index) of the squares the evaluation of a move depends on, given its tiles are on the board: the words through each of its tiles along both directions, and the squares just beyond their ends
+        """
+        footprint = 0
+        for pos in move.coordinates:
+            for dir in Direction:
+                line, bit = Board._get_line_position(pos.index, dir)
+                mask = self._line_masks[dir.value][line]
+                line_start, stride = Board._get_line_start(line, dir), Board._stride(dir)
+                for b in range(max(_run_start(mask, bit) - 1, 0), min(_run_end(mask, bit) + 1, Board.DIM - 1) + 1):
+                    footprint |= 1 << (line_start + b * stride)
+        return footprint
+
+    def _unshare(self):
+        """
+        Copies the containers this board shares with a fork, so it can modify them
+        """
+        if not self._shared:
+            return
+        if isinstance(self._board, bytearray): # Otherwise an external buffer only this board uses (see fork)
+            self._board = bytearray(self._board)
+        self._line_masks = [list(masks) for masks in self._line_masks]
+        self._move_info = list(self._move_info)
+        self._adjacent_words = [list(words) for words in self._adjacent_words]
+        self._shared = False
 
     def _place_tile(self, tile: Tile, pos: Pos):
-        if self.get_tile(pos) is not None:
+        idx = pos.index
+        if self._board[idx] != EMPTY_CODE:
             raise ValueError(f"Tried to place tile on non-empty board position {pos}")
-        self._board[pos.row][pos.col] = tile
+        self._unshare()
+        code = tile.code
+        self._board[idx] = code
+        self._hash ^= _ZOBRIST_KEYS[idx * N_CODES + code]
+        row, col = divmod(idx, Board.DIM)
+        self._line_masks[Direction.Horizontal.value][row] |= 1 << col
+        self._line_masks[Direction.Vertical.value][col] |= 1 << row
+        self._occupied |= 1 << idx
+        self._update_anchors()
+        self._update_adjacent_words(idx)
 
     def _remove_tile(self, pos: Pos):
-        if self.get_tile(pos) is None:
+        idx = pos.index
+        code = self._board[idx]
+        if code == EMPTY_CODE:
             raise ValueError(f"Tried to remove tile from empty board position {pos}")
-        self._board[pos.row][pos.col] = None
+        self._unshare()
+        self._board[idx] = EMPTY_CODE
+        self._hash ^= _ZOBRIST_KEYS[idx * N_CODES + code]
+        row, col = divmod(idx, Board.DIM)
+        self._line_masks[Direction.Horizontal.value][row] &= ~(1 << col)
+        self._line_masks[Direction.Vertical.value][col] &= ~(1 << row)
+        self._occupied &= ~(1 << idx)
+        self._update_anchors()
+        self._update_adjacent_words(idx)
 
-    def _has_anchor(self, move: Move):
+    def _rebuild(self):
         """
-        Checks that a move is touching an existing letter (or is going through the center square), and that all tiles are adjacent to another tile
+        Recomputes all state derived from the tile codes of the board (occupancy masks, anchors, adjacent words and hash), e.g. after restoring them from a snapshot
         """
-        for _, pos in move:
-            if pos == Pos(7, 7): # Center tile
-                return True
-            
-            if any(self.get_tile(adj) is not None for adj in pos.get_adjacent()):
-                return True
-            
-        return False
-    
+        self._line_masks = [[0] * Board.DIM for _ in Direction]
+        rows, cols = self._line_masks[Direction.Horizontal.value], self._line_masks[Direction.Vertical.value]
+        occupied = 0
+        position_hash = 0
+        board = self._board
+        for row in range(Board.DIM):
+            offset = row * Board.DIM
+            for col, code in enumerate(board[offset:offset + Board.DIM]):
+                if code != EMPTY_CODE:
+                    rows[row] |= 1 << col
+                    cols[col] |= 1 << row
+                    occupied |= 1 << (offset + col)
+                    position_hash ^= _ZOBRIST_KEYS[(offset + col) * N_CODES + code]
+        self._occupied = occupied
+        self._hash = position_hash
+        self._update_anchors()
+
+        # Only anchors can have tiles adjacent to them
+        self._adjacent_words = [[_NO_ADJACENT_WORDS] * Board.N_SQUARES for _ in Direction]
+        for pos in self.anchor_positions():
+            for dir in Direction:
+                self._compute_adjacent_words(pos.index, dir)
+
+    def _update_anchors(self):
+        occupied = self._occupied
+        if occupied == 0:
+            self._anchors = 1 << Board.CENTER.index
+            return
+        
+        neighbours = (occupied << Board.DIM) | (occupied >> Board.DIM) | ((occupied << 1) & ~_FIRST_COLUMN) | ((occupied >> 1) & ~_LAST_COLUMN)
+        self._anchors = neighbours & ~occupied & _ALL_SQUARES
+
     def _is_continuous(self, move: Move):
         """
         Checks that all tiles in a move form a continuous word
         """
-        curr = move.start
-        while curr != move.end:
-            if not curr.in_bounds:
-                return False
-
-            if curr not in move.coordinates and self.get_tile(curr) is None:
-                return False
-            
-            curr += move.direction.epsilon
-
-        return True
+        if not (move.start.in_bounds and move.end.in_bounds):
+            return False
 
-    def _get_score(self, move: Move):
-        """
-        Gets the score for the given move. Assumes the board state contains the tiles from the move.
-        """
-        assert all(tile == self.get_tile(pos) for tile, pos in move)
-
-        def get_score_1D(placed_tiles: List[Pos], dir: Direction):
-            score = 0
-            word_multiplier = 1
-            for tile, pos in self._get_tiles_through_pos(placed_tiles[0], dir):
-                letter_multiplier = 1
-                if pos in placed_tiles: # Only count multiplier if included in placed tiles
-                    match Board._get_square_type(pos):
-                        case SquareType.LetterX2:
-                            letter_multiplier = 2
-                        case SquareType.LetterX3:
-                            letter_multiplier = 3
-                        case SquareType.WordX2:
-                            word_multiplier *= 2
-                        case SquareType.WordX3:
-                            word_multiplier *= 3
-                
-                score += letter_multiplier * tile.value
-            
-            return score * word_multiplier
-
-        main_score = get_score_1D(move.coordinates, move.direction)
-        bingo_bonus = 50 * (len(move.coordinates) == 7)
-        cross_score = 0
+        dir = move.direction
+        line, start = Board._get_line_position(move.start.index, dir)
+        _, end = Board._get_line_position(move.end.index, dir)
+        occupied = self._line_masks[dir.value][line]
         for pos in move.coordinates:
-            opposite = move.direction.opposite
-            if self._forms_new_word(pos, opposite):
-                cross_score += get_score_1D([pos], opposite)
+            occupied |= 1 << Board._get_line_position(pos.index, dir)[1]
+        
+        span = ((1 << (end - start + 1)) - 1) << start
+        return occupied & span == span
 
-        return main_score + cross_score + bingo_bonus
-    
     def _get_words_formed(self, move: Move) -> Set[str]:
         """
         Gets all the words formed by a particular move. Assumes the board state contains the tiles from the move.
         """
-        assert all(tile == self.get_tile(pos) for tile, pos in move)
-
-        def get_word_1D(anchor: Pos, dir: Direction):
-            word = ''
-            for tile, _ in self._get_tiles_through_pos(anchor, dir):
-                word += tile.format()
-            return word.upper()
-        
-        words_formed = set([get_word_1D(move.start, move.direction)])
+        direction = self._get_main_direction(move)
+        words_formed = set([self._get_word(move.start.index, direction)])
+        opposite = direction.opposite
         for pos in move.coordinates:
-            opposite = move.direction.opposite
-            if self._forms_new_word(pos, opposite):
-                words_formed.add(get_word_1D(pos, opposite))
+            if self._forms_new_word(pos.index, opposite):
+                words_formed.add(self._get_word(pos.index, opposite))
 
         return words_formed
 
-    def _forms_new_word(self, pos: Pos, dir: Direction):
+    def _get_main_direction(self, move: Move) -> Direction:
         """
-        Returns True if a word is formed from the given position along the direction specified, meaning that there is a neighbouring tile along the direction specified
+        Returns the direction along which the main word of a move is formed. This is the direction of the move, except for single tiles which only form a word vertically.
         """
-        return any(self.get_tile(adj) is not None for adj in pos.get_adjacent(dir))
+        if len(move.coordinates) > 1:
+            return move.direction
+        
+        idx = move.start.index
+        if not self._forms_new_word(idx, Direction.Horizontal) and self._forms_new_word(idx, Direction.Vertical):
+            return Direction.Vertical
+        return Direction.Horizontal
 
-    def _get_tiles_through_pos(self, anchor: Pos, dir: Direction):
+    def _get_word(self, anchor: int, dir: Direction) -> str:
         """
-        Generates all tiles along the given direction going through the anchor position until an empty square or the board edge is reached in order (i.e. top to bottom or left to right).
+        Returns the letters of the word on the board along the given direction through the anchor index.
         """
-        assert self.get_tile(anchor) is not None
+        return ''.join(CODE_LETTERS[self._board[idx]] for idx in self._get_word_range(anchor, dir))
 
-        def get_prev_tiles_rec(pos: Pos):
-            prev_pos = pos - dir.epsilon
-            if not prev_pos.in_bounds or self.get_tile(prev_pos) is None:
-                yield self.get_tile(pos), pos
+    def _get_adjacent_words(self, idx: int, dir: Direction) -> AdjacentWords:
+        """
+        Returns the letters and face value sums of the runs of tiles immediately before and after the (empty) square at the given index along the given direction, as (prefix, prefix_sum, suffix, suffix_sum).
+        """
+        return self._adjacent_words[dir.value][idx]
+
+    def _update_adjacent_words(self, idx: int):
+        """
+        Updates the adjacent words of the squares affected by a change to the square at the given index: the nearest empty squares on either side of it along each direction, and the square itself if it is empty. Only the runs of tiles touching the changed square are read, and each is read once.
+        """
+        row, col = divmod(idx, Board.DIM)
+        for words, mask, bit, line_start, stride in (
+            (self._adjacent_words[0], self._line_masks[0][row], col, row * Board.DIM, 1),
+            (self._adjacent_words[1], self._line_masks[1][col], row, col, Board.DIM),
+        ):
+            start, end = _run_start(mask, bit), _run_end(mask, bit)
+            before, after = start - 1, end + 1
+            if mask >> bit & 1:
+                # The runs on either side were joined into a single run, which both neighbouring squares now border
+                run = self._read_run(line_start + start * stride, line_start + after * stride, stride)
+                if before >= 0:
+                    prefix = words[line_start + before * stride]
+                    words[line_start + before * stride] = (prefix[0], prefix[1], *run)
+                if after < Board.DIM:
+                    suffix = words[line_start + after * stride]
+                    words[line_start + after * stride] = (*run, suffix[2], suffix[3])
             else:
-                yield from get_prev_tiles_rec(prev_pos)
-                yield self.get_tile(pos), pos
+                # The run through the square was split, with the square itself bordering both halves
+                prefix_run = self._read_run(line_start + start * stride, idx, stride)
+                suffix_run = self._read_run(idx + stride, line_start + after * stride, stride)
+                words[idx] = (*prefix_run, *suffix_run)
+                if before >= 0:
+                    prefix = words[line_start + before * stride]
+                    words[line_start + before * stride] = (prefix[0], prefix[1], *prefix_run)
+                if after < Board.DIM:
+                    suffix = words[line_start + after * stride]
+                    words[line_start + after * stride] = (*suffix_run, suffix[2], suffix[3])
+
+    def _read_run(self, start: int, stop: int, stride: int) -> Tuple[str, int]:
+        """
+        Returns the letters and total value of the tiles on the board indices from start up to stop with the given stride
+        """
+        if start >= stop:
+            return '', 0
+        codes = bytes(self._board[start:stop:stride])
+        return codes.translate(_CODE_LETTER_BYTES).decode('ascii'), sum(map(CODE_VALUES.__getitem__, codes))
+
+    def _compute_adjacent_words(self, idx: int, dir: Direction):
+        line, bit = Board._get_line_position(idx, dir)
+        mask = self._line_masks[dir.value][line]
+        if not mask & (0b101 << bit >> 1):
+            self._adjacent_words[dir.value][idx] = _NO_ADJACENT_WORDS
+            return
+
+        line_start, stride = Board._get_line_start(line, dir), Board._stride(dir)
+        self._adjacent_words[dir.value][idx] = (
+            *self._read_run(line_start + _run_start(mask, bit) * stride, idx, stride),
+            *self._read_run(idx + stride, line_start + (_run_end(mask, bit) + 1) * stride, stride),
+        )
 
-        yield from get_prev_tiles_rec(anchor)
-        pos = anchor + dir.epsilon
-        while pos.in_bounds and self.get_tile(pos) is not None:
-            yield self.get_tile(pos), pos
-            pos += dir.epsilon
+    def _forms_new_word(self, idx: int, dir: Direction):
+        """
+        Returns True if a word is formed from the given board index along the direction specified, meaning that there is a neighbouring tile along the direction specified
+        """
+        line, bit = Board._get_line_position(idx, dir)
+        return self._line_masks[dir.value][line] & (0b101 << bit >> 1) != 0
+
+    def _get_word_range(self, anchor: int, dir: Direction) -> range:
+        """
+        Returns the board indices of all tiles along the given direction going through the anchor index until an empty square or the board edge is reached in order (i.e. top to bottom or left to right).
+        """
+        assert self._board[anchor] != EMPTY_CODE
+
+        line, bit = Board._get_line_position(anchor, dir)
+        mask = self._line_masks[dir.value][line]
+        line_start, stride = Board._get_line_start(line, dir), Board._stride(dir)
+        return range(line_start + _run_start(mask, bit) * stride, line_start + (_run_end(mask, bit) + 1) * stride, stride)
+
+    @staticmethod
+    def _stride(dir: Direction) -> int:
+        """
+        Returns the displacement in board indices of a single step along the given direction
+        """
+        return 1 if dir is Direction.Horizontal else Board.DIM
+
+    @staticmethod
+    def _get_line_position(idx: int, dir: Direction):
+        """
+        Returns the row or column (depending on dir) containing the given board index, and the offset of the index along it
+        """
+        row, col = divmod(idx, Board.DIM)
+        return (row, col) if dir is Direction.Horizontal else (col, row)
+
+    @staticmethod
+    def _get_line_start(line: int, dir: Direction) -> int:
+        """
+        Returns the board index of the first square of the given row or column (depending on dir)
+        """
+        return line * Board.DIM if dir is Direction.Horizontal else line
 
     @staticmethod
     def _get_square_type(pos: Pos):
@@ -249,4 +1214,7 @@ class Board:
         [SquareType.Plain, SquareType.LetterX3, SquareType.Plain, SquareType.Plain, SquareType.Plain, SquareType.LetterX3, SquareType.Plain, SquareType.Plain],
         [SquareType.Plain, SquareType.Plain, SquareType.LetterX2, SquareType.Plain, SquareType.Plain, SquareType.Plain, SquareType.LetterX2, SquareType.Plain],
         [SquareType.WordX3, SquareType.Plain, SquareType.Plain, SquareType.LetterX2, SquareType.Plain, SquareType.Plain, SquareType.Plain, SquareType.WordX2]
-    ]
\ No newline at end of file
+    ]
+
+# (letter_multiplier, word_multiplier) of every square, indexed by Pos.index
+SQUARE_MULTIPLIERS = tuple(Board._get_square_type(Pos.fromindex(idx)).multipliers for idx in range(Board.N_SQUARES))
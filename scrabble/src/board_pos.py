@@ -1,5 +1,6 @@
 from enum import Enum
 from typing import Optional
+from functools import lru_cache
 import re
 
 class Direction(Enum):
@@ -8,51 +9,54 @@ class Direction(Enum):
 
     @property
     def opposite(self):
-        match self:
-            case Direction.Horizontal:
-                return Direction.Vertical
-            case Direction.Vertical:
-                return Direction.Horizontal
+        return _OPPOSITES[self.value]
             
     @property
     def epsilon(self):
         """
         Returns minimum displacement along the direction
         """
-        match self:
-            case Direction.Horizontal:
-                return Pos(0, 1)
-            case Direction.Vertical:
-                return Pos(1, 0)
+        return _EPSILONS[self.value]
 
 class Pos:
+    """
+    Immutable board position. In-bounds positions are interned, so Pos(row, col) returns the same canonical instance for each square, with its neighbours precomputed.
+    """
     MAX_SIZE = 15
+    __slots__ = ('_row', '_col', '_index', '_hash')
+    _row: int
+    _col: int
+    _index: int # -1 if out of bounds
+    _hash: int
 
-    def __init__(self, row: int, col: int):
-        self._row = row
-        self._col = col
+    def __new__(cls, row: int, col: int):
+        if cls is Pos and 0 <= row < Pos.MAX_SIZE and 0 <= col < Pos.MAX_SIZE:
+            return _POSITIONS[row * Pos.MAX_SIZE + col]
+        return cls._create(row, col)
+
+    @classmethod
+    def _create(cls, row: int, col: int):
+        pos = object.__new__(cls)
+        in_bounds = Pos._in_bounds(row) and Pos._in_bounds(col)
+        object.__setattr__(pos, '_row', row)
+        object.__setattr__(pos, '_col', col)
+        object.__setattr__(pos, '_index', row * Pos.MAX_SIZE + col if in_bounds else -1)
+        object.__setattr__(pos, '_hash', hash((row, col)))
+        return pos
 
     @classmethod
     def fromstr(cls, pos_str: str):
         """
         Constructs a Pos based on a string in the Woogles format, also returning the direction indicated.
         """
-        if match := re.match(r"([0-9]+)([A-Z])", pos_str):
-            row, col = match.groups()
-            dir = Direction.Horizontal
-        elif match := re.match(r"([A-Z])([0-9]+)", pos_str):
-            col, row = match.groups()
-            dir = Direction.Vertical
-        else:
-            raise ValueError(f"String {pos_str} doesn't match Woogles format")
-        
-        row = int(row) - 1
-        col = ord(col) - ord('A')
+        return _parse_pos_str(pos_str)
 
-        pos = cls(row, col)
-        if not pos.in_bounds:
-            raise ValueError(f"Position ({row}, {col}) is out of bounds")
-        return pos, dir
+    @classmethod
+    def fromindex(cls, index: int):
+        """
+        Returns the position corresponding to an index in a flat, row-major board layout
+        """
+        return _POSITIONS[index]
 
     @property
     def row(self):
@@ -61,30 +65,35 @@ class Pos:
     @property
     def col(self):
         return self._col
+
+    @property
+    def index(self):
+        """
+        Returns the index of the position in a flat, row-major board layout
+        """
+        return self._index
     
     @property
     def in_bounds(self):
-        return Pos._in_bounds(self.row) and Pos._in_bounds(self.col)
+        return self._index >= 0
     
     def get_adjacent(self, dir: Optional[Direction] = None):
         """
-        Generates all valid positions adjacent to itself. If dir is specified, only generates positions in the appropriate direction.
+        Returns all valid positions adjacent to itself. If dir is specified, only returns positions in the appropriate direction.
         """
         assert self.in_bounds
 
-        def adjacent_1D(x_or_y):
-            for displacement in [-1, 1]:
-                new_pos = x_or_y(self) + displacement
-                if Pos._in_bounds(new_pos):
-                    yield new_pos
+        if dir is None:
+            return _ADJACENT[self._index]
+        return _ADJACENT_1D[dir.value][self._index]
+
+    def step(self, dir: Direction, backwards: bool = False):
+        """
+        Returns the neighbouring position one step along the given direction (or against it if backwards is set), or None if it would be off the board.
+        """
+        assert self.in_bounds
 
-        if dir is None or dir is Direction.Vertical:
-            for new_row in adjacent_1D(lambda pos: pos.row):
-                yield Pos(new_row, self.col)
-        
-        if dir is None or dir is Direction.Horizontal:
-            for new_col in adjacent_1D(lambda pos: pos.col):
-                yield Pos(self.row, new_col)
+        return _STEPS[dir.value][backwards][self._index]
 
     def regularise(self):
         """
@@ -92,13 +101,7 @@ class Pos:
         """
         assert self.in_bounds
 
-        row, col = self.row, self.col
-        if self._row > 7:
-            row = Pos.MAX_SIZE - (self._row + 1)
-        if self._col > 7:
-            col = Pos.MAX_SIZE - (self._col + 1)
-        
-        return Pos(row, col)
+        return _REGULARISED[self._index]
 
     def format(self, dir: Direction):
         """
@@ -120,21 +123,88 @@ class Pos:
         # Scrabble boards are 15x15
         return 0 <= x < Pos.MAX_SIZE
 
+    def __setattr__(self, name, value):
+        raise AttributeError("Pos is immutable")
+
+    def __reduce__(self):
+        return (Pos, (self._row, self._col))
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
     def __add__(self, other):
-        return Pos(self.row + other.row, self.col + other.col)
+        return Pos(self._row + other._row, self._col + other._col)
     
     def __sub__(self, other):
-        return Pos(self.row - other.row, self.col - other.col)
+        return Pos(self._row - other._row, self._col - other._col)
     
     def __eq__(self, other) -> bool:
-        return (self.row == other.row) and (self.col == other.col)
+        if self is other:
+            return True
+        if not isinstance(other, Pos):
+            return NotImplemented
+        return (self._row == other._row) and (self._col == other._col)
     
     def __lt__(self, other) -> bool:
         return (self.row, self.col) < (other.row, other.col)
     
     def __hash__(self) -> int:
-        return hash((self.row, self.col))
+        return self._hash
     
     # For debugging
     def __repr__(self) -> str:
-        return self.format(Direction.Horizontal)
\ No newline at end of file
+        return self.format(Direction.Horizontal)
+
+_HORIZONTAL_RE = re.compile(r"([0-9]+)([A-Z])")
+_VERTICAL_RE = re.compile(r"([A-Z])([0-9]+)")
+
+@lru_cache(maxsize=4096)
+def _parse_pos_str(pos_str: str):
+    if match := _HORIZONTAL_RE.match(pos_str):
+        row, col = match.groups()
+        dir = Direction.Horizontal
+    elif match := _VERTICAL_RE.match(pos_str):
+        col, row = match.groups()
+        dir = Direction.Vertical
+    else:
+        raise ValueError(f"String {pos_str} doesn't match Woogles format")
+    
+    row = int(row) - 1
+    col = ord(col) - ord('A')
+
+    pos = Pos(row, col)
+    if not pos.in_bounds:
+        raise ValueError(f"Position ({row}, {col}) is out of bounds")
+    return pos, dir
+
+# Lookup tables, precomputed at import time and indexed by Direction.value and/or Pos.index
+_OPPOSITES = (Direction.Vertical, Direction.Horizontal)
+_POSITIONS = tuple(Pos._create(row, col) for row in range(Pos.MAX_SIZE) for col in range(Pos.MAX_SIZE))
+_EPSILONS = (Pos._create(0, 1), Pos._create(1, 0))
+
+def _build_steps(dir: Direction, displacement: int):
+    steps = []
+    for pos in _POSITIONS:
+        row, col = pos.row, pos.col
+        if dir is Direction.Horizontal:
+            col += displacement
+        else:
+            row += displacement
+        steps.append(Pos(row, col) if Pos._in_bounds(row) and Pos._in_bounds(col) else None)
+    return tuple(steps)
+
+# _STEPS[dir][backwards][index]
+_STEPS = tuple((_build_steps(dir, 1), _build_steps(dir, -1)) for dir in Direction)
+_ADJACENT_1D = tuple(
+    tuple(tuple(adj for adj in (prev, next) if adj is not None) for prev, next in zip(backwards, forwards))
+    for forwards, backwards in _STEPS
+)
+_ADJACENT = tuple(vertical + horizontal for horizontal, vertical in zip(*_ADJACENT_1D))
+
+def _regularise_1D(x: int):
+    return Pos.MAX_SIZE - (x + 1) if x > Pos.MAX_SIZE // 2 else x
+
+_REGULARISED = tuple(Pos(_regularise_1D(pos.row), _regularise_1D(pos.col)) for pos in _POSITIONS)
@@ -0,0 +1,75 @@
+from typing import Generic, Hashable, Optional, TypeVar
+from collections import OrderedDict
+
+V = TypeVar('V')
+
+class EvaluationCache(Generic[V]):
+    """
+    Bounded mapping from (position, move) keys to evaluation results, evicting the least recently used entry once maxsize is reached. Keys include the position hash, so a single cache can be shared between boards (see Board.evaluate).
+    """
+    def __init__(self, maxsize: int = 4096):
+        if maxsize <= 0:
+            raise ValueError(f"Cache size must be positive, got {maxsize}")
+        self._entries: 'OrderedDict[Hashable, V]' = OrderedDict()
+        self._maxsize = maxsize
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def maxsize(self) -> int:
+        return self._maxsize
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        Fraction of lookups which were hits (0 if there were none)
+        """
+        lookups = self._hits + self._misses
+        return self._hits / lookups if lookups else 0.0
+
+    def get(self, key: Hashable) -> Optional[V]:
+        """
+        Returns the value cached for key, marking it as recently used, or None if it isn't cached
+        """
+        value = self._entries.get(key)
+        if value is None:
+            self._misses += 1
+            return None
+
+        self._hits += 1
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value: V):
+        """
+        Caches value for key, evicting the least recently used entry if the cache is full
+        """
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Removes all entries and resets the hit and miss counters
+        """
+        self._entries.clear()
+        self._hits = 0
+        self._misses = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return f"EvaluationCache({len(self)}/{self._maxsize} entries, {self._hits} hits, {self._misses} misses)"
@@ -0,0 +1,141 @@
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple, Union
+from concurrent.futures import ProcessPoolExecutor, Future, FIRST_COMPLETED, wait
+from itertools import islice
+from pathlib import Path
+import argparse
+import os
+
+from .gcg import read_gcg, replay, GCGError, GameSummary
+
+class GameReport(NamedTuple):
+    """
+    Compact, picklable result of replaying a single game. Issues are recorded as plain tuples so reports stay small when sent between processes.
+    """
+    path: str
+    game: int # Index of the game within the file
+    players: Tuple[str, ...]
+    n_turns: int
+    score_mismatches: Tuple[Tuple[int, str, int, int], ...] # (line, player, recorded score, computed score)
+    invalid_moves: Tuple[Tuple[int, str, str], ...] # (line, move, reason)
+    challenged_words: Tuple[Tuple[int, Tuple[str, ...], bool], ...] # (line, words, withdrawn)
+    error: Optional[str] = None # Set if the file couldn't be read or parsed, in which case the game is incomplete
+
+    @property
+    def is_consistent(self):
+        return self.error is None and not self.score_mismatches and not self.invalid_moves
+
+    @classmethod
+    def fromsummary(cls, path: str, summary: GameSummary):
+        return cls(
+            path, summary.game, summary.players, summary.n_turns,
+            tuple((m.turn.line, m.turn.player, m.turn.score, m.computed_score) for m in summary.score_mismatches),
+            tuple((m.turn.line, repr(m.turn.move), m.error.name if m.error is not None else 'Unknown') for m in summary.invalid_moves),
+            tuple((c.turn.line, tuple(sorted(c.words or ())), c.withdrawn) for c in summary.challenges),
+        )
+
+class CorpusSummary:
+    """
+    Running totals over the reports of a corpus, merged as they arrive so memory doesn't grow with the size of the corpus.
+    """
+    def __init__(self):
+        self.n_games = 0
+        self.n_turns = 0
+        self.n_inconsistent_games = 0
+        self.n_score_mismatches = 0
+        self.n_invalid_moves = 0
+        self.n_challenges = 0
+        self.n_errors = 0
+
+    def add(self, report: GameReport):
+        self.n_games += 1
+        self.n_turns += report.n_turns
+        self.n_inconsistent_games += not report.is_consistent
+        self.n_score_mismatches += len(report.score_mismatches)
+        self.n_invalid_moves += len(report.invalid_moves)
+        self.n_challenges += len(report.challenged_words)
+        self.n_errors += report.error is not None
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.n_games} games ({self.n_turns} turns): {self.n_inconsistent_games} inconsistent, "
+            f"{self.n_score_mismatches} score mismatches, {self.n_invalid_moves} invalid moves, "
+            f"{self.n_challenges} challenges, {self.n_errors} unreadable"
+        )
+
+def verify_file(path: Union[str, Path]) -> List[GameReport]:
+    """
+    Replays every game in a GCG file, returning a report per game
+    """
+    path = str(path)
+    reports = []
+    try:
+        for summary in replay(read_gcg(path)):
+            reports.append(GameReport.fromsummary(path, summary))
+    except (OSError, GCGError) as e:
+        reports.append(GameReport(path, len(reports), (), 0, (), (), (), str(e)))
+    return reports
+
+def _verify_chunk(paths: List[str]) -> List[GameReport]:
+    return [report for path in paths for report in verify_file(path)]
+
+def verify_corpus(paths: Iterable[Union[str, Path]], workers: Optional[int] = None, chunk_size: int = 16) -> Iterator[GameReport]:
+    """
+    Replays all games in the given GCG files across a pool of worker processes (one per CPU by default), generating a report per game as chunks of chunk_size files complete. Results are streamed in completion order, and only a bounded number of chunks are in flight at once, so memory doesn't grow with the number of files.
+    """
+    workers = workers or os.cpu_count() or 1
+    chunks = _chunked((str(path) for path in paths), chunk_size)
+    if workers == 1:
+        for chunk in chunks:
+            yield from _verify_chunk(chunk)
+        return
+
+    max_pending = 2 * workers
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending: Set[Future] = set()
+        for chunk in chunks:
+            pending.add(executor.submit(_verify_chunk, chunk))
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+
+        for future in pending:
+            yield from future.result()
+
+def find_games(directory: Union[str, Path], pattern: str = '*.gcg') -> Iterator[Path]:
+    """
+    Lazily finds all game files matching pattern under directory (recursively)
+    """
+    return Path(directory).rglob(pattern)
+
+def _chunked(items: Iterable[str], size: int) -> Iterator[List[str]]:
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command line entry point, run with python -m scrabble.src verify-corpus
+    """
+    parser = argparse.ArgumentParser(prog='python -m scrabble.src verify-corpus', description="Replays a directory of GCG game records, checking every move and score against the engine")
+    parser.add_argument('directory', type=Path)
+    parser.add_argument('--pattern', default='*.gcg', help="Glob pattern of game files (default: %(default)s)")
+    parser.add_argument('--workers', type=int, default=None, help="Number of worker processes (default: number of CPUs)")
+    parser.add_argument('--chunk-size', type=int, default=16, help="Number of files per unit of work (default: %(default)s)")
+    parser.add_argument('--verbose', action='store_true', help="Also list consistent games")
+    args = parser.parse_args(argv)
+
+    summary = CorpusSummary()
+    for report in verify_corpus(find_games(args.directory, args.pattern), args.workers, args.chunk_size):
+        summary.add(report)
+        if report.error is not None:
+            print(f"{report.path}: {report.error}")
+        elif not report.is_consistent or args.verbose:
+            print(f"{report.path}#{report.game}: {len(report.score_mismatches)} score mismatches, {len(report.invalid_moves)} invalid moves")
+            for line, player, recorded, computed in report.score_mismatches:
+                print(f"  line {line}: {player} recorded {recorded}, computed {computed}")
+            for line, move, reason in report.invalid_moves:
+                print(f"  line {line}: invalid move {move} ({reason})")
+
+    print(summary)
+    return 0 if summary.n_inconsistent_games == 0 else 1
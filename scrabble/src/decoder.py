@@ -0,0 +1,177 @@
+from typing import TYPE_CHECKING, Dict, Iterator, List, Mapping, NamedTuple, Optional, Tuple
+import heapq
+import math
+
+from .board_pos import Pos
+from .tile import Tile, EMPTY_CODE, LETTER_MASK, ANY_LETTER
+from .move import Move
+from .lexicon import Lexicon
+
+if TYPE_CHECKING:
+    from .board import Board, MoveEvaluation
+
+_OFF_LEXICON = -1 # Lexicon node of a main word which has already left the lexicon (or can't be checked)
+
+class DecodedMove(NamedTuple):
+    move: Move
+    log_likelihood: float # Sum of the log probabilities of the tiles read on each square
+    n_invalid_words: int # Number of words formed which aren't in the lexicon (0 without a lexicon)
+    evaluation: 'MoveEvaluation'
+
+# Beam search state: (score, tile codes of the squares decoded so far, lexicon node of the main word, whether the main
+# word up to the last square is a word, number of invalid words so far, log likelihood)
+_State = Tuple[float, Tuple[int, ...], int, bool, int, float]
+
+def decode_move(board: 'Board', squares: Mapping[Pos, Mapping[str, float]], k: int = 5, lexicon: Optional[Lexicon] = None,
+                beam_width: int = 64, invalid_word_penalty: Optional[float] = None) -> List[DecodedMove]:
+    """
+    Returns the k most likely legal moves given a probability distribution over the tile read on each newly occupied square. See Board.decode_move.
+    """
+    if not 0 < len(squares) <= 7:
+        raise ValueError(f"Moves must place between 1 and 7 tiles, got {len(squares)}")
+    distributions = [(pos, _parse_distribution(distribution)) for pos, distribution in sorted(squares.items())]
+    positions = [pos for pos, _ in distributions]
+
+    # Whether the squares form a legal placement doesn't depend on the tiles read on them
+    placeholder = Move([Tile('A')] * len(positions), positions)
+    if not board._evaluate(placeholder).is_valid:
+        return []
+
+    decoder = _BeamDecoder(board, lexicon, beam_width, invalid_word_penalty)
+    states = decoder.decode(placeholder, dict(distributions))
+
+    best: Dict[Tuple[int, ...], _State] = {}
+    for state in states:
+        codes = state[1]
+        if codes not in best or state[0] > best[codes][0]:
+            best[codes] = state # Undesignated blanks are followed along every letter, keep the most likely reading
+
+    decoded = []
+    for score, codes, _, _, n_invalid, log_likelihood in heapq.nlargest(k, best.values(), key=lambda state: state[0]):
+        move = Move([Tile.fromcode(code) for code in codes], positions)
+        decoded.append(DecodedMove(move, log_likelihood, n_invalid, board.evaluate(move)))
+    return decoded
+
+def _parse_distribution(distribution: Mapping[str, float]) -> List[Tuple[int, float]]:
+    """
+    Converts a distribution keyed by Woogles tile strings ('A'-'Z' for letters, 'a'-'z' for designated blanks and '?' for an undesignated blank) to (tile_code, log_probability) pairs, dropping impossible tiles
+    """
+    parsed = []
+    for key, probability in distribution.items():
+        if probability < 0:
+            raise ValueError(f"Invalid probability {probability} for tile {key}")
+        elif probability > 0:
+            parsed.append((Tile.fromstr(key).code, math.log(probability)))
+    return parsed
+
+class _BeamDecoder:
+    """
+    Decodes the tiles of a placement square by square along its main word, keeping only the beam_width most likely partial readings after each square. With a lexicon, each reading also follows the main word through the DAWG, and readings which leave it or violate the cross-check of a square are pruned (or penalised by invalid_word_penalty per invalid word).
+    """
+    def __init__(self, board: 'Board', lexicon: Optional[Lexicon], beam_width: int, invalid_word_penalty: Optional[float]):
+        self._board = board
+        self._lexicon = lexicon
+        self._beam_width = beam_width
+        self._penalty = invalid_word_penalty
+
+    def decode(self, placeholder: Move, distributions: Dict[Pos, List[Tuple[int, float]]]) -> List[_State]:
+        board = self._board
+        lexicon = self._lexicon
+        direction = board._get_main_direction(placeholder)
+        stride = board._stride(direction)
+        prefix, _, _, _ = board._get_adjacent_words(placeholder.start.index, direction)
+        _, _, suffix, _ = board._get_adjacent_words(placeholder.end.index, direction)
+
+        node, n_invalid = _OFF_LEXICON, 0
+        if lexicon is not None and '?' not in prefix + suffix:
+            step = lexicon._walk(lexicon.root, prefix)
+            if step is not None:
+                node = step[0]
+            else:
+                n_invalid = 1
+        states: List[_State] = [(-self._invalid_cost(n_invalid), (), node, False, n_invalid, 0.0)]
+
+        for idx in range(placeholder.start.index, placeholder.end.index + 1, stride):
+            code = board._board[idx]
+            if code != EMPTY_CODE:
+                states = [self._follow_existing(state, code) for state in states]
+            else:
+                distribution = distributions[Pos.fromindex(idx)]
+                allowed = self._get_cross_check(idx, direction)
+                candidates = (state for state in self._expand(states, distribution, allowed) if self._is_allowed(state[4]))
+                states = heapq.nlargest(self._beam_width, candidates, key=lambda state: state[0])
+            states = [state for state in states if self._is_allowed(state[4])]
+
+        states = [self._finish(state, suffix) for state in states]
+        return [state for state in states if self._is_allowed(state[4])]
+
+    def _expand(self, states: List[_State], distribution: List[Tuple[int, float]], allowed: Optional[int]) -> Iterator[_State]:
+        lexicon = self._lexicon
+        for score, codes, node, is_word, n_invalid, log_likelihood in states:
+            for tile_code, log_probability in distribution:
+                letter = tile_code & LETTER_MASK
+                if letter:
+                    cross_invalid = allowed is not None and not allowed >> letter & 1
+                    candidates = [(letter, cross_invalid)]
+                else:
+                    # Undesignated blank, which may stand for any letter
+                    letters = allowed if allowed is not None else ANY_LETTER
+                    if lexicon is not None and node != _OFF_LEXICON:
+                        # Follow the main word along each letter the blank could be, no such letter making some word invalid
+                        candidates = [(code, False) for code, _, _ in lexicon.edges(node) if letters >> code & 1] or [(0, True)]
+                    else:
+                        candidates = [(0, letters == 0)]
+
+                for letter, cross_invalid in candidates:
+                    child, child_is_word, child_invalid = self._step(node, letter, n_invalid + cross_invalid)
+                    child_log_likelihood = log_likelihood + log_probability
+                    yield (child_log_likelihood - self._invalid_cost(child_invalid), codes + (tile_code,), child, child_is_word, child_invalid, child_log_likelihood)
+
+    def _follow_existing(self, state: _State, code: int) -> _State:
+        score, codes, node, _, n_invalid, log_likelihood = state
+        child, is_word, n_invalid = self._step(node, code & LETTER_MASK, n_invalid)
+        return (log_likelihood - self._invalid_cost(n_invalid), codes, child, is_word, n_invalid, log_likelihood)
+
+    def _step(self, node: int, letter: int, n_invalid: int) -> Tuple[int, bool, int]:
+        """
+        Follows the main word from node along a letter code (0 for an undesignated blank, which can't be checked), returning the node reached, whether it completes a word, and the updated number of invalid words
+        """
+        if node == _OFF_LEXICON or self._lexicon is None or letter == 0:
+            return _OFF_LEXICON, False, n_invalid
+
+        step = self._lexicon.follow(node, letter)
+        if step is None:
+            return _OFF_LEXICON, False, n_invalid + 1 # The main word has left the lexicon
+        return step[0], step[1], n_invalid
+
+    def _finish(self, state: _State, suffix: str) -> _State:
+        """
+        Completes the main word of a reading with the tiles after the placement, checking it is in the lexicon
+        """
+        score, codes, node, is_word, n_invalid, log_likelihood = state
+        if node != _OFF_LEXICON:
+            assert self._lexicon is not None
+            step = self._lexicon._walk(node, suffix) if suffix else (node, is_word)
+            if step is None or not step[1]:
+                n_invalid += 1
+        return (log_likelihood - self._invalid_cost(n_invalid), codes, node, is_word, n_invalid, log_likelihood)
+
+    def _get_cross_check(self, idx: int, direction) -> Optional[int]:
+        """
+        Returns a bitmask over letter codes of the letters forming a valid perpendicular word on the square at idx, or None if any letter is allowed (there are no perpendicular neighbours, no lexicon, or the word contains an undesignated blank)
+        """
+        if self._lexicon is None:
+            return None
+        prefix, _, suffix, _ = self._board._get_adjacent_words(idx, direction.opposite)
+        if not (prefix or suffix) or '?' in prefix + suffix:
+            return None
+        return self._lexicon.cross_check_mask(prefix, suffix)
+
+    def _invalid_cost(self, n_invalid: int) -> float:
+        return 0.0 if n_invalid == 0 else n_invalid * (self._penalty or 0.0)
+
+    def _is_allowed(self, n_invalid: int) -> bool:
+        """
+        Invalid words are only allowed when they are penalised rather than pruned
+        """
+        return n_invalid == 0 or self._penalty is not None
@@ -0,0 +1,209 @@
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple, Union
+from enum import Enum
+from pathlib import Path
+import re
+
+from .board import Board, MoveError
+from .move import Move
+
+class TurnType(Enum):
+    Placement = 0
+    Pass = 1
+    Exchange = 2
+    PhonyWithdrawn = 3 # Previous placement removed after a successful challenge
+    ChallengeBonus = 4 # Points awarded for an unsuccessful challenge
+    TimePenalty = 5
+    EndRack = 6 # Points for tiles left on a rack at the end of the game
+
+class Turn(NamedTuple):
+    """
+    A single event in a game record. score is the change in the player's total, and cumulative is their recorded total after the event.
+    """
+    game: int # Index of the game within the stream
+    line: int # Line number within the stream
+    player: str
+    rack: str
+    type: TurnType
+    move: Optional[Move] # Set for placements
+    tiles: str # Exchanged tiles, or the rack counted for end rack points
+    score: int
+    cumulative: int
+
+class GCGError(ValueError):
+    def __init__(self, line: int, message: str):
+        super().__init__(f"Line {line}: {message}")
+        self.line = line
+
+_TURN_RE = re.compile(r">([^:]+):\s*(.*)")
+_POSITION_RE = re.compile(r"([0-9]+[A-Z]|[A-Z][0-9]+)")
+_THROUGH_RE = re.compile(r"\(([A-Za-z]+)\)")
+_NEW_GAME_PRAGMATA = ('#character-encoding', '#player1')
+
+def parse_gcg(lines: Iterable[str]) -> Iterator[Turn]:
+    """
+    Lazily parses a stream of GCG lines (e.g. an open file, as exported by Woogles), which may contain several concatenated games, generating each turn in order. Turns are tagged with the index of their game, which increases whenever a game header follows the turns of the previous game.
+    """
+    game = 0
+    in_turns = False
+    for line_number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if line.startswith('#'):
+            if in_turns and line.startswith(_NEW_GAME_PRAGMATA):
+                game += 1
+                in_turns = False
+            continue
+        elif not line.startswith('>'):
+            continue # Continuation of a note
+
+        in_turns = True
+        yield _parse_turn(line, line_number, game)
+
+def read_gcg(path: Union[str, Path]) -> Iterator[Turn]:
+    """
+    Lazily parses a GCG file (see parse_gcg)
+    """
+    with open(path, encoding='utf-8', errors='replace') as f:
+        yield from parse_gcg(f)
+
+def _parse_turn(line: str, line_number: int, game: int) -> Turn:
+    match = _TURN_RE.fullmatch(line)
+    if match is None:
+        raise GCGError(line_number, f"Invalid turn {line}")
+    player, rest = match.groups()
+    tokens = rest.split()
+    if len(tokens) < 3:
+        raise GCGError(line_number, f"Invalid turn {line}")
+
+    try:
+        score, cumulative = int(tokens[-2]), int(tokens[-1])
+    except ValueError:
+        raise GCGError(line_number, f"Invalid scores in turn {line}")
+
+    fields = tokens[:-2]
+    action = fields[-1]
+    rack = fields[0] if len(fields) > 1 else ''
+    move, tiles = None, ''
+    if action == '(challenge)':
+        type = TurnType.ChallengeBonus
+    elif action == '(time)':
+        type = TurnType.TimePenalty
+    elif action.startswith('(') and action.endswith(')'):
+        type, tiles = TurnType.EndRack, action[1:-1]
+    elif action == '--':
+        type = TurnType.PhonyWithdrawn
+    elif action == '-':
+        type = TurnType.Pass
+    elif action.startswith('-'):
+        type, tiles = TurnType.Exchange, action[1:]
+    elif len(fields) >= 2 and _POSITION_RE.fullmatch(fields[-2]):
+        type = TurnType.Placement
+        rack = fields[0] if len(fields) > 2 else ''
+        # Played-through letters may be written as '.' or in parentheses
+        word = _THROUGH_RE.sub(lambda m: '.' * len(m.group(1)), action)
+        try:
+            move = Move.fromstr(f"{fields[-2]} {word}")
+        except (ValueError, AssertionError):
+            raise GCGError(line_number, f"Invalid placement in turn {line}")
+    else:
+        raise GCGError(line_number, f"Unrecognised turn {line}")
+
+    return Turn(game, line_number, player, rack, type, move, tiles, score, cumulative)
+
+class ScoreMismatch(NamedTuple):
+    turn: Turn
+    computed_score: int
+    computed_cumulative: int
+
+class InvalidMove(NamedTuple):
+    turn: Turn
+    error: Optional[MoveError]
+
+class Challenge(NamedTuple):
+    turn: Turn # The withdrawal or challenge bonus
+    words: Optional[Set[str]] # Words formed by the challenged move, None if they couldn't be determined
+    withdrawn: bool
+
+class GameSummary(NamedTuple):
+    game: int
+    players: Tuple[str, ...]
+    n_turns: int
+    final_scores: Dict[str, int] # Recorded final totals
+    score_mismatches: List[ScoreMismatch]
+    invalid_moves: List[InvalidMove]
+    challenges: List[Challenge]
+
+    @property
+    def is_consistent(self):
+        """
+        True if every move was valid and every recorded score matched the engine's
+        """
+        return not self.score_mismatches and not self.invalid_moves
+
+def replay(turns: Iterable[Turn]) -> Iterator[GameSummary]:
+    """
+    Replays a stream of turns (see parse_gcg) on a fresh Board per game, checking each placement's score and each recorded cumulative score against the engine. Generates a summary of each game once it ends, so only one game is held in memory at a time.
+    """
+    replayer: Optional[_GameReplayer] = None
+    for turn in turns:
+        if replayer is None or turn.game != replayer.game:
+            if replayer is not None:
+                yield replayer.summary()
+            replayer = _GameReplayer(turn.game)
+        replayer.apply(turn)
+
+    if replayer is not None:
+        yield replayer.summary()
+
+class _GameReplayer:
+    def __init__(self, game: int):
+        self.game = game
+        self._board = Board()
+        self._totals: Dict[str, int] = {}
+        self._recorded: Dict[str, int] = {}
+        self._n_turns = 0
+        # (applied, computed score) of each placement still on the board or withdrawn later, latest last
+        self._placements: List[Tuple[bool, int]] = []
+        self._score_mismatches: List[ScoreMismatch] = []
+        self._invalid_moves: List[InvalidMove] = []
+        self._challenges: List[Challenge] = []
+
+    def apply(self, turn: Turn):
+        self._n_turns += 1
+        board = self._board
+        computed = turn.score
+        if turn.type is TurnType.Placement:
+            assert turn.move is not None
+            try:
+                applied = board.apply_move(turn.move)
+            except ValueError:
+                applied = False
+
+            if applied:
+                computed = board.get_score()
+            else:
+                self._invalid_moves.append(InvalidMove(turn, board.evaluate(turn.move).error))
+            self._placements.append((applied, computed))
+        elif turn.type is TurnType.PhonyWithdrawn:
+            applied, placed_score = self._placements.pop() if self._placements else (False, -turn.score)
+            words = None
+            if applied:
+                words = board.get_challenge_words()
+                board.undo_move()
+            computed = -placed_score
+            self._challenges.append(Challenge(turn, words, True))
+        elif turn.type is TurnType.ChallengeBonus:
+            applied = bool(self._placements) and self._placements[-1][0]
+            self._challenges.append(Challenge(turn, board.get_challenge_words() if applied else None, False))
+
+        total = self._totals.get(turn.player, 0) + computed
+        if computed != turn.score or total != turn.cumulative:
+            self._score_mismatches.append(ScoreMismatch(turn, computed, total))
+            total = turn.cumulative # Resynchronise so a single error isn't reported on every later turn
+        self._totals[turn.player] = total
+        self._recorded[turn.player] = turn.cumulative
+
+    def summary(self) -> GameSummary:
+        return GameSummary(
+            self.game, tuple(self._recorded), self._n_turns, dict(self._recorded),
+            self._score_mismatches, self._invalid_moves, self._challenges,
+        )
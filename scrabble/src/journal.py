@@ -0,0 +1,187 @@
+from typing import TYPE_CHECKING, Optional, Union
+from pathlib import Path
+from enum import Enum
+import mmap
+import os
+import struct
+import time
+import zlib
+
+from .board_pos import Pos
+from .tile import Tile
+from .move import Move
+
+if TYPE_CHECKING:
+    from .board import Board
+
+class JournalOp(Enum):
+    Apply = 1
+    SetBlanks = 2
+    Undo = 3
+    Retract = 4
+    Replace = 5
+
+# Fixed-size record: operation, number of tiles (or blanks), move index (retract/replace), score, board index and tile
+# code of each tile (or the blank letters for set_blanks), padding, and a CRC32 of the preceding bytes to detect torn writes
+_RECORD = struct.Struct('<BBHi7s7s6x')
+_CRC = struct.Struct('<I')
+RECORD_SIZE = _RECORD.size + _CRC.size
+
+# Snapshot file: header (magic, version, number of journal records covered) followed by Board.to_bytes
+_SNAPSHOT_MAGIC = b'SCRBSNAP'
+_SNAPSHOT_VERSION = 1
+_SNAPSHOT_HEADER = struct.Struct('<8sII')
+
+class Journal:
+    """
+    Append-only log of the operations performed on a board (see Board.journal), from which the board can be recovered after a crash. Each operation is written straight to the file as a fixed-size record, so it survives the process crashing, and the file is fsynced every sync_every records or sync_interval seconds so it survives the host crashing too. Periodic checkpoints write a snapshot of the board, so recovery only replays the records after it.
+    """
+    def __init__(self, path: Union[str, Path], sync_every: int = 16, sync_interval: float = 1.0):
+        self._path = Path(path)
+        self._snapshot_path = self._path.with_name(self._path.name + '.snapshot')
+        self._sync_every = sync_every
+        self._sync_interval = sync_interval
+
+        self._file = open(self._path, 'ab', buffering=0)
+        size = self._file.seek(0, os.SEEK_END)
+        self._n_records = _count_valid_records(self._path, size)
+        if self._n_records * RECORD_SIZE != size:
+            # Drop the torn or corrupt tail left by a crash mid-write
+            self._file.truncate(self._n_records * RECORD_SIZE)
+            self._file.seek(0, os.SEEK_END)
+        self._n_unsynced = 0
+        self._last_sync = time.monotonic()
+
+    @classmethod
+    def recover(cls, path: Union[str, Path], sync_every: int = 16, sync_interval: float = 1.0) -> 'Board':
+        """
+        Opens the journal at path (creating it if it doesn't exist) and returns the board it describes, with the journal attached so later operations are appended to it
+        """
+        journal = cls(path, sync_every, sync_interval)
+        board = journal.load()
+        board.journal = journal
+        return board
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def n_records(self) -> int:
+        return self._n_records
+
+    def load(self) -> 'Board':
+        """
+        Reconstructs the board from the latest snapshot (if any) and the records after it. The records are memory-mapped, and placements are replayed with their recorded scores rather than being re-evaluated.
+        """
+        from .board import Board
+
+        board, start = Board(), 0
+        if self._snapshot_path.exists():
+            data = self._snapshot_path.read_bytes()
+            if len(data) < _SNAPSHOT_HEADER.size:
+                raise ValueError(f"{self._snapshot_path} is not a journal snapshot")
+            magic, version, start = _SNAPSHOT_HEADER.unpack_from(data)
+            if magic != _SNAPSHOT_MAGIC or version != _SNAPSHOT_VERSION:
+                raise ValueError(f"{self._snapshot_path} is not a valid journal snapshot (version {_SNAPSHOT_VERSION})")
+            if start > self._n_records:
+                raise ValueError(f"{self._snapshot_path} is ahead of its journal ({start} > {self._n_records} records)")
+            board = Board.from_bytes(memoryview(data)[_SNAPSHOT_HEADER.size:])
+
+        if start == self._n_records:
+            return board
+        with open(self._path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            for offset in range(start * RECORD_SIZE, self._n_records * RECORD_SIZE, RECORD_SIZE):
+                _replay(board, *_RECORD.unpack_from(buffer, offset))
+        board._publish() # Placements are replayed without publishing each one
+        return board
+
+    def checkpoint(self, board: 'Board'):
+        """
+        Atomically writes a snapshot of the board, which must be the board this journal describes, so recovery only replays the records written after it
+        """
+        self.sync()
+        temporary = self._snapshot_path.with_name(self._snapshot_path.name + '.tmp')
+        with open(temporary, 'wb') as f:
+            f.write(_SNAPSHOT_HEADER.pack(_SNAPSHOT_MAGIC, _SNAPSHOT_VERSION, self._n_records))
+            f.write(board.to_bytes())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, self._snapshot_path)
+
+    def log_apply(self, move: Move, score: int):
+        self._append(JournalOp.Apply, move, score=score)
+
+    def log_set_blanks(self, blanks: str):
+        self._append(JournalOp.SetBlanks, n=len(blanks), codes=blanks.encode('ascii', errors='replace'))
+
+    def log_undo(self):
+        self._append(JournalOp.Undo)
+
+    def log_retract(self, index: int):
+        self._append(JournalOp.Retract, index=index)
+
+    def log_replace(self, index: int, move: Move):
+        self._append(JournalOp.Replace, move, index=index)
+
+    def sync(self):
+        """
+        Flushes all records written so far to disk
+        """
+        if self._n_unsynced:
+            os.fsync(self._file.fileno())
+            self._n_unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def close(self):
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def _append(self, op: JournalOp, move: Optional[Move] = None, n: int = 0, index: int = 0, score: int = 0, codes: bytes = b''):
+        indices = b''
+        if move is not None:
+            n = len(move.coordinates)
+            indices = bytes(pos.index for pos in move.coordinates)
+            codes = bytes(tile.code for tile, _ in move)
+        record = _RECORD.pack(op.value, n, index, score, indices, codes)
+        self._file.write(record + _CRC.pack(zlib.crc32(record)))
+        self._n_records += 1
+        self._n_unsynced += 1
+        if self._n_unsynced >= self._sync_every or time.monotonic() - self._last_sync >= self._sync_interval:
+            self.sync()
+
+def _count_valid_records(path: Path, size: int) -> int:
+    """
+    Returns the number of records at the start of the journal file which are complete and intact
+    """
+    if size < RECORD_SIZE:
+        return 0
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        for offset in range(0, size - RECORD_SIZE + 1, RECORD_SIZE):
+            crc, = _CRC.unpack_from(buffer, offset + _RECORD.size)
+            if zlib.crc32(buffer[offset:offset + _RECORD.size]) != crc:
+                return offset // RECORD_SIZE
+    return size // RECORD_SIZE
+
+def _replay(board: 'Board', op: int, n: int, index: int, score: int, indices: bytes, codes: bytes):
+    match JournalOp(op):
+        case JournalOp.Apply:
+            board._commit_move(_decode_move(n, indices, codes), score)
+        case JournalOp.SetBlanks:
+            board.set_blanks(codes[:n].decode('ascii'))
+        case JournalOp.Undo:
+            board.undo_move()
+        case JournalOp.Retract:
+            board.retract_move(index)
+        case JournalOp.Replace:
+            board.replace_move(index, _decode_move(n, indices, codes))
+
+def _decode_move(n: int, indices: bytes, codes: bytes) -> Move:
+    return Move([Tile.fromcode(code) for code in codes[:n]], [Pos.fromindex(idx) for idx in indices[:n]])
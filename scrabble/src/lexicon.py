@@ -0,0 +1,337 @@
+from typing import Iterable, Iterator, Optional, Sequence, Set, Tuple, List, Dict, Union
+from array import array
+from pathlib import Path
+import argparse
+import mmap
+import struct
+import sys
+
+from .tile import LETTER_MASK, ANY_LETTER
+
+# Each edge of the DAWG is packed into a 32-bit integer. Nodes are stored as contiguous runs of edges, with the last
+# edge of each node flagged, and are referred to by the index of their first edge (0 for nodes without children).
+# The low bits of each edge hold its letter code (see LETTER_MASK), the flags below and the child node index above them.
+_TERMINAL = 0x20 # Set if the word spelled by following this edge is in the lexicon
+_LAST = 0x40 # Set on the last edge of a node
+_CHILD_SHIFT = 7 # Index of the child node's first edge is stored in the remaining bits
+_MAX_EDGES = 1 << (32 - _CHILD_SHIFT)
+
+# Binary format: header (magic, version, number of words, number of edges, reserved), followed by the little-endian edge array
+_MAGIC = b'SCRBDAWG'
+_VERSION = 1
+_HEADER = struct.Struct('<8sIIII')
+
+class Lexicon:
+    """
+    A set of words stored as a DAWG (directed acyclic word graph), supporting fast lookups and letter-by-letter traversal for move generation and validation.
+    """
+    def __init__(self, edges: Sequence[int], n_words: int, path: Optional[Path] = None, buffer: Optional[mmap.mmap] = None):
+        self._edges = edges
+        self._n_words = n_words
+        self._path = path
+        self._buffer = buffer
+
+    @classmethod
+    def fromwords(cls, words: Iterable[str]):
+        """
+        Constructs a Lexicon from an iterable of words (e.g. the lines of a CSW/NWL word list). Words are case-insensitive, surrounding whitespace and empty lines are ignored.
+        """
+        builder = _DawgBuilder()
+        for word in sorted(set(word.strip().upper() for word in words) - {''}):
+            builder.add(word)
+        return cls(builder.finish(), builder.n_words)
+
+    @classmethod
+    def fromfile(cls, path: Union[str, Path]):
+        """
+        Constructs a Lexicon from a plain text word list with one word per line (e.g. CSW/NWL). Anything after the first whitespace on a line (such as a definition) is ignored.
+        """
+        with open(path) as f:
+            return cls.fromwords(line.split()[0] if line.strip() else '' for line in f)
+
+    @classmethod
+    def compile(cls, word_list_path: Union[str, Path], path: Union[str, Path]):
+        """
+        Compiles a plain text word list into a binary lexicon file which can be opened with load.
+        """
+        cls.fromfile(word_list_path).save(path)
+
+    def save(self, path: Union[str, Path]):
+        """
+        Writes the lexicon to a compact binary file, which can be opened with load.
+        """
+        edges = array('I', self._edges)
+        if sys.byteorder != 'little':
+            edges.byteswap()
+        with open(path, 'wb') as f:
+            f.write(_HEADER.pack(_MAGIC, _VERSION, self._n_words, len(edges), 0))
+            f.write(edges.tobytes())
+
+    @classmethod
+    def load(cls, path: Union[str, Path]):
+        """
+        Opens a binary lexicon file written by save. The file is memory-mapped rather than read, so loading is near-instant and processes opening the same file share its pages.
+        """
+        path = Path(path)
+        with open(path, 'rb') as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        if len(buffer) < _HEADER.size:
+            buffer.close()
+            raise ValueError(f"{path} is not a lexicon file")
+        magic, version, n_words, n_edges, _ = _HEADER.unpack_from(buffer)
+        if magic != _MAGIC or version != _VERSION or len(buffer) != _HEADER.size + 4 * n_edges:
+            buffer.close()
+            raise ValueError(f"{path} is not a valid lexicon file (version {_VERSION})")
+
+        if sys.byteorder != 'little' or array('I').itemsize != 4:
+            # Native layout doesn't match the file, fall back to reading it
+            edges = array('I')
+            edges.frombytes(buffer[_HEADER.size:])
+            if sys.byteorder != 'little':
+                edges.byteswap()
+            buffer.close()
+            return cls(edges, n_words, path)
+        return cls(memoryview(buffer)[_HEADER.size:].cast('I'), n_words, path, buffer)
+
+    def close(self):
+        """
+        Releases the memory-mapped file backing a lexicon opened with load. The lexicon can't be used afterwards.
+        """
+        if self._buffer is not None:
+            if isinstance(self._edges, memoryview):
+                self._edges.release()
+            self._buffer.close()
+            self._buffer = None
+            self._edges = array('I', [0])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def __reduce__(self):
+        # File-backed lexicons are re-opened (sharing the mapping) rather than copied when sent to other processes
+        if self._buffer is not None:
+            return (Lexicon.load, (self._path,))
+        return (Lexicon, (array('I', self._edges), self._n_words))
+
+    @property
+    def root(self) -> int:
+        """
+        Returns the root node of the DAWG, from which all words are spelled
+        """
+        return 1 if len(self._edges) > 1 else 0
+
+    def edges(self, node: int) -> Iterator[Tuple[int, int, bool]]:
+        """
+        Generates the outgoing edges of a node as (letter_code, child_node, is_word) tuples in alphabetical order, where is_word indicates whether the word spelled up to and including this edge is in the lexicon.
+        """
+        edges = self._edges
+        while node:
+            edge = edges[node]
+            yield edge & LETTER_MASK, edge >> _CHILD_SHIFT, bool(edge & _TERMINAL)
+            if edge & _LAST:
+                return
+            node += 1
+
+    def follow(self, node: int, letter_code: int) -> Optional[Tuple[int, bool]]:
+        """
+        Follows the edge for the given letter code from a node, returning (child_node, is_word), or None if there is no such edge.
+        """
+        edges = self._edges
+        while node:
+            edge = edges[node]
+            if edge & LETTER_MASK == letter_code:
+                return edge >> _CHILD_SHIFT, bool(edge & _TERMINAL)
+            if edge & _LAST:
+                return None
+            node += 1
+        return None
+
+    def contains(self, word: str) -> bool:
+        """
+        Returns True if the word (case-insensitive) is in the lexicon
+        """
+        step = self._walk(self.root, word)
+        return step is not None and step[1]
+
+    def cross_check(self, prefix: str, suffix: str) -> Set[str]:
+        """
+        Returns the set of letters which form a word in the lexicon when placed between prefix and suffix, i.e. the letters that can be played on a square with the given perpendicular neighbours.
+        """
+        mask = self.cross_check_mask(prefix, suffix)
+        return set(chr(ord('A') + code - 1) for code in range(1, 27) if mask >> code & 1)
+
+    def cross_check_mask(self, prefix: str, suffix: str) -> int:
+        """
+        Returns the letters of cross_check as a bitmask over letter codes (see ANY_LETTER), as used by move generation and decoding
+        """
+        step = self._walk(self.root, prefix)
+        if step is None:
+            return 0
+
+        mask = 0
+        for code, child, is_word in self.edges(step[0]):
+            if suffix:
+                step = self._walk(child, suffix)
+                is_word = step is not None and step[1]
+            if is_word:
+                mask |= 1 << code
+        return mask & ANY_LETTER
+
+    def has_prefix(self, prefix: str) -> bool:
+        """
+        Returns True if any word in the lexicon starts with prefix (including prefix itself)
+        """
+        step = self._walk(self.root, prefix)
+        return step is not None and (step[1] or step[0] != 0)
+
+    def words_with_prefix(self, prefix: str = '') -> Iterator[str]:
+        """
+        Generates all words in the lexicon starting with prefix (including prefix itself) in alphabetical order
+        """
+        prefix = prefix.upper()
+        step = self._walk(self.root, prefix)
+        if step is None:
+            return
+        if step[1]:
+            yield prefix
+
+        stack = [(self.edges(step[0]), prefix)]
+        while stack:
+            edges, word = stack[-1]
+            edge = next(edges, None)
+            if edge is None:
+                stack.pop()
+                continue
+
+            code, child, is_word = edge
+            child_word = word + chr(ord('A') + code - 1)
+            if is_word:
+                yield child_word
+            if child:
+                stack.append((self.edges(child), child_word))
+
+    def _walk(self, node: int, word: str) -> Optional[Tuple[int, bool]]:
+        """
+        Follows the letters of word from a node, returning (node_reached, is_word) or None if the path doesn't exist. is_word is False for an empty word.
+        """
+        is_word = False
+        for letter in word.upper():
+            step = self.follow(node, _letter_code(letter))
+            if step is None:
+                return None
+            node, is_word = step
+        return node, is_word
+
+    def __contains__(self, word: str) -> bool:
+        return self.contains(word)
+
+    def __len__(self) -> int:
+        return self._n_words
+
+def _letter_code(letter: str) -> int:
+    """
+    Returns the letter code (1-26) of an uppercase letter, or 0 for any other character (which never matches an edge)
+    """
+    code = ord(letter) - ord('A') + 1
+    return code if 1 <= code <= 26 else 0
+
+class _DawgNode:
+    __slots__ = ('children', 'final')
+
+    def __init__(self):
+        self.children: Dict[int, _DawgNode] = {}
+        self.final = False
+
+    def signature(self):
+        return self.final, tuple((code, id(child)) for code, child in self.children.items())
+
+class _DawgBuilder:
+    """
+    Builds a minimal DAWG from words added in sorted order, using Daciuk's incremental algorithm so that only the path of the previous word is ever unminimised.
+    """
+    def __init__(self):
+        self._root = _DawgNode()
+        self._register: Dict[tuple, _DawgNode] = {}
+        self._unchecked: List[Tuple[_DawgNode, int, _DawgNode]] = []
+        self._previous = ''
+        self.n_words = 0
+
+    def add(self, word: str):
+        codes = [_letter_code(letter) for letter in word]
+        if not all(codes):
+            raise ValueError(f"Invalid word {word}, words can only contain letters A-Z")
+        assert word > self._previous, "Words must be added in sorted order"
+
+        common = 0
+        while common < min(len(word), len(self._previous)) and word[common] == self._previous[common]:
+            common += 1
+        self._minimise(common)
+
+        node = self._unchecked[-1][2] if self._unchecked else self._root
+        for code in codes[common:]:
+            child = _DawgNode()
+            node.children[code] = child
+            self._unchecked.append((node, code, child))
+            node = child
+        node.final = True
+        self._previous = word
+        self.n_words += 1
+
+    def finish(self) -> array:
+        """
+        Minimises the remaining nodes and returns the packed edge array
+        """
+        self._minimise(0)
+
+        # Assign each distinct node with children a contiguous run of edges, root first
+        offsets: Dict[int, int] = {}
+        order: List[_DawgNode] = []
+        n_edges = 1 # Index 0 is reserved for nodes without children
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if not node.children or id(node) in offsets:
+                continue
+            offsets[id(node)] = n_edges
+            order.append(node)
+            n_edges += len(node.children)
+            stack.extend(reversed(node.children.values()))
+
+        if n_edges > _MAX_EDGES:
+            raise ValueError(f"Lexicon too large, {n_edges} edges exceeds the maximum of {_MAX_EDGES}")
+
+        edges = array('I', [0])
+        for node in order:
+            children = sorted(node.children.items())
+            for i, (code, child) in enumerate(children):
+                edge = code | (offsets.get(id(child), 0) << _CHILD_SHIFT)
+                if child.final:
+                    edge |= _TERMINAL
+                if i == len(children) - 1:
+                    edge |= _LAST
+                edges.append(edge)
+        return edges
+
+    def _minimise(self, down_to: int):
+        while len(self._unchecked) > down_to:
+            parent, code, child = self._unchecked.pop()
+            signature = child.signature()
+            if signature in self._register:
+                parent.children[code] = self._register[signature]
+            else:
+                self._register[signature] = child
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command line entry point, run with python -m scrabble.src compile-lexicon
+    """
+    parser = argparse.ArgumentParser(prog='python -m scrabble.src compile-lexicon', description="Compiles a plain text word list into a binary lexicon file")
+    parser.add_argument('word_list', type=Path, help="Word list with one word per line (e.g. CSW/NWL)")
+    parser.add_argument('output', type=Path, help="Path of the binary lexicon file to write")
+    args = parser.parse_args(argv)
+    Lexicon.compile(args.word_list, args.output)
+    return 0
@@ -1,9 +1,14 @@
-from typing import List
+from typing import List, Optional
 
 from .tile import Tile
 from .board_pos import Pos, Direction
 
 class Move:
+    """
+    Tiles placed on the board in a single turn. Properties derived from the positions of the tiles (validity, direction, mask) are computed once on construction, as the positions can't change.
+    """
+    __slots__ = ('_tiles', '_coordinates', '_is_valid', '_direction', '_in_bounds', '_mask', '_n_unset_blanks')
+
     def __init__(self, tiles: List[Tile], coordinates: List[Pos]):
         assert len(tiles) == len(coordinates)
         assert 0 < len(tiles) <= 7
@@ -14,6 +19,22 @@ class Move:
         self._tiles: List[Tile] = [tile_pos[0] for tile_pos in tile_positions]
         self._coordinates: List[Pos] = [tile_pos[1] for tile_pos in tile_positions]
 
+        first, last = self._coordinates[0], self._coordinates[-1]
+        along_row = all(pos.row == first.row for pos in self._coordinates)
+        along_col = all(pos.col == first.col for pos in self._coordinates)
+        unique_positions = len(set(self._coordinates)) == len(self._coordinates)
+        self._is_valid = (along_row or along_col) and unique_positions
+        self._direction: Optional[Direction] = None
+        if self._is_valid:
+            self._direction = Direction.Horizontal if last.row == first.row else Direction.Vertical
+
+        self._in_bounds = all(pos.in_bounds for pos in self._coordinates)
+        self._mask = 0
+        for pos in self._coordinates:
+            if pos.in_bounds:
+                self._mask |= 1 << pos.index
+        self._n_unset_blanks = sum(tile.is_blank and not tile.is_set for tile in self._tiles)
+
     @classmethod
     def fromstr(cls, move_str: str):
         """
@@ -39,10 +60,21 @@ class Move:
 
     @property
     def is_valid(self):
-        along_row = all(pos.row == self._coordinates[0].row for pos in self._coordinates)
-        along_col = all(pos.col == self._coordinates[0].col for pos in self._coordinates)
-        unique_positions = len(set(self.coordinates)) == len(self.coordinates)
-        return (along_row or along_col) and unique_positions
+        return self._is_valid
+
+    @property
+    def in_bounds(self):
+        """
+        True if all the tiles are on the board
+        """
+        return self._in_bounds
+
+    @property
+    def mask(self) -> int:
+        """
+        Bitmask (indexed by Pos.index) of the squares the tiles are placed on, ignoring any which are out of bounds
+        """
+        return self._mask
     
     @property
     def start(self) -> Pos:
@@ -58,30 +90,36 @@ class Move:
     
     @property
     def direction(self):
-        assert self.is_valid, "Should not call .direction on invalid move"
-
-        diff = self._coordinates[-1] - self._coordinates[0]
-        if diff.row == 0:
-            return Direction.Horizontal
-        elif diff.col == 0:
-            return Direction.Vertical
+        assert self._direction is not None, "Should not call .direction on invalid move"
+        return self._direction
         
     @property
     def n_of_unset_blanks(self):
-        return sum(tile.is_blank and not tile.is_set for tile in self._tiles)
+        return self._n_unset_blanks
         
     def set_blanks(self, blanks: str) -> bool:
-        if self.n_of_unset_blanks != len(blanks):
+        """
+        Designates the unset blanks of the move, in order, with the given letters (one per unset blank). Blanks which are already designated are skipped.
+        """
+        if self._n_unset_blanks != len(blanks):
             return False
         
-        for i, blank in enumerate(self.blanks()):
-            try:
-                blank.set_letter(blanks[i])
-            except ValueError:
-                return False
+        try:
+            unset = [blank for blank in self.blanks() if not blank.is_set]
+            for blank, letter in zip(unset, blanks):
+                blank.set_letter(letter)
+                self._n_unset_blanks -= 1
+        except ValueError:
+            return False
             
         return True
 
+    def copy(self):
+        """
+        Returns a copy of the move with its own tiles, so blanks can be set on it independently
+        """
+        return Move([Tile.fromcode(tile.code) for tile in self._tiles], list(self._coordinates))
+
     def blanks(self):
         for tile in self._tiles:
             if tile.is_blank:
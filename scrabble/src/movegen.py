@@ -0,0 +1,191 @@
+from typing import TYPE_CHECKING, Dict, Iterator, List, Tuple, Iterable
+
+from .board_pos import Pos, Direction
+from .tile import Tile, BLANK_FLAG, LETTER_MASK, ANY_LETTER
+from .move import Move
+from .lexicon import Lexicon
+
+if TYPE_CHECKING:
+    from .board import Board, MoveEvaluation
+
+def generate_moves(board: 'Board', rack: Iterable[str], lexicon: Lexicon) -> Iterator['MoveEvaluation']:
+    """
+    Returns a generator of the evaluations of all legal moves on the board that can be played from the rack and only form words in the lexicon. The rack is validated immediately rather than when the generator is first advanced. See Board.generate_moves.
+    """
+    rack_counts = [0] * 27
+    blanks = 0
+    n_tiles = 0
+    for letter in rack:
+        n_tiles += 1
+        if letter == '?':
+            blanks += 1
+            continue
+
+        code = ord(letter.upper()) - ord('A') + 1
+        if not 1 <= code <= 26:
+            raise ValueError(f"Invalid rack letter {letter}")
+        rack_counts[code] += 1
+
+    if not 0 < n_tiles <= 7:
+        raise ValueError(f"Racks must contain between 1 and 7 tiles, got {n_tiles}")
+
+    return _generate(_MoveGenerator(board, lexicon, rack_counts, blanks))
+
+def _generate(generator: '_MoveGenerator') -> Iterator['MoveEvaluation']:
+    for dir in Direction:
+        yield from generator.generate(dir)
+
+class _MoveGenerator:
+    """
+    Anchor-based move generation (Appel & Jacobson). For each anchor square along a line, every left part that fits in the empty squares before it is built from the rack, then extended rightwards through the anchor while the letters spell a path in the lexicon and satisfy the cross-checks of each square. Undesignated blanks on the board may stand for any letter, so words through them follow every edge of the lexicon, and perpendicular words containing them allow any letter.
+    """
+    def __init__(self, board: 'Board', lexicon: Lexicon, rack: List[int], blanks: int):
+        self._board = board
+        self._lexicon = lexicon
+        self._rack = rack
+        self._blanks = blanks
+        self._cross_checks: Dict[Tuple[int, int], int] = {}
+
+        # State of the line being generated
+        self._dir = Direction.Horizontal
+        self._line_start = 0
+        self._stride = 1
+        self._occupied = 0
+        self._anchor_bit = 0
+        self._found: List[List[Tuple[int, int]]] = []
+
+    def generate(self, dir: Direction):
+        board = self._board
+        dim = Pos.MAX_SIZE
+        anchors = board.anchors
+        self._dir = dir
+        self._stride = 1 if dir is Direction.Horizontal else dim
+        for line in range(dim):
+            self._line_start = line * dim if dir is Direction.Horizontal else line
+            self._occupied = board._line_masks[dir.value][line]
+            previous_anchor = -1
+            for bit in range(dim):
+                if not anchors >> (self._line_start + bit * self._stride) & 1:
+                    continue
+
+                self._anchor_bit = bit
+                if bit > 0 and self._occupied >> (bit - 1) & 1:
+                    # The left part is fixed by the tiles already on the board
+                    for node in self._follow_existing(bit - 1):
+                        self._extend_right(node, False, bit, [])
+                else:
+                    # Empty squares before the anchor (up to the previous anchor) can't touch any tile, so are unconstrained
+                    limit = min(bit - previous_anchor - 1, 6)
+                    self._left_part([], self._lexicon.root, limit)
+                previous_anchor = bit
+
+                yield from self._evaluate_found()
+
+    def _follow_existing(self, last_bit: int) -> List[int]:
+        """
+        Follows the letters of the tiles on the board ending at last_bit from the root of the lexicon, returning the nodes reached (one per letter each undesignated blank may stand for)
+        """
+        codes = self._board._board
+        bit = last_bit
+        while bit > 0 and self._occupied >> (bit - 1) & 1:
+            bit -= 1
+
+        nodes = [self._lexicon.root]
+        for b in range(bit, last_bit + 1):
+            code = codes[self._line_start + b * self._stride] & LETTER_MASK
+            if code:
+                nodes = [step[0] for node in nodes if (step := self._lexicon.follow(node, code)) is not None]
+            else:
+                nodes = [child for node in nodes for _, child, _ in self._lexicon.edges(node)]
+        return nodes
+
+    def _left_part(self, left: List[int], node: int, limit: int):
+        start_bit = self._anchor_bit - len(left)
+        placed = [(self._line_start + (start_bit + i) * self._stride, code) for i, code in enumerate(left)]
+        self._extend_right(node, False, self._anchor_bit, placed)
+        if limit == 0:
+            return
+
+        for code, child, _ in self._lexicon.edges(node):
+            if not child:
+                continue
+            for tile_code in self._take(code):
+                left.append(tile_code)
+                self._left_part(left, child, limit - 1)
+                left.pop()
+                self._give_back(tile_code)
+
+    def _extend_right(self, node: int, is_word: bool, bit: int, placed: List[Tuple[int, int]]):
+        if bit == Pos.MAX_SIZE or not self._occupied >> bit & 1:
+            if is_word and bit > self._anchor_bit:
+                self._found.append(list(placed))
+            if bit == Pos.MAX_SIZE or not node:
+                return
+
+            idx = self._line_start + bit * self._stride
+            allowed = self._get_cross_check(idx)
+            for code, child, child_is_word in self._lexicon.edges(node):
+                if not allowed >> code & 1:
+                    continue
+                for tile_code in self._take(code):
+                    placed.append((idx, tile_code))
+                    self._extend_right(child, child_is_word, bit + 1, placed)
+                    placed.pop()
+                    self._give_back(tile_code)
+        else:
+            code = self._board._board[self._line_start + bit * self._stride] & LETTER_MASK
+            if not code:
+                # Undesignated blank, which may stand for any letter
+                for _, child, child_is_word in self._lexicon.edges(node):
+                    self._extend_right(child, child_is_word, bit + 1, placed)
+                return
+            step = self._lexicon.follow(node, code)
+            if step is not None:
+                self._extend_right(step[0], step[1], bit + 1, placed)
+
+    def _take(self, code: int):
+        """
+        Generates the tile codes that can be taken from the rack to play the given letter: the letter itself and/or a blank designated as it. Each is only removed from the rack while the caller handles it, and must be returned with _give_back.
+        """
+        if self._rack[code]:
+            self._rack[code] -= 1
+            yield code
+        if self._blanks:
+            self._blanks -= 1
+            yield BLANK_FLAG | code
+
+    def _give_back(self, tile_code: int):
+        if tile_code & BLANK_FLAG:
+            self._blanks += 1
+        else:
+            self._rack[tile_code] += 1
+
+    def _get_cross_check(self, idx: int) -> int:
+        """
+        Returns a bitmask over letter codes of the letters which can be placed on the square at idx without forming an invalid perpendicular word
+        """
+        key = (idx, self._dir.value)
+        allowed = self._cross_checks.get(key)
+        if allowed is None:
+            prefix, _, suffix, _ = self._board._get_adjacent_words(idx, self._dir.opposite)
+            if (prefix or suffix) and '?' not in prefix + suffix:
+                allowed = self._lexicon.cross_check_mask(prefix, suffix)
+            else:
+                allowed = ANY_LETTER # No perpendicular word, or one containing an undesignated blank which can't be checked
+            self._cross_checks[key] = allowed
+        return allowed
+
+    def _evaluate_found(self):
+        board = self._board
+        found, self._found = self._found, []
+        # Placements through an undesignated blank are found once per letter it may stand for
+        unique = dict.fromkeys(tuple(placed) for placed in found)
+        for placed in unique:
+            move = Move([Tile.fromcode(code) for _, code in placed], [Pos.fromindex(idx) for idx, _ in placed])
+            # Single tiles can be found along both directions, only keep them along the direction of their main word
+            if len(placed) == 1 and board._get_main_direction(move) is not self._dir:
+                continue
+
+            evaluation = board._evaluate(move) # Bypass the cache, which would be flooded by the candidates
+            assert evaluation.is_valid, f"Generated invalid move {move}: {evaluation.error}"
+            yield evaluation
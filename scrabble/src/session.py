@@ -0,0 +1,240 @@
+from typing import AsyncIterator, Dict, Hashable, List, NamedTuple, Optional, Set, Tuple
+from enum import Enum
+import asyncio
+
+from .board import Board
+from .move import Move
+
+class EventType(Enum):
+    Apply = 0
+    SetBlanks = 1
+    Undo = 2
+    Retract = 3 # Correction removing a past move
+    Replace = 4 # Correction replacing a past move
+
+class TableEvent(NamedTuple):
+    """
+    A move or correction captured at a table. move is set for Apply and Replace, blanks for SetBlanks, and move_index for Retract and Replace.
+    """
+    table: Hashable
+    type: EventType
+    move: Optional[Move] = None
+    blanks: str = ''
+    move_index: Optional[int] = None
+
+class TableUpdate(NamedTuple):
+    """
+    Result of applying an event to a table's board, published to subscribers
+    """
+    table: Hashable
+    event: TableEvent
+    ok: bool
+    error: Optional[str] # Reason the event couldn't be applied
+    score: Optional[int] # Score of the latest move after the event
+    removed_moves: Tuple[Move, ...] # Later moves removed by a correction as they became invalid
+    n_moves: int
+    position_hash: int
+
+class Subscription:
+    """
+    Stream of the updates published by a SessionManager, iterated with async for. Updates are buffered up to maxsize, beyond which the oldest are dropped so a slow subscriber never holds up the tables.
+    """
+    def __init__(self, manager: 'SessionManager', maxsize: int):
+        self._manager = manager
+        self._queue: asyncio.Queue[TableUpdate] = asyncio.Queue(maxsize)
+        self._dropped = 0
+
+    @property
+    def dropped(self) -> int:
+        """
+        Number of updates dropped because the subscriber fell behind
+        """
+        return self._dropped
+
+    def get_nowait(self) -> TableUpdate:
+        return self._queue.get_nowait()
+
+    async def get(self) -> TableUpdate:
+        return await self._queue.get()
+
+    def close(self):
+        self._manager._subscriptions.discard(self)
+
+    def _publish(self, update: TableUpdate):
+        if self._queue.full():
+            self._queue.get_nowait()
+            self._dropped += 1
+        self._queue.put_nowait(update)
+
+    def __aiter__(self) -> AsyncIterator[TableUpdate]:
+        return self
+
+    async def __anext__(self) -> TableUpdate:
+        return await self._queue.get()
+
+class SessionManager:
+    """
+    Runs the boards of many concurrent games (one per table) on a single event loop. Events are submitted to a bounded queue per table, so producers wait while a table is behind (backpressure), and each table's events are applied in order by its own worker task. Workers apply at most batch_size events before yielding to the other tables, so a busy table can't stall the rest. Every event produces a TableUpdate, published to all subscribers.
+    """
+    def __init__(self, queue_size: int = 64, batch_size: int = 16):
+        self._queue_size = queue_size
+        self._batch_size = batch_size
+        self._boards: Dict[Hashable, Board] = {}
+        self._queues: Dict[Hashable, asyncio.Queue[TableEvent]] = {}
+        self._workers: Dict[Hashable, asyncio.Task] = {}
+        self._subscriptions: Set[Subscription] = set()
+        self._running = False
+
+    @property
+    def tables(self) -> List[Hashable]:
+        return list(self._boards)
+
+    def board(self, table: Hashable) -> Board:
+        return self._boards[table]
+
+    def add_table(self, table: Hashable, board: Optional[Board] = None) -> Board:
+        """
+        Registers a table, with a new board unless one is given, and starts its worker if the manager is running
+        """
+        if table in self._boards:
+            raise ValueError(f"Table {table} already exists")
+        self._boards[table] = board if board is not None else Board()
+        self._queues[table] = asyncio.Queue(self._queue_size)
+        if self._running:
+            self._start_worker(table)
+        return self._boards[table]
+
+    async def remove_table(self, table: Hashable) -> Board:
+        """
+        Waits for the table's pending events to be applied, then stops its worker and returns its board
+        """
+        if self._running:
+            await self._queues[table].join()
+            worker = self._workers.pop(table)
+            worker.cancel()
+            await asyncio.gather(worker, return_exceptions=True)
+        del self._queues[table]
+        return self._boards.pop(table)
+
+    def subscribe(self, maxsize: int = 1024) -> Subscription:
+        subscription = Subscription(self, maxsize)
+        self._subscriptions.add(subscription)
+        return subscription
+
+    async def submit(self, event: TableEvent):
+        """
+        Queues an event for its table, waiting while the table's queue is full. Raises ValueError if the event is missing the fields its type needs.
+        """
+        await self._get_queue(event).put(event)
+
+    def submit_nowait(self, event: TableEvent):
+        """
+        Queues an event for its table, raising asyncio.QueueFull if the table's queue is full (see submit)
+        """
+        self._get_queue(event).put_nowait(event)
+
+    def start(self):
+        """
+        Starts a worker per table. Must be called from a running event loop.
+        """
+        if self._running:
+            return
+        self._running = True
+        for table in self._boards:
+            self._start_worker(table)
+
+    async def join(self):
+        """
+        Waits until every event submitted so far has been applied
+        """
+        await asyncio.gather(*(queue.join() for queue in self._queues.values()))
+
+    async def stop(self, drain: bool = True):
+        """
+        Stops all workers, first waiting for the submitted events to be applied unless drain is False
+        """
+        if not self._running:
+            return
+        if drain:
+            await self.join()
+        self._running = False
+        workers, self._workers = list(self._workers.values()), {}
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, *_):
+        await self.stop()
+
+    def _get_queue(self, event: TableEvent) -> asyncio.Queue:
+        """
+        Returns the queue of the event's table, after checking the event is well-formed
+        """
+        queue = self._queues.get(event.table)
+        if queue is None:
+            raise KeyError(f"Unknown table {event.table}")
+        if not isinstance(event.type, EventType):
+            raise ValueError(f"Unknown event type {event.type}")
+        if event.type in (EventType.Apply, EventType.Replace) and not isinstance(event.move, Move):
+            raise ValueError(f"{event.type.name} event needs a move")
+        if event.type in (EventType.Retract, EventType.Replace) and event.move_index is None:
+            raise ValueError(f"{event.type.name} event needs a move index")
+        return queue
+
+    def _start_worker(self, table: Hashable):
+        self._workers[table] = asyncio.create_task(self._run_table(table), name=f"table-{table}")
+
+    async def _run_table(self, table: Hashable):
+        board, queue = self._boards[table], self._queues[table]
+        while True:
+            self._process(board, queue, await queue.get())
+            # Apply the events already waiting in a batch, then let the other tables run
+            for _ in range(self._batch_size - 1):
+                if queue.empty():
+                    break
+                self._process(board, queue, queue.get_nowait())
+            await asyncio.sleep(0)
+
+    def _process(self, board: Board, queue: asyncio.Queue, event: TableEvent):
+        try:
+            update = _apply_event(board, event)
+            for subscription in list(self._subscriptions):
+                subscription._publish(update)
+        finally:
+            # Always mark the event as done, so join never waits on an event which failed
+            queue.task_done()
+
+def _apply_event(board: Board, event: TableEvent) -> TableUpdate:
+    ok: bool = True
+    error: Optional[str] = None
+    removed: Tuple[Move, ...] = ()
+    move, move_index = event.move, event.move_index
+    try:
+        match event.type:
+            case EventType.Apply if move is not None:
+                ok = board.apply_move(move)
+                if not ok:
+                    error = f"Invalid move {move}: {board.evaluate(move).error}"
+            case EventType.SetBlanks:
+                ok = board.set_blanks(event.blanks)
+                if not ok:
+                    error = f"Couldn't set blanks to {event.blanks}"
+            case EventType.Undo:
+                board.undo_move()
+            case EventType.Retract if move_index is not None:
+                removed = tuple(board.retract_move(move_index))
+            case EventType.Replace if move is not None and move_index is not None:
+                removed = tuple(board.replace_move(move_index, move))
+            case _:
+                raise ValueError(f"Malformed event {event}")
+    except Exception as e:
+        # Reported rather than raised, so a bad event can't stop the table's worker
+        ok, error = False, str(e) if isinstance(e, (ValueError, IndexError, RuntimeError)) else f"{type(e).__name__}: {e}"
+
+    n_moves = len(board._move_info)
+    score = board.get_score() if n_moves else None
+    return TableUpdate(event.table, event, ok, error, score, removed, n_moves, board.position_hash)
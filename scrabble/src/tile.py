@@ -1,23 +1,56 @@
 
+from typing import Optional
+
+# Compact tile codes, used for array-backed storage. Codes 1-26 encode the letters A-Z, and blank tiles
+# have BLANK_FLAG set with their designated letter in the low bits (0 if unset). 0 is reserved for empty squares.
+EMPTY_CODE = 0
+BLANK_FLAG = 0x20
+N_CODES = 0x40
+LETTER_MASK = 0x1F # Letter code (1-26) of a tile code, or of a designated blank
+ANY_LETTER = ((1 << 27) - 1) & ~1 # Bitmask over letter codes 1-26
+
 class Tile:
+    """
+    A letter or blank tile. Letter tiles are immutable and interned, so Tile(letter) returns the same shared instance for each letter, while each blank is a separate instance whose letter can be designated once (see set_letter). Values and codes are precomputed.
+    """
+    __slots__ = ('_letter', '_custom_letter', '_value', '_code')
+    _letter: str
+    _custom_letter: Optional[str] # Designated letter of a blank
+    _value: int
+    _code: int
     LETTER_VALUES = {'A': 1, 'B': 3, 'C': 3, 'D': 2, 'E': 1, 'F': 4,
                      'G': 2, 'H': 4, 'I': 1, 'J': 8, 'K': 5, 'L': 1,
                      'M': 3, 'N': 1, 'O': 1, 'P': 3, 'Q': 10, 'R': 1,
                      'S': 1, 'T': 1, 'U': 1, 'V': 4, 'W': 4, 'X': 8,
                      'Y': 4, 'Z': 10, '?': 0}
 
-    def __init__(self, letter: str):
-        self._letter = letter.upper()
-        if self._letter not in self.LETTER_VALUES:
-            raise ValueError(f"Invalid letter {self._letter}")
-        self._custom_letter = None
+    def __new__(cls, letter: str):
+        letter = letter.upper()
+        tile = _LETTER_TILES.get(letter)
+        if tile is not None and cls is Tile:
+            return tile
+        elif letter not in cls.LETTER_VALUES:
+            raise ValueError(f"Invalid letter {letter}")
+        return cls._create(letter)
+
+    @classmethod
+    def _create(cls, letter: str):
+        tile = object.__new__(cls)
+        object.__setattr__(tile, '_letter', letter)
+        object.__setattr__(tile, '_custom_letter', None)
+        object.__setattr__(tile, '_value', cls.LETTER_VALUES[letter])
+        object.__setattr__(tile, '_code', BLANK_FLAG if letter == '?' else ord(letter) - ord('A') + 1)
+        return tile
 
     @classmethod
     def fromstr(cls, tile_str):
         """
         Constructs a Tile based on a string in the Woogles format.
         """
-        if len(tile_str) != 1:
+        tile = _LETTER_TILES.get(tile_str)
+        if tile is not None:
+            return tile
+        elif len(tile_str) != 1:
             raise ValueError(f"Cannot construct tile from {tile_str}, Tiles can only be constructed from single characters")
         
         if tile_str.isupper():
@@ -31,19 +64,42 @@ class Tile:
 
     @property
     def value(self) -> int:
-        return self.LETTER_VALUES[self._letter]
+        return self._value
     
+    @property
+    def code(self) -> int:
+        """
+        Returns the compact integer encoding of the tile (see BLANK_FLAG).
+        """
+        return self._code
+
+    @classmethod
+    def fromcode(cls, code: int):
+        """
+        Constructs a Tile from its compact integer encoding.
+        """
+        letter = code & ~BLANK_FLAG
+        if not (0 <= code < N_CODES) or letter > 26 or code == EMPTY_CODE:
+            raise ValueError(f"Invalid tile code {code}")
+
+        if code & BLANK_FLAG:
+            tile = cls('?')
+            if letter:
+                tile.set_letter(chr(ord('a') + letter - 1))
+            return tile
+        return cls(_LETTERS[letter])
+
     @property
     def letter(self) -> str:
         return self._letter
     
     @property
     def is_blank(self) -> bool:
-        return self._letter == '?'
+        return self._code & BLANK_FLAG != 0
     
     @property
     def is_set(self) -> bool:
-        return not self.is_blank or self._custom_letter is not None
+        return self._code != BLANK_FLAG
 
     def set_letter(self, custom_letter: str):
         if not self.is_blank:
@@ -55,7 +111,11 @@ class Tile:
             raise ValueError(f"Invalid blank tile letter {custom_letter}")
         
         # Store in lowercase to match Woogles omgwords format
-        self._custom_letter = custom_letter.lower()
+        code = ord(custom_letter.upper()) - ord('A') + 1
+        if not 1 <= code <= 26:
+            raise ValueError(f"Invalid blank tile letter {custom_letter}")
+        object.__setattr__(self, '_custom_letter', custom_letter.lower())
+        object.__setattr__(self, '_code', BLANK_FLAG | code)
 
         return self
 
@@ -83,4 +143,32 @@ class Tile:
         return self._letter < other._letter
     
     def __hash__(self) -> int:
-        return hash(self._letter)
\ No newline at end of file
+        return hash(self._letter)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Tiles can only be modified through set_letter")
+
+    def __reduce__(self):
+        if self.is_blank:
+            return (Tile.fromcode, (self._code,))
+        return (Tile, (self._letter,))
+
+    def __copy__(self):
+        # Blanks are copied, as their letter can still be set
+        return Tile.fromcode(self._code) if self.is_blank else self
+
+    def __deepcopy__(self, memo):
+        return self.__copy__()
+
+_LETTERS = ' ABCDEFGHIJKLMNOPQRSTUVWXYZ' # Indexed by letter code
+_LETTER_TILES = {letter: Tile._create(letter) for letter in _LETTERS[1:]}
+
+def _code_letter(code: int) -> str:
+    letter = code & ~BLANK_FLAG
+    if code == EMPTY_CODE or letter > 26:
+        return ''
+    return '?' if letter == 0 else chr(ord('A') + letter - 1)
+
+# Lookup tables indexed by tile code: face value, and letter in the uppercase word-forming convention ('?' for unset blanks)
+CODE_VALUES = bytes(0 if code & BLANK_FLAG else Tile.LETTER_VALUES.get(_code_letter(code), 0) for code in range(N_CODES))
+CODE_LETTERS = tuple(_code_letter(code) for code in range(N_CODES))
@@ -1,4 +1,5 @@
 import unittest
+import pickle
 
 from src.board_pos import Pos, Direction
 
@@ -89,5 +90,34 @@ class TestRegularise(unittest.TestCase):
         with self.assertRaises(AssertionError):
             pos.regularise()
 
+class TestInterning(unittest.TestCase):
+    def test_canonical(self):
+        self.assertIs(Pos(3, 4), Pos(3, 4))
+        self.assertIs(Pos(3, 4) + Direction.Horizontal.epsilon, Pos(3, 5))
+        self.assertIs(Pos.fromindex(Pos(9, 2).index), Pos(9, 2))
+        self.assertIs(Pos.fromstr('6G')[0], Pos(5, 6))
+        self.assertIs(pickle.loads(pickle.dumps(Pos(1, 2))), Pos(1, 2))
+
+    def test_out_of_bounds(self):
+        pos = Pos(7, 14) + Direction.Horizontal.epsilon
+        self.assertFalse(pos.in_bounds)
+        self.assertEqual(pos, Pos(7, 15))
+        self.assertEqual(pos - Direction.Horizontal.epsilon, Pos(7, 14))
+
+    def test_immutable(self):
+        pos = Pos(1, 1)
+        with self.assertRaises(AttributeError):
+            pos._row = 2 # type: ignore
+        self.assertEqual(pos.row, 1)
+
+class TestStep(unittest.TestCase):
+    def test_step(self):
+        self.assertIs(Pos(4, 4).step(Direction.Horizontal), Pos(4, 5))
+        self.assertIs(Pos(4, 4).step(Direction.Vertical, backwards=True), Pos(3, 4))
+
+    def test_edge(self):
+        self.assertIsNone(Pos(14, 3).step(Direction.Vertical))
+        self.assertIsNone(Pos(2, 0).step(Direction.Horizontal, backwards=True))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -1,9 +1,13 @@
 import unittest
+from collections import Counter
+import pickle
+import threading
+import copy
 
-from src.board import Board
+from src.board import Board, MoveError, GridChange, SQUARE_MULTIPLIERS, _run_start, _run_end
 from src.move import Move
 from src.tile import Tile
-from src.board_pos import Pos
+from src.board_pos import Pos, Direction
  
 class TestApplyMove(unittest.TestCase):
     def test_invalid_move(self):
@@ -99,6 +103,33 @@ class TestApplyMove(unittest.TestCase):
         self.assertEqual([board.get_tile(pos) for pos in move4.coordinates], [None] * len(move4._tiles))
         self.assertEqual(list(board.moves()), [move1, move2, move3])
 
+class TestStorage(unittest.TestCase):
+    def test_get_tile(self):
+        board = Board()
+        move = Move.fromstr('8G Q?')
+        self.assertTrue(board.apply_move(move))
+        self.assertEqual(board.get_tile(Pos(7, 6)), Tile('Q'))
+        self.assertEqual(board.get_tile(Pos(7, 7)).format(), '?')
+        self.assertIsNone(board.get_tile(Pos(7, 8)))
+
+        self.assertTrue(board.set_blanks('i'))
+        self.assertEqual(board.get_tile(Pos(7, 7)).format(), 'i')
+
+    def test_iter(self):
+        board = Board()
+        self.assertTrue(board.apply_move(Move.fromstr('H8 EGG')))
+        rows = list(board)
+        self.assertEqual(len(rows), Board.DIM)
+        self.assertTrue(all(len(row) == Board.DIM for row in rows))
+        self.assertEqual([rows[i][7] for i in range(7, 10)], [Tile('E'), Tile('G'), Tile('G')])
+        self.assertEqual(sum(tile is not None for row in rows for tile in row), 3)
+
+    def test_undo(self):
+        board = Board()
+        self.assertTrue(board.apply_move(Move.fromstr('H8 EGG')))
+        board.undo_move()
+        self.assertEqual(board._board, Board()._board)
+
 class TestGetScore(unittest.TestCase):
     def test_bingo(self):
         board = Board()
@@ -125,6 +156,38 @@ class TestGetScore(unittest.TestCase):
         self.assertTrue(board.apply_move(move1))
         self.assertEqual(board.get_score(), 102)
 
+class TestDesignateThroughMove(unittest.TestCase):
+    def test_set_blanks_on_move(self):
+        board = Board()
+        move = Move.fromstr('8G C?T')
+        self.assertTrue(board.apply_move(move))
+        view = board.snapshot()
+        self.assertTrue(move.set_blanks('a'))
+
+        self.assertEqual(board.get_challenge_words(), {'CAT'})
+        self.assertEqual(board.get_tile(Pos(7, 7)).format(), 'a')
+        self.assertEqual(board.grid[Pos(7, 7).index], Tile.fromstr('a').code)
+        self.assertEqual(board.position_hash, Board.from_bytes(board.to_bytes()).position_hash)
+        self.assertEqual(board._get_adjacent_words(Pos(7, 9).index, Direction.Horizontal), ('CAT', 4, '', 0))
+        self.assertGreater(board.snapshot().version, view.version)
+        self.assertEqual(board.snapshot().get_tile(Pos(7, 7)).format(), 'a')
+
+class TestSquareMultipliers(unittest.TestCase):
+    def test_squares(self):
+        self.assertEqual(SQUARE_MULTIPLIERS[Pos(7, 7).index], (1, 2))
+        self.assertEqual(SQUARE_MULTIPLIERS[Pos(0, 14).index], (1, 3))
+        self.assertEqual(SQUARE_MULTIPLIERS[Pos(14, 11).index], (2, 1))
+        self.assertEqual(SQUARE_MULTIPLIERS[Pos(9, 13).index], (3, 1))
+        self.assertEqual(SQUARE_MULTIPLIERS[Pos(7, 8).index], (1, 1))
+
+    def test_counts(self):
+        counts = Counter(SQUARE_MULTIPLIERS)
+        self.assertEqual(counts[(1, 3)], 8)
+        self.assertEqual(counts[(1, 2)], 17)
+        self.assertEqual(counts[(3, 1)], 12)
+        self.assertEqual(counts[(2, 1)], 24)
+        self.assertEqual(len(SQUARE_MULTIPLIERS), Board.N_SQUARES)
+
 class TestGetChallengeWords(unittest.TestCase):
     def test_get_word_single(self):
         board = Board()
@@ -171,5 +234,608 @@ class TestGetChallengeWords(unittest.TestCase):
         self.assertSetEqual(board.get_challenge_words(), set(['INSIST']))
             
 
+class TestEvaluate(unittest.TestCase):
+    def test_matches_apply(self):
+        board = Board()
+        moves = [Move.fromstr(m) for m in ['8G TO', 'G5 TIL.', '7F I.L', '6F Q']]
+        expected_scores = [4, 5, 5, 62]
+        for move, score in zip(moves, expected_scores):
+            evaluation = board.evaluate(move)
+            self.assertTrue(evaluation.is_valid)
+            self.assertEqual(evaluation.score, score)
+            self.assertTrue(board.apply_move(move))
+            self.assertEqual(evaluation.words, board.get_challenge_words())
+
+    def test_no_mutation(self):
+        board = Board()
+        self.assertTrue(board.apply_move(Move.fromstr('8E HORN')))
+        before = bytearray(board._board)
+
+        evaluation = board.evaluate(Move.fromstr('G6 FA.M'))
+        self.assertTrue(evaluation.is_valid)
+        self.assertEqual(evaluation.main_word, 'FARM')
+        self.assertEqual(evaluation.cross_words, ())
+        self.assertEqual(board._board, before)
+        self.assertEqual(len(list(board.moves())), 1)
+
+    def test_cross_words(self):
+        board = Board()
+        for move in ['8E HORN', 'G6 FA.M', '10E PASTE']:
+            self.assertTrue(board.apply_move(Move.fromstr(move)))
+        evaluation = board.evaluate(Move.fromstr('9G .OB'))
+        self.assertEqual(evaluation.main_word, 'MOB')
+        self.assertEqual(evaluation.cross_words, ('NOT', 'BE'))
+
+    def test_errors(self):
+        board = Board()
+        invalid_shape = Move([Tile('P'), Tile('U'), Tile('T')], [Pos(7, 7), Pos(8, 8), Pos(7, 9)])
+        self.assertEqual(board.evaluate(invalid_shape).error, MoveError.InvalidShape)
+        self.assertEqual(board.evaluate(Move([Tile('A')], [Pos(7, 15)])).error, MoveError.OutOfBounds)
+        self.assertEqual(board.evaluate(Move.fromstr('I8 EGG')).error, MoveError.NoAnchor)
+
+        self.assertTrue(board.apply_move(Move.fromstr('H8 EGG')))
+        self.assertEqual(board.evaluate(Move.fromstr('10I AFF.E')).error, MoveError.Discontinuous)
+        evaluation = board.evaluate(Move.fromstr('H8 E'))
+        self.assertEqual(evaluation.error, MoveError.Occupied)
+        self.assertFalse(evaluation.is_valid)
+        self.assertIsNone(evaluation.words)
+
+    def test_unset_blank(self):
+        board = Board()
+        evaluation = board.evaluate(Move.fromstr('8G C?T'))
+        self.assertEqual(evaluation.main_word, 'C?T')
+        self.assertEqual(evaluation.score, 8)
+        self.assertIsNone(evaluation.words)
+
+    def test_single_tile_vertical(self):
+        # A single tile only forming a word vertically shouldn't also be scored as a horizontal word
+        board = Board()
+        self.assertTrue(board.apply_move(Move.fromstr('H8 EGG')))
+        evaluation = board.evaluate(Move.fromstr('11H S'))
+        self.assertEqual(evaluation.score, 6)
+        self.assertEqual(evaluation.main_word, 'EGGS')
+        self.assertEqual(evaluation.cross_words, ())
+
+        self.assertTrue(board.apply_move(Move.fromstr('11H S')))
+        self.assertSetEqual(board.get_challenge_words(), set(['EGGS']))
+
+class TestAdjacentWords(unittest.TestCase):
+    MOVES = ['8E HORN', 'G6 FA.M', '10E PASTE', '9G .OB', '11E S']
+
+    @staticmethod
+    def get_adjacent_words(board: Board):
+        return {
+            (pos, dir): board._get_adjacent_words(pos.index, dir)
+            for pos in (Pos.fromindex(idx) for idx in range(Board.N_SQUARES)) if board.get_tile(pos) is None
+            for dir in Direction
+        }
+
+    def test_incremental(self):
+        board = Board()
+        for move in self.MOVES:
+            self.assertTrue(board.apply_move(Move.fromstr(move)))
+
+        self.assertEqual(board._get_adjacent_words(Pos(8, 5).index, Direction.Horizontal), ('', 0, 'MOB', 7))
+        self.assertEqual(board._get_adjacent_words(Pos(8, 5).index, Direction.Vertical), ('O', 1, 'A', 1))
+        self.assertEqual(board._get_adjacent_words(Pos(11, 4).index, Direction.Vertical), ('PS', 4, '', 0))
+        self.assertEqual(board._get_adjacent_words(Pos(0, 0).index, Direction.Vertical), ('', 0, '', 0))
+
+    def test_undo_restores(self):
+        board = Board()
+        snapshots = [self.get_adjacent_words(board)]
+        for move in self.MOVES:
+            self.assertTrue(board.apply_move(Move.fromstr(move)))
+            snapshots.append(self.get_adjacent_words(board))
+        
+        for expected in reversed(snapshots[:-1]):
+            board.undo_move()
+            self.assertEqual(self.get_adjacent_words(board), expected)
+
+    def test_blanks(self):
+        board = Board()
+        self.assertTrue(board.apply_move(Move.fromstr('8G C?T')))
+        self.assertEqual(board._get_adjacent_words(Pos(7, 9).index, Direction.Horizontal), ('C?T', 4, '', 0))
+        self.assertTrue(board.set_blanks('a'))
+        self.assertEqual(board._get_adjacent_words(Pos(7, 9).index, Direction.Horizontal), ('CAT', 4, '', 0))
+        self.assertEqual(board._get_adjacent_words(Pos(8, 7).index, Direction.Vertical), ('A', 0, '', 0))
+
+class TestLineMasks(unittest.TestCase):
+    def test_masks(self):
+        board = Board()
+        self.assertTrue(board.apply_move(Move.fromstr('8E HORN')))
+        self.assertTrue(board.apply_move(Move.fromstr('G6 FA.M')))
+        self.assertEqual(board._line_masks[Direction.Horizontal.value][7], 0b11110000)
+        self.assertEqual(board._line_masks[Direction.Vertical.value][6], 0b111100000)
+        self.assertEqual(board._line_masks[Direction.Vertical.value][5], 1 << 7)
+
+        board.undo_move()
+        board.undo_move()
+        self.assertEqual(board._line_masks, Board()._line_masks)
+
+    def test_run_extents(self):
+        mask = 0b0111011
+        self.assertEqual((_run_start(mask, 4), _run_end(mask, 4)), (3, 5))
+        self.assertEqual((_run_start(mask, 2), _run_end(mask, 2)), (0, 5))
+        self.assertEqual((_run_start(mask, 0), _run_end(mask, 0)), (0, 1))
+        self.assertEqual((_run_start(mask, 6), _run_end(mask, 6)), (3, 6))
+
+    def test_word_range(self):
+        board = Board()
+        self.assertTrue(board.apply_move(Move.fromstr('8B ABANDON')))
+        self.assertTrue(board.apply_move(Move.fromstr('8I ED')))
+        self.assertEqual(list(board._get_word_range(Pos(7, 3).index, Direction.Horizontal)), list(range(106, 115)))
+        self.assertEqual(list(board._get_word_range(Pos(7, 3).index, Direction.Vertical)), [Pos(7, 3).index])
+
+class TestAnchors(unittest.TestCase):
+    def test_empty_board(self):
+        board = Board()
+        self.assertEqual(list(board.anchor_positions()), [Pos(7, 7)])
+
+    def test_after_move(self):
+        board = Board()
+        self.assertTrue(board.apply_move(Move.fromstr('H8 EGG')))
+        expected = [Pos(6, 7), Pos(7, 6), Pos(7, 8), Pos(8, 6), Pos(8, 8), Pos(9, 6), Pos(9, 8), Pos(10, 7)]
+        self.assertEqual(list(board.anchor_positions()), expected)
+        self.assertEqual(board.anchors, sum(1 << pos.index for pos in expected))
+
+        board.undo_move()
+        self.assertEqual(board.anchors, Board().anchors)
+
+    def test_board_edge(self):
+        board = Board()
+        self.assertTrue(board.apply_move(Move.fromstr('8H ABANDON')))
+        self.assertTrue(board.apply_move(Move.fromstr('8O S')))
+        anchors = set(board.anchor_positions())
+        self.assertIn(Pos(6, 14), anchors)
+        self.assertIn(Pos(7, 6), anchors)
+        self.assertNotIn(Pos(8, 0), anchors)
+        self.assertNotIn(Pos(7, 0), anchors)
+        self.assertEqual(len(anchors), 2 * 8 + 1)
+
+class TestScoreMany(unittest.TestCase):
+    def setUp(self):
+        self.board = Board()
+        for move in ['8E HORN', 'G6 FA.M', '10E PASTE']:
+            self.assertTrue(self.board.apply_move(Move.fromstr(move)))
+
+    def test_matches_evaluate(self):
+        candidates = ['9G .OB', '11E S', '9F I', 'I8 .E', 'K6 AT']
+        moves = [Move.fromstr(m) for m in candidates]
+        evaluations = list(self.board.score_many(moves))
+        self.assertEqual(len(evaluations), len(moves))
+        for move, evaluation in zip(moves, evaluations):
+            self.assertIs(evaluation.move, move)
+            self.assertEqual(self.board.apply_move(move), evaluation.is_valid)
+            if evaluation.is_valid:
+                self.assertEqual(evaluation.score, self.board.get_score())
+                self.assertEqual(evaluation.words, self.board.get_challenge_words())
+                self.board.undo_move()
+
+    def test_stream(self):
+        moves = (Move.fromstr(m) for m in ['9G .OB', '9G .OB'])
+        scores = [evaluation.score for evaluation in self.board.score_many(moves)]
+        self.assertEqual(scores[0], scores[1])
+
+    def test_position_change(self):
+        move = Move.fromstr('11E S')
+        before = next(self.board.score_many([move]))
+        self.assertEqual(before.main_word, 'PS')
+        self.assertTrue(self.board.apply_move(Move.fromstr('E11 S')))
+        after = next(self.board.score_many([move]))
+        self.assertEqual(after.error, MoveError.Occupied)
+
+class TestPositionHash(unittest.TestCase):
+    def test_incremental(self):
+        board = Board()
+        self.assertEqual(board.position_hash, 0)
+        hashes = [board.position_hash]
+        for move in ['8E HORN', 'G6 FA.M', '10E PASTE']:
+            self.assertTrue(board.apply_move(Move.fromstr(move)))
+            self.assertNotIn(board.position_hash, hashes)
+            self.assertLess(board.position_hash, 1 << 64)
+            hashes.append(board.position_hash)
+
+        for expected in reversed(hashes[:-1]):
+            board.undo_move()
+            self.assertEqual(board.position_hash, expected)
+
+    def test_transposition(self):
+        board1, board2 = Board(), Board()
+        for move in ['8E HORN', 'G6 FA.M', 'I7 TO']:
+            self.assertTrue(board1.apply_move(Move.fromstr(move)))
+        for move in ['8E HORN', 'I7 TO', 'G6 FA.M']:
+            self.assertTrue(board2.apply_move(Move.fromstr(move)))
+        self.assertNotEqual(list(board1.moves()), list(board2.moves()))
+        self.assertEqual(board1.position_hash, board2.position_hash)
+
+    def test_blanks(self):
+        board1, board2 = Board(), Board()
+        self.assertTrue(board1.apply_move(Move.fromstr('8E HO?N')))
+        self.assertTrue(board2.apply_move(Move.fromstr('8E HOrN')))
+        self.assertNotEqual(board1.position_hash, board2.position_hash)
+
+        self.assertTrue(board1.set_blanks('r'))
+        self.assertEqual(board1.position_hash, board2.position_hash)
+
+        board3 = Board()
+        self.assertTrue(board3.apply_move(Move.fromstr('8E HORN')))
+        self.assertNotEqual(board3.position_hash, board2.position_hash)
+
+    def test_snapshot(self):
+        board = Board()
+        for move in ['8E HORN', 'G6 FA.M']:
+            self.assertTrue(board.apply_move(Move.fromstr(move)))
+        self.assertEqual(Board.from_bytes(board.to_bytes()).position_hash, board.position_hash)
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.board = Board()
+        for move in ['8E HORN', 'G6 FA.M', '10E PASTe', '11I ?']:
+            self.assertTrue(self.board.apply_move(Move.fromstr(move)))
+
+    def assertSameBoard(self, board, expected):
+        self.assertEqual(bytes(board._board), bytes(expected._board))
+        self.assertEqual(board._line_masks, expected._line_masks)
+        for dir in Direction:
+            for idx in range(Board.N_SQUARES):
+                if not board._board[idx]: # Adjacent words are only maintained for empty squares
+                    self.assertEqual(board._get_adjacent_words(idx, dir), expected._get_adjacent_words(idx, dir))
+        self.assertEqual(board.anchors, expected.anchors)
+        self.assertEqual(board.position_hash, expected.position_hash)
+        self.assertEqual(list(board.moves()), list(expected.moves()))
+        self.assertEqual([board.get_score(i) for i in range(len(expected._move_info))], [expected.get_score(i) for i in range(len(expected._move_info))])
+
+    def test_round_trip(self):
+        data = self.board.to_bytes()
+        self.assertEqual(len(data), 8 + 225 + 5 * 4 + 2 * 13)
+        restored = Board.from_bytes(data)
+        self.assertSameBoard(restored, self.board)
+        self.assertEqual(restored.to_bytes(), data)
+
+        move = Move.fromstr('9G .OB')
+        self.assertEqual(restored.evaluate(move).score, self.board.evaluate(move).score)
+        self.assertTrue(restored.set_blanks('t'))
+        self.assertEqual(restored.get_challenge_words(), {'ET'})
+
+    def test_empty_board(self):
+        self.assertSameBoard(Board.from_bytes(Board().to_bytes()), Board())
+
+    def test_zero_copy(self):
+        buffer = bytearray(self.board.to_bytes())
+        restored = Board.from_bytes(buffer, copy=False)
+        self.assertTrue(restored.apply_move(Move.fromstr('9G .OB')))
+        self.assertEqual(buffer[8 + Pos(8, 8).index], Tile('B').code)
+        restored.undo_move()
+        self.assertEqual(bytes(buffer[8:8 + 225]), bytes(self.board.grid))
+
+        with self.assertRaises(ValueError):
+            Board.from_bytes(bytes(buffer), copy=False)
+
+    def test_pickle(self):
+        self.assertSameBoard(pickle.loads(pickle.dumps(self.board)), self.board)
+
+    def test_invalid(self):
+        data = self.board.to_bytes()
+        for invalid in [b'', data[:-1], data + b'\0', b'XXXX' + data[4:], data[:8] + b'\x3f' + data[9:]]:
+            with self.assertRaises(ValueError):
+                Board.from_bytes(invalid)
+
+        # Tile on the board which isn't part of any move
+        square = 8 + Pos(0, 0).index
+        with self.assertRaises(ValueError):
+            Board.from_bytes(data[:square] + bytes([Tile('A').code]) + data[square + 1:])
+
+    def test_grid(self):
+        grid = self.board.grid
+        self.assertTrue(grid.readonly)
+        self.assertEqual(grid[Pos(7, 4).index], Tile('H').code)
+        self.board.undo_move()
+        self.assertEqual(grid[Pos(5, 10).index], 0)
+
+class TestFork(unittest.TestCase):
+    def setUp(self):
+        self.board = Board()
+        for move in ['8E HORN', 'G6 FA.M']:
+            self.assertTrue(self.board.apply_move(Move.fromstr(move)))
+        self.snapshot = self.board.to_bytes()
+
+    def assertUnchanged(self, board):
+        self.assertEqual(board.to_bytes(), self.snapshot)
+        self.assertEqual(board.position_hash, Board.from_bytes(self.snapshot).position_hash)
+
+    def test_shares_storage(self):
+        fork = self.board.fork()
+        self.assertIs(fork._board, self.board._board)
+        self.assertIs(fork._move_info, self.board._move_info)
+        self.assertEqual(fork.to_bytes(), self.snapshot)
+
+    def test_fork_writes(self):
+        fork = self.board.fork()
+        self.assertTrue(fork.apply_move(Move.fromstr('10E PASTE')))
+        fork.undo_move()
+        fork.undo_move()
+        self.assertUnchanged(self.board)
+        self.assertEqual(len(list(fork.moves())), 1)
+
+        move = Move.fromstr('9G .OB')
+        self.assertTrue(self.board.apply_move(move))
+        self.assertIsNone(fork.get_tile(Pos(8, 7)))
+        self.assertTrue(fork.evaluate(move).is_valid)
+
+    def test_original_writes(self):
+        fork = self.board.fork()
+        self.board.undo_move()
+        self.assertEqual(fork.to_bytes(), self.snapshot)
+        self.assertTrue(fork.apply_move(Move.fromstr('10E PASTE')))
+        self.assertEqual(len(list(self.board.moves())), 1)
+
+    def test_blanks(self):
+        self.assertTrue(self.board.apply_move(Move.fromstr('10E PAS?E')))
+        self.snapshot = self.board.to_bytes()
+        fork = self.board.fork()
+        self.assertTrue(fork.set_blanks('t'))
+        self.assertEqual(fork.get_challenge_words(), {'PASTE', 'FARMS'})
+        self.assertUnchanged(self.board)
+        self.assertIsNone(self.board.get_challenge_words())
+
+        self.assertTrue(self.board.set_blanks('s'))
+        self.assertEqual(self.board.get_challenge_words(), {'PASSE', 'FARMS'})
+        self.assertEqual(fork.get_challenge_words(), {'PASTE', 'FARMS'})
+
+    def test_wrapped_buffer(self):
+        buffer = bytearray(self.snapshot)
+        board = Board.from_bytes(buffer, copy=False)
+        fork = board.fork()
+        self.assertTrue(fork.apply_move(Move.fromstr('10E PASTE')))
+        self.assertEqual(bytes(buffer), self.snapshot)
+        self.assertTrue(board.apply_move(Move.fromstr('9G .OB')))
+        self.assertEqual(buffer[8 + Pos(8, 8).index], Tile('B').code)
+
+    def test_copy(self):
+        for fork in [copy.copy(self.board), copy.deepcopy(self.board)]:
+            fork.undo_move()
+            self.assertUnchanged(self.board)
+
+class TestRewriteHistory(unittest.TestCase):
+    MOVES = ['8E HORN', 'G6 FA.M', '10E PASTE', '11I S', 'E10 .IT']
+
+    def setUp(self):
+        self.board = Board()
+        for move in self.MOVES:
+            self.assertTrue(self.board.apply_move(Move.fromstr(move)))
+
+        # Count the moves which are (re-)evaluated
+        self.evaluated = []
+        evaluate = self.board.evaluate
+        def counting_evaluate(move):
+            self.evaluated.append(move.format())
+            return evaluate(move)
+        self.board.evaluate = counting_evaluate
+
+    def assertMatchesReplay(self, moves):
+        expected = Board()
+        for move in moves:
+            try:
+                expected.apply_move(Move.fromstr(move))
+            except ValueError:
+                pass
+        self.assertEqual(self.board.to_bytes(), expected.to_bytes())
+        self.assertEqual(self.board.position_hash, expected.position_hash)
+        self.assertEqual(self.board.anchors, expected.anchors)
+        self.assertEqual([info.footprint for info in self.board._move_info], [info.footprint for info in expected._move_info])
+
+    def test_retract_independent(self):
+        self.assertEqual(self.board.retract_move(3), [])
+        self.assertEqual(self.evaluated, [])
+        self.assertMatchesReplay(self.MOVES[:3] + self.MOVES[4:])
+
+    def test_retract_latest(self):
+        self.assertEqual(self.board.retract_move(-1), [])
+        self.assertMatchesReplay(self.MOVES[:-1])
+
+    def test_retract_dependent(self):
+        invalid = self.board.retract_move(0)
+        self.assertEqual([move.format() for move in invalid], ['G6 FA.M', '10E PASTE', '11I S', 'E11 IT'])
+        self.assertMatchesReplay([])
+
+        self.assertTrue(self.board.apply_move(Move.fromstr('8E HORN')))
+
+    def test_replace_rescores(self):
+        self.assertEqual(self.board.replace_move(2, Move.fromstr('10E PASTY')), [])
+        # Only the replacement and the move extending its last letter are evaluated
+        self.assertEqual(self.evaluated, ['10E PASTY', '11I S'])
+        self.assertMatchesReplay(self.MOVES[:2] + ['10E PASTY'] + self.MOVES[3:])
+        self.assertEqual(self.board.get_challenge_words(), {'PIT'})
+
+    def test_replace_invalidates(self):
+        # The replacement no longer reaches I10, which the S was played below
+        invalid = self.board.replace_move(2, Move.fromstr('10B DEMAST'))
+        self.assertEqual([move.format() for move in invalid], ['11I S'])
+        self.assertMatchesReplay(self.MOVES[:2] + ['10B DEMAST'] + self.MOVES[3:])
+
+    def test_invalid_replacement(self):
+        snapshot = self.board.to_bytes()
+        with self.assertRaises(ValueError):
+            self.board.replace_move(1, Move.fromstr('A1 ZZZ'))
+        self.assertEqual(self.board.to_bytes(), snapshot)
+        with self.assertRaises(IndexError):
+            self.board.retract_move(5)
+
+    def test_fork(self):
+        self.assertTrue(self.board.apply_move(Move.fromstr('13E ?A')))
+        fork = self.board.fork()
+        snapshot = self.board.to_bytes()
+        self.assertEqual(fork.retract_move(3), [])
+        self.assertTrue(fork.set_blanks('t'))
+        self.assertEqual(self.board.to_bytes(), snapshot)
+        self.assertIsNone(self.board.get_challenge_words())
+
+class TestInferMove(unittest.TestCase):
+    def setUp(self):
+        self.board = Board()
+        for move in ['8E HORN', 'G6 FA.M']:
+            self.assertTrue(self.board.apply_move(Move.fromstr(move)))
+
+    def read(self, *moves):
+        """
+        Returns the grid reading of the board with the given moves added
+        """
+        board = self.board.fork()
+        for move in moves:
+            self.assertTrue(board.apply_move(Move.fromstr(move)))
+        return bytearray(board.grid)
+
+    def test_no_change(self):
+        self.assertIs(self.board.infer_move(self.board.grid).change, GridChange.NoChange)
+        self.assertIs(self.board.infer_move(memoryview(self.read()).cast('B', (15, 15))).change, GridChange.NoChange)
+
+    def test_new_move(self):
+        inference = self.board.infer_move(bytes(self.read('10E PASTE')))
+        self.assertIs(inference.change, GridChange.NewMove)
+        self.assertEqual(inference.move, Move.fromstr('10E PASTE'))
+        self.assertEqual(inference.evaluation.main_word, 'PASTE')
+        self.assertTrue(self.board.apply_move(inference.move))
+
+    def test_invalid_move(self):
+        grid = self.read()
+        grid[Pos(0, 0).index] = Tile('Q').code
+        inference = self.board.infer_move(grid)
+        self.assertIs(inference.change, GridChange.Inconsistent)
+        self.assertEqual(inference.squares, (Pos(0, 0),))
+        self.assertEqual(inference.evaluation.error, MoveError.NoAnchor)
+
+    def test_retraction(self):
+        grid = self.read()
+        for pos in Move.fromstr('G6 FA.M').coordinates:
+            grid[pos.index] = 0
+        inference = self.board.infer_move(grid)
+        self.assertIs(inference.change, GridChange.Retraction)
+        self.assertEqual((inference.move_index, inference.move), (1, Move.fromstr('G6 FA.M')))
+
+        grid[Pos(5, 6).index] = Tile('F').code
+        inference = self.board.infer_move(grid)
+        self.assertIs(inference.change, GridChange.Inconsistent)
+        self.assertEqual(inference.squares, (Pos(6, 6), Pos(8, 6)))
+
+    def test_changed(self):
+        grid = self.read('10E PASTE')
+        grid[Pos(7, 4).index] = Tile('B').code
+        inference = self.board.infer_move(grid)
+        self.assertIs(inference.change, GridChange.Inconsistent)
+        self.assertEqual(inference.squares, (Pos(7, 4),) + tuple(Move.fromstr('10E PASTE').coordinates))
+
+    def test_blanks(self):
+        self.assertTrue(self.board.apply_move(Move.fromstr('10E PAStE')))
+        grid = self.read()
+        grid[Pos(9, 7).index] = Tile('?').code # Designation not read
+        self.assertIs(self.board.infer_move(grid).change, GridChange.NoChange)
+        grid[Pos(9, 7).index] = Tile('T').code
+        self.assertIs(self.board.infer_move(grid).change, GridChange.Inconsistent)
+
+    def test_invalid_grid(self):
+        with self.assertRaises(ValueError):
+            self.board.infer_move(bytes(224))
+        with self.assertRaises(ValueError):
+            self.board.infer_move(bytes([27]) + bytes(224))
+
+class TestBoardView(unittest.TestCase):
+    def setUp(self):
+        self.board = Board()
+        self.assertTrue(self.board.apply_move(Move.fromstr('8E HORN')))
+
+    def assertMatches(self, view, board):
+        self.assertEqual(bytes(view.grid), bytes(board.grid))
+        self.assertEqual(list(view.moves()), list(board.moves()))
+        self.assertEqual(list(view), list(board))
+        self.assertEqual(view.position_hash, board.position_hash)
+
+    def test_published_per_modification(self):
+        view = self.board.snapshot()
+        self.assertIs(self.board.snapshot(), view) # Reads don't copy
+        self.assertMatches(view, self.board)
+        self.assertEqual(view.get_tile(Pos(7, 4)), Tile('H'))
+        self.assertEqual(view.get_score(), self.board.get_score())
+
+        self.assertTrue(self.board.apply_move(Move.fromstr('G6 FA.M')))
+        latest = self.board.snapshot()
+        self.assertEqual(latest.version, view.version + 1)
+        self.assertMatches(latest, self.board)
+        self.assertEqual(view.n_moves, 1)
+        self.assertIsNone(view.get_tile(Pos(5, 6)))
+
+        self.assertFalse(self.board.apply_move(Move.fromstr('A1 ZA')))
+        self.assertIs(self.board.snapshot(), latest)
+        self.board.undo_move()
+        self.assertMatches(self.board.snapshot(), self.board)
+        self.assertEqual(latest.n_moves, 2)
+
+    def test_set_blanks(self):
+        self.assertTrue(self.board.apply_move(Move.fromstr('G6 FA.?')))
+        view = self.board.snapshot()
+        self.assertTrue(self.board.set_blanks('M'))
+        self.assertEqual(list(view.moves())[-1].format(), 'G6 FA.?')
+        self.assertEqual(view.get_tile(Pos(8, 6)), Tile('?'))
+        self.assertMatches(self.board.snapshot(), self.board)
+        self.assertEqual(list(self.board.moves())[-1].format(), 'G6 FA.m')
+
+    def test_set_blanks_in_place(self):
+        move = Move.fromstr('G6 FA.?')
+        self.assertTrue(self.board.apply_move(move))
+        self.assertTrue(self.board.set_blanks('m'))
+        self.assertEqual(move.n_of_unset_blanks, 0)
+        self.assertIs(list(self.board.moves())[-1], move)
+        self.assertIs(list(self.board.snapshot().moves())[-1], move) # Moves without unset blanks are shared
+
+    def test_restored_blanks(self):
+        self.assertTrue(self.board.apply_move(Move.fromstr('G6 FA.?')))
+        board = Board.from_bytes(self.board.to_bytes())
+        view = board.snapshot()
+        self.assertTrue(board.set_blanks('m'))
+        self.assertEqual(list(view.moves())[-1].format(), 'G6 FA.?')
+        self.assertEqual(list(board.snapshot().moves())[-1].format(), 'G6 FA.m')
+
+    def test_rewrite_history(self):
+        self.assertTrue(self.board.apply_move(Move.fromstr('G6 FA.M')))
+        view = self.board.snapshot()
+        self.board.retract_move(1)
+        self.assertEqual(view.n_moves, 2)
+        self.assertMatches(self.board.snapshot(), self.board)
+        with self.assertRaises(ValueError):
+            self.board.replace_move(0, Move.fromstr('A1 ZA'))
+        self.assertMatches(self.board.snapshot(), self.board)
+
+    def test_restore(self):
+        self.assertTrue(self.board.apply_move(Move.fromstr('G6 FA.M')))
+        restored = Board.from_bytes(self.board.to_bytes())
+        self.assertMatches(restored.snapshot(), self.board)
+        fork = self.board.fork()
+        self.assertIs(fork.snapshot(), self.board.snapshot())
+        self.assertEqual(Board().snapshot().n_moves, 0)
+
+    def test_concurrent_readers(self):
+        moves = [Move.fromstr(move) for move in ['G6 FA.M', '9H E', '9I AT']]
+        done = threading.Event()
+        errors = []
+
+        def read():
+            while not done.is_set():
+                view = self.board.snapshot()
+                n_tiles = sum(len(move.coordinates) for move in view.moves())
+                if n_tiles != Board.N_SQUARES - bytes(view.grid).count(0):
+                    errors.append(view)
+
+        readers = [threading.Thread(target=read) for _ in range(4)]
+        for reader in readers:
+            reader.start()
+        for _ in range(300):
+            for move in moves:
+                self.assertTrue(self.board.apply_move(move))
+            for _ in moves:
+                self.board.undo_move()
+        done.set()
+        for reader in readers:
+            reader.join()
+        self.assertEqual(errors, [])
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
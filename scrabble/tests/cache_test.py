@@ -0,0 +1,79 @@
+import unittest
+
+from src.cache import EvaluationCache
+from src.board import Board, MoveError
+from src.move import Move
+
+class TestEvaluationCache(unittest.TestCase):
+    def test_lru(self):
+        cache = EvaluationCache(maxsize=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        self.assertEqual(cache.get('a'), 1) # 'b' is now least recently used
+        cache.put('c', 3)
+        self.assertEqual(len(cache), 2)
+        self.assertNotIn('b', cache)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), 3)
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+
+        cache.clear()
+        self.assertEqual((len(cache), cache.hits, cache.misses), (0, 0, 0))
+
+    def test_invalid_size(self):
+        with self.assertRaises(ValueError):
+            EvaluationCache(maxsize=0)
+
+class TestBoardCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = EvaluationCache(maxsize=16)
+        self.board = Board(cache=self.cache)
+        for move in ['8E HORN', 'G6 FA.M']:
+            self.assertTrue(self.board.apply_move(Move.fromstr(move)))
+
+    def test_hits(self):
+        misses = self.cache.misses
+        first = self.board.evaluate(Move.fromstr('10E PASTE'))
+        self.assertEqual((self.cache.hits, self.cache.misses), (0, misses + 1))
+
+        move = Move.fromstr('10E PASTE')
+        second = self.board.evaluate(move)
+        self.assertEqual(self.cache.hits, 1)
+        self.assertIs(second.move, move)
+        self.assertEqual((second.score, second.words), (first.score, first.words))
+
+        invalid = Move.fromstr('8E HORN')
+        self.assertEqual(self.board.evaluate(invalid).error, MoveError.Occupied)
+        self.assertEqual(self.board.evaluate(invalid).error, MoveError.Occupied)
+        self.assertEqual(self.cache.hits, 2)
+
+    def test_position_change(self):
+        move = Move.fromstr('11E S')
+        self.assertEqual(self.board.evaluate(move).error, MoveError.NoAnchor)
+        self.assertTrue(self.board.apply_move(Move.fromstr('10E PASTE')))
+        self.assertTrue(self.board.evaluate(move).is_valid)
+        self.board.undo_move()
+        hits = self.cache.hits
+        self.assertEqual(self.board.evaluate(move).error, MoveError.NoAnchor)
+        self.assertEqual(self.cache.hits, hits + 1)
+
+    def test_blanks(self):
+        self.assertNotEqual(self.board.evaluate(Move.fromstr('10E PASTE')).score, self.board.evaluate(Move.fromstr('10E PAStE')).score)
+
+    def test_shared(self):
+        other = Board(cache=self.cache)
+        for move in ['8E HORN', 'G6 FA.M']:
+            self.assertTrue(other.apply_move(Move.fromstr(move)))
+        hits = self.cache.hits
+        self.board.evaluate(Move.fromstr('10E PASTE'))
+        other.evaluate(Move.fromstr('10E PASTE'))
+        self.assertEqual(self.cache.hits, hits + 1)
+
+    def test_bounded(self):
+        for col in 'ABCDEFGHIJKLMNO':
+            for row in range(1, 16):
+                self.board.evaluate(Move.fromstr(f'{col}{row} Z'))
+        self.assertEqual(len(self.cache), 16)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+import tempfile
+import contextlib
+import io
+from pathlib import Path
+
+from src.corpus import verify_corpus, verify_file, find_games, CorpusSummary
+from src.__main__ import main
+
+GOOD_GAME = """#player1 alice Alice
+#player2 bob Bob
+>alice: OTABCDE 8G TO +4 4
+>bob: ILTABCD G5 TIL. +5 5
+>alice: ILABCDE 7F I.L +5 9
+>bob: QABCDEF 6F Q +62 67
+"""
+
+BAD_GAME = """#player1 carol Carol
+#player2 dave Dave
+>carol: AABDNNO 8H ABANDON +72 72
+>dave: EGGXXXX I8 EGG +5 5
+"""
+
+class TestVerifyCorpus(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        root = Path(self.dir.name)
+        (root / 'nested').mkdir()
+        for i in range(10):
+            (root / f'good{i}.gcg').write_text(GOOD_GAME)
+        (root / 'nested' / 'bad.gcg').write_text(GOOD_GAME + BAD_GAME)
+        (root / 'broken.gcg').write_text(GOOD_GAME + '>alice: ??? +x\n')
+        (root / 'notes.txt').write_text(BAD_GAME)
+        self.root = root
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_verify_file(self):
+        reports = verify_file(self.root / 'nested' / 'bad.gcg')
+        self.assertEqual(len(reports), 2)
+        self.assertTrue(reports[0].is_consistent)
+        self.assertEqual(reports[1].players, ('carol', 'dave'))
+        self.assertEqual(reports[1].score_mismatches, ((9, 'carol', 72, 74),))
+        self.assertEqual(reports[1].invalid_moves, ((10, 'I8 EGG', 'Occupied'),))
+
+    def test_broken_file(self):
+        reports = verify_file(self.root / 'broken.gcg')
+        self.assertEqual(len(reports), 1)
+        self.assertIsNotNone(reports[0].error)
+        self.assertFalse(reports[0].is_consistent)
+
+    def check_summary(self, workers: int):
+        summary = CorpusSummary()
+        for report in verify_corpus(find_games(self.root), workers=workers, chunk_size=3):
+            summary.add(report)
+        self.assertEqual(summary.n_games, 13)
+        self.assertEqual(summary.n_inconsistent_games, 2)
+        self.assertEqual(summary.n_score_mismatches, 1)
+        self.assertEqual(summary.n_invalid_moves, 1)
+        self.assertEqual(summary.n_errors, 1)
+
+    def test_serial(self):
+        self.check_summary(workers=1)
+
+    def test_parallel(self):
+        self.check_summary(workers=2)
+
+    def test_main(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            status = main(['verify-corpus', str(self.root), '--workers', '1'])
+        self.assertEqual(status, 1)
+        self.assertIn('line 9: carol recorded 72, computed 74', output.getvalue())
+
+if __name__ == '__main__':
+    unittest.main()
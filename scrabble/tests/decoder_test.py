@@ -0,0 +1,90 @@
+import unittest
+import math
+from itertools import product
+
+from src.board import Board
+from src.move import Move
+from src.board_pos import Pos
+from src.lexicon import Lexicon
+
+LEXICON = Lexicon.fromwords([
+    'AT', 'TA', 'EH', 'HE', 'HO', 'OH', 'ON', 'NO', 'OR', 'FARM', 'FARMS', 'HORN', 'HORNS', 'PASTE', 'PASTA', 'PASTY',
+    'CAT', 'COT', 'CUT', 'HAT', 'HOT', 'HUT', 'CAN', 'CON', 'RAT', 'ROT', 'TAT', 'TOT',
+])
+
+def squares(move_str: str, distributions):
+    """
+    Maps the newly occupied squares of a move (given in Woogles format, with any letters) to distributions
+    """
+    return dict(zip(Move.fromstr(move_str).coordinates, distributions))
+
+class TestDecodeMove(unittest.TestCase):
+    def setUp(self):
+        self.board = Board()
+        self.assertTrue(self.board.apply_move(Move.fromstr('8E HORN')))
+        self.noisy = squares('G6 FA.M', [{'F': 0.6, 'E': 0.4}, {'A': 0.5, 'R': 0.3, 'H': 0.2}, {'M': 0.9, 'N': 0.1}])
+
+    def test_without_lexicon(self):
+        decoded = self.board.decode_move(self.noisy, k=3)
+        self.assertEqual([d.move.format() for d in decoded], ['G6 FA.M', 'G6 EA.M', 'G6 FR.M'])
+        self.assertAlmostEqual(decoded[0].log_likelihood, math.log(0.6 * 0.5 * 0.9))
+        self.assertEqual(decoded[0].evaluation.main_word, 'FARM')
+        self.assertEqual(decoded[0].n_invalid_words, 0)
+
+    def test_lexicon_prunes(self):
+        distributions = [{'F': 0.3, 'E': 0.7}, {'A': 0.4, 'R': 0.6}, {'N': 0.8, 'M': 0.2}]
+        decoded = self.board.decode_move(squares('G6 FA.M', distributions), k=3, lexicon=LEXICON)
+        self.assertEqual([d.move.format() for d in decoded], ['G6 FA.M'])
+        self.assertEqual(decoded[0].evaluation.words, {'FARM'})
+
+    def test_penalty(self):
+        distributions = [{'F': 0.3, 'E': 0.7}, {'A': 0.4, 'R': 0.6}, {'N': 0.8, 'M': 0.2}]
+        decoded = self.board.decode_move(squares('G6 FA.M', distributions), k=2, lexicon=LEXICON, invalid_word_penalty=1.0)
+        self.assertEqual([d.move.format() for d in decoded], ['G6 ER.N', 'G6 EA.N'])
+        self.assertEqual([d.n_invalid_words for d in decoded], [1, 1])
+        self.assertAlmostEqual(decoded[0].log_likelihood, math.log(0.7 * 0.6 * 0.8))
+
+        decoded = self.board.decode_move(squares('G6 FA.M', distributions), k=1, lexicon=LEXICON, invalid_word_penalty=10.0)
+        self.assertEqual(decoded[0].move.format(), 'G6 FA.M')
+
+    def test_cross_checks(self):
+        # The tile under the N of HORN must form ON or NO... with its perpendicular neighbour, here only O is allowed
+        decoded = self.board.decode_move(squares('9H O', [{'O': 0.2, 'A': 0.8}]), lexicon=LEXICON)
+        self.assertEqual([d.move.format() for d in decoded], ['9H O'])
+
+        decoded = self.board.decode_move(squares('I8 S', [{'S': 0.6, 'E': 0.4}]), lexicon=LEXICON)
+        self.assertEqual([d.evaluation.main_word for d in decoded], ['HORNS'])
+
+    def test_blanks(self):
+        decoded = self.board.decode_move(squares('G6 FA.M', [{'F': 0.9}, {'a': 0.7, '?': 0.3}, {'M': 0.9}]), k=2, lexicon=LEXICON)
+        self.assertEqual([d.move.format() for d in decoded], ['G6 Fa.M', 'G6 F?.M'])
+
+        # Undesignated blanks are only kept if some letter makes every word valid
+        decoded = self.board.decode_move(squares('G6 FA.M', [{'F': 0.9}, {'?': 1}, {'X': 1}]), lexicon=LEXICON)
+        self.assertEqual(decoded, [])
+
+    def test_matches_exhaustive(self):
+        distributions = [{'C': 0.5, 'H': 0.3, 'R': 0.2}, {'A': 0.4, 'O': 0.35, 'U': 0.25}, {'T': 0.6, 'N': 0.4}]
+        board = Board()
+        decoded = board.decode_move(squares('8G CAT', distributions), k=20, lexicon=LEXICON)
+
+        expected = []
+        for letters in product(*[d.items() for d in distributions]):
+            word = ''.join(letter for letter, _ in letters)
+            if word in LEXICON:
+                expected.append((word, math.prod(p for _, p in letters)))
+        expected.sort(key=lambda wp: -wp[1])
+        self.assertEqual([d.evaluation.main_word for d in decoded], [word for word, _ in expected])
+        for d, (_, p) in zip(decoded, expected):
+            self.assertAlmostEqual(d.log_likelihood, math.log(p))
+
+    def test_invalid_placement(self):
+        self.assertEqual(self.board.decode_move(squares('A1 AT', [{'A': 1}, {'T': 1}])), [])
+        self.assertEqual(self.board.decode_move({Pos(7, 4): {'A': 1}}), []) # Occupied
+        with self.assertRaises(ValueError):
+            self.board.decode_move({Pos(8, 4): {'.': 1}})
+        with self.assertRaises(ValueError):
+            self.board.decode_move({})
+
+if __name__ == '__main__':
+    unittest.main()
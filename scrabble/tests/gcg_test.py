@@ -0,0 +1,104 @@
+import unittest
+import tempfile
+from pathlib import Path
+
+from src.gcg import parse_gcg, read_gcg, replay, GCGError, TurnType
+from src.board import MoveError
+from src.move import Move
+
+GAMES = """#character-encoding UTF-8
+#player1 alice Alice
+#player2 bob Bob
+>alice: OTABCDE 8G TO +4 4
+>bob: ILTABCD G5 TIL. +5 5
+>alice: ILABCDE 7F I(L)L +5 9
+#note Q on the triple letter, scoring both ways
+>bob: QABCDEF 6F Q +62 67
+>alice: OXABCDE 9G OX +26 35
+>alice: OXABCDE -- -26 9
+>bob: ABCDEFG - +0 67
+>alice: OXABCDE 9G OX +26 35
+>alice: ABCDE (challenge) +5 40
+>bob: ABC -ABC +0 67
+>alice: ABCDE (time) -10 30
+>bob: (ABCDE) +20 87
+#character-encoding UTF-8
+#player1 carol Carol
+#player2 dave Dave
+>carol: AABDNNO 8H ABANDON +72 72
+>dave: EGGXXXX I8 EGG +5 5
+>carol: EX 9M EX +22 94
+"""
+
+class TestParse(unittest.TestCase):
+    def test_turns(self):
+        turns = list(parse_gcg(GAMES.splitlines()))
+        self.assertEqual(len(turns), 15)
+        self.assertEqual([turn.game for turn in turns], [0] * 12 + [1] * 3)
+        self.assertEqual([turn.type for turn in turns[:12]], [
+            TurnType.Placement, TurnType.Placement, TurnType.Placement, TurnType.Placement, TurnType.Placement,
+            TurnType.PhonyWithdrawn, TurnType.Pass, TurnType.Placement, TurnType.ChallengeBonus, TurnType.Exchange,
+            TurnType.TimePenalty, TurnType.EndRack,
+        ])
+
+        placement = turns[2]
+        self.assertEqual(placement.player, 'alice')
+        self.assertEqual(placement.rack, 'ILABCDE')
+        self.assertEqual(placement.move, Move.fromstr('7F I.L'))
+        self.assertEqual((placement.score, placement.cumulative, placement.line), (5, 9, 6))
+
+        self.assertEqual(turns[9].tiles, 'ABC')
+        self.assertEqual(turns[11].tiles, 'ABCDE')
+        self.assertEqual(turns[11].rack, '')
+
+    def test_lazy(self):
+        def lines():
+            yield '>alice: AB 8G TO +4 4'
+            raise RuntimeError("Should not be read")
+
+        turns = parse_gcg(lines())
+        self.assertEqual(next(turns).move, Move.fromstr('8G TO'))
+
+    def test_invalid(self):
+        for line in ['>alice: 8G TO', '>alice ABC 8G TO +4 4', '>alice: ABC 8G TO +x 4', '>alice: ABC XYZ TO +4 4']:
+            with self.assertRaises(GCGError):
+                list(parse_gcg([line]))
+
+    def test_file(self):
+        with tempfile.TemporaryDirectory() as dir:
+            path = Path(dir) / 'games.gcg'
+            path.write_text(GAMES)
+            self.assertEqual(list(read_gcg(path)), list(parse_gcg(GAMES.splitlines())))
+
+class TestReplay(unittest.TestCase):
+    def test_consistent_game(self):
+        summary = next(replay(parse_gcg(GAMES.splitlines())))
+        self.assertTrue(summary.is_consistent)
+        self.assertEqual(summary.players, ('alice', 'bob'))
+        self.assertEqual(summary.n_turns, 12)
+        self.assertEqual(summary.final_scores, {'alice': 30, 'bob': 87})
+
+        self.assertEqual(len(summary.challenges), 2)
+        withdrawn, bonus = summary.challenges
+        self.assertTrue(withdrawn.withdrawn)
+        self.assertSetEqual(withdrawn.words, set(['OX', 'TILTO', 'LOX']))
+        self.assertFalse(bonus.withdrawn)
+        self.assertSetEqual(bonus.words, set(['OX', 'TILTO', 'LOX']))
+
+    def test_inconsistent_game(self):
+        summaries = list(replay(parse_gcg(GAMES.splitlines())))
+        self.assertEqual(len(summaries), 2)
+        summary = summaries[1]
+        self.assertFalse(summary.is_consistent)
+
+        self.assertEqual(len(summary.score_mismatches), 1)
+        mismatch = summary.score_mismatches[0]
+        self.assertEqual(mismatch.turn.line, 20)
+        self.assertEqual((mismatch.computed_score, mismatch.computed_cumulative), (74, 74))
+
+        self.assertEqual(len(summary.invalid_moves), 1)
+        self.assertEqual(summary.invalid_moves[0].turn.line, 21)
+        self.assertEqual(summary.invalid_moves[0].error, MoveError.Occupied)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+import unittest
+import tempfile
+from pathlib import Path
+
+from src.journal import Journal, RECORD_SIZE
+from src.board import Board
+from src.move import Move
+
+class TestJournal(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.dir.name) / 'game.journal'
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def play(self, board):
+        for move in ['8E HORN', 'G6 FA.M', '10E PAS?E']:
+            self.assertTrue(board.apply_move(Move.fromstr(move)))
+        self.assertTrue(board.set_blanks('t'))
+        self.assertTrue(board.apply_move(Move.fromstr('11I S')))
+        board.undo_move()
+        self.assertTrue(board.apply_move(Move.fromstr('11I S')))
+        self.assertTrue(board.apply_move(Move.fromstr('E10 .IT')))
+        self.assertEqual(board.retract_move(3), [])
+        self.assertEqual(board.replace_move(0, Move.fromstr('8E HORNS')), [])
+
+    def assertSameBoard(self, board, expected):
+        self.assertEqual(board.to_bytes(), expected.to_bytes())
+        self.assertEqual(board.position_hash, expected.position_hash)
+
+    def test_blanks_set_on_move(self):
+        board = Journal.recover(self.path)
+        move = Move.fromstr('8G C?T')
+        self.assertTrue(board.apply_move(move))
+        self.assertTrue(move.set_blanks('a'))
+        self.assertTrue(board.apply_move(Move.fromstr('H9 T')))
+        board.journal.close()
+        self.assertSameBoard(Journal.recover(self.path), board)
+
+    def test_recover(self):
+        board = Journal.recover(self.path)
+        self.play(board)
+        self.assertEqual(board.journal.n_records, 10)
+        self.assertEqual(self.path.stat().st_size, 10 * RECORD_SIZE)
+        board.journal.close()
+
+        recovered = Journal.recover(self.path)
+        self.assertSameBoard(recovered, board)
+        self.assertEqual(recovered.get_challenge_words(), {'PIT'})
+
+        # Recovered boards keep logging
+        self.assertTrue(recovered.apply_move(Move.fromstr('13E ZA')))
+        recovered.journal.close()
+        self.assertEqual(Journal.recover(self.path).get_score(), recovered.get_score())
+
+    def test_checkpoint(self):
+        board = Journal.recover(self.path)
+        for move in ['8E HORN', 'G6 FA.M']:
+            self.assertTrue(board.apply_move(Move.fromstr(move)))
+        board.journal.checkpoint(board)
+        self.assertTrue(board.apply_move(Move.fromstr('10E PASTE')))
+        board.journal.close()
+
+        with Journal(self.path) as journal:
+            self.assertSameBoard(journal.load(), board)
+        # Only the tail after the snapshot is replayed, so corrupting earlier records has no effect
+        with open(self.path, 'r+b') as f:
+            f.write(b'\0' * RECORD_SIZE)
+        with self.assertRaises(ValueError):
+            Journal(self.path).load() # The snapshot now covers more records than remain valid
+
+    def test_torn_write(self):
+        board = Journal.recover(self.path)
+        self.play(board)
+        board.journal.close()
+        with open(self.path, 'ab') as f:
+            f.write(b'\x01' * (RECORD_SIZE // 2))
+        with open(self.path, 'r+b') as f:
+            f.seek(9 * RECORD_SIZE + 3)
+            f.write(b'\xff') # Corrupt the last complete record
+
+        journal = Journal(self.path)
+        self.assertEqual(journal.n_records, 9)
+        self.assertEqual(self.path.stat().st_size, 9 * RECORD_SIZE)
+        recovered = journal.load()
+        self.assertEqual([m.format() for m in recovered.moves()], ['8E HORN', 'G6 FA.M', '10E PAStE', 'E11 IT'])
+        journal.close()
+
+    def test_attach(self):
+        board = Board()
+        self.assertTrue(board.apply_move(Move.fromstr('8E HORN')))
+        journal = Journal(self.path)
+        board.journal = journal
+        self.assertTrue(board.apply_move(Move.fromstr('G6 FA.M')))
+        journal.close()
+        self.assertSameBoard(Journal.recover(self.path), board)
+
+    def test_fork_not_logged(self):
+        board = Journal.recover(self.path)
+        self.assertTrue(board.apply_move(Move.fromstr('8E HORN')))
+        fork = board.fork()
+        self.assertIsNone(fork.journal)
+        self.assertTrue(fork.apply_move(Move.fromstr('G6 FA.M')))
+        self.assertEqual(board.journal.n_records, 1)
+        board.journal.close()
+
+if __name__ == '__main__':
+    unittest.main()
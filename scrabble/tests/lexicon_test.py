@@ -0,0 +1,184 @@
+import unittest
+import pickle
+import tempfile
+from pathlib import Path
+
+from src.lexicon import Lexicon
+from src.__main__ import main
+from src.board import Board
+from src.move import Move
+
+class TestContains(unittest.TestCase):
+    def setUp(self):
+        self.lexicon = Lexicon.fromwords(['cat', 'CATS', ' at\n', 'bat', 'bats', '', 'qi'])
+
+    def test_words(self):
+        self.assertEqual(len(self.lexicon), 6)
+        for word in ['CAT', 'cats', 'AT', 'BAT', 'BATS', 'QI']:
+            self.assertIn(word, self.lexicon)
+
+    def test_non_words(self):
+        for word in ['', 'CA', 'Q', 'ATS', 'BATSS', 'C?T']:
+            self.assertNotIn(word, self.lexicon)
+
+    def test_empty(self):
+        lexicon = Lexicon.fromwords([])
+        self.assertEqual(len(lexicon), 0)
+        self.assertNotIn('A', lexicon)
+
+    def test_invalid_word(self):
+        with self.assertRaises(ValueError):
+            Lexicon.fromwords(['CAN\'T'])
+
+    def test_minimal(self):
+        # Common suffixes are shared: the paths through CAT(S) and BAT(S) merge after the first letter
+        self.assertEqual(len(list(self.lexicon.edges(self.lexicon.root))), 4)
+        self.assertEqual(self.lexicon.follow(self.lexicon.root, 2), self.lexicon.follow(self.lexicon.root, 3))
+
+class TestCrossCheck(unittest.TestCase):
+    def setUp(self):
+        self.lexicon = Lexicon.fromwords(['CAT', 'CUT', 'COT', 'AT', 'BAT', 'BATS', 'TA'])
+
+    def test_middle(self):
+        self.assertSetEqual(self.lexicon.cross_check('C', 'T'), set(['A', 'U', 'O']))
+
+    def test_prefix_only(self):
+        self.assertSetEqual(self.lexicon.cross_check('BAT', ''), set(['S']))
+        self.assertSetEqual(self.lexicon.cross_check('T', ''), set(['A']))
+
+    def test_suffix_only(self):
+        self.assertSetEqual(self.lexicon.cross_check('', 'AT'), set(['B', 'C']))
+
+    def test_none(self):
+        self.assertSetEqual(self.lexicon.cross_check('X', ''), set())
+        self.assertSetEqual(self.lexicon.cross_check('C', '?'), set())
+
+    def test_mask(self):
+        self.assertEqual(self.lexicon.cross_check_mask('C', 'T'), (1 << 1) | (1 << 15) | (1 << 21))
+        self.assertEqual(self.lexicon.cross_check_mask('X', ''), 0)
+
+class TestPrefix(unittest.TestCase):
+    def setUp(self):
+        self.lexicon = Lexicon.fromwords(['CAT', 'CATS', 'CATTLE', 'CUT', 'AT'])
+
+    def test_has_prefix(self):
+        for prefix in ['', 'C', 'CA', 'CAT', 'catt', 'CATTLE']:
+            self.assertTrue(self.lexicon.has_prefix(prefix))
+        for prefix in ['B', 'CATX', 'CATTLES']:
+            self.assertFalse(self.lexicon.has_prefix(prefix))
+
+    def test_words_with_prefix(self):
+        self.assertEqual(list(self.lexicon.words_with_prefix('CA')), ['CAT', 'CATS', 'CATTLE'])
+        self.assertEqual(list(self.lexicon.words_with_prefix('cat')), ['CAT', 'CATS', 'CATTLE'])
+        self.assertEqual(list(self.lexicon.words_with_prefix()), ['AT', 'CAT', 'CATS', 'CATTLE', 'CUT'])
+        self.assertEqual(list(self.lexicon.words_with_prefix('X')), [])
+
+class TestFile(unittest.TestCase):
+    WORDS = ['AA', 'AAH', 'AAHED', 'ABA', 'ZZZ', 'QI', 'QAT', 'QATS']
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.word_list = Path(self.dir.name) / 'words.txt'
+        self.word_list.write_text('\n'.join(self.WORDS) + '\n')
+        self.path = Path(self.dir.name) / 'words.dawg'
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_round_trip(self):
+        Lexicon.compile(self.word_list, self.path)
+        with Lexicon.load(self.path) as lexicon:
+            self.assertEqual(len(lexicon), len(self.WORDS))
+            self.assertEqual(list(lexicon.words_with_prefix()), sorted(self.WORDS))
+            self.assertIn('QAT', lexicon)
+            self.assertNotIn('QA', lexicon)
+            self.assertSetEqual(lexicon.cross_check('QA', 'S'), set(['T']))
+
+    def test_matches_in_memory(self):
+        lexicon = Lexicon.fromfile(self.word_list)
+        lexicon.save(self.path)
+        with Lexicon.load(self.path) as loaded:
+            self.assertEqual(list(loaded._edges), list(lexicon._edges))
+
+    def test_pickle(self):
+        Lexicon.compile(self.word_list, self.path)
+        with Lexicon.load(self.path) as lexicon:
+            copy = pickle.loads(pickle.dumps(lexicon))
+            self.assertIsNotNone(copy._buffer)
+            self.assertEqual(list(copy.words_with_prefix()), sorted(self.WORDS))
+            copy.close()
+
+        in_memory = pickle.loads(pickle.dumps(Lexicon.fromwords(self.WORDS)))
+        self.assertIn('AAHED', in_memory)
+
+    def test_command_line(self):
+        self.assertEqual(main(['compile-lexicon', str(self.word_list), str(self.path)]), 0)
+        with Lexicon.load(self.path) as lexicon:
+            self.assertEqual(len(lexicon), len(self.WORDS))
+        self.assertEqual(main(['unknown']), 2)
+
+    def test_invalid_file(self):
+        self.path.write_bytes(b'not a lexicon file at all')
+        with self.assertRaises(ValueError):
+            Lexicon.load(self.path)
+
+class TestInvalidWords(unittest.TestCase):
+    def test_invalid_words(self):
+        lexicon = Lexicon.fromwords(['TO', 'TILT', 'ILL', 'LO'])
+        board = Board()
+        for move, expected in zip(['8G TO', 'G5 TIL.', '7F I.L', '6F Q'], [set(), set(), set(), set(['QI'])]):
+            self.assertTrue(board.apply_move(Move.fromstr(move)))
+            self.assertSetEqual(board.get_invalid_words(lexicon), expected)
+
+        self.assertTrue(board.apply_move(Move.fromstr('5F ?')))
+        self.assertIsNone(board.get_invalid_words(lexicon))
+
+class TestInferBlanks(unittest.TestCase):
+    def setUp(self):
+        self.lexicon = Lexicon.fromwords(['HORN', 'HORNS', 'FARM', 'FARMS', 'PASTE', 'PASTA', 'PASTY', 'PASSE', 'AT', 'TA', 'ET', 'YE', 'AE'])
+        self.board = Board()
+        for move in ['8E HORN', 'G6 FA.M']:
+            self.assertTrue(self.board.apply_move(Move.fromstr(move)))
+
+    def test_single_blank(self):
+        self.assertTrue(self.board.apply_move(Move.fromstr('10E PAS?E')))
+        self.assertEqual(self.board.infer_blanks(self.lexicon), ['s', 't'])
+        self.assertTrue(self.board.set_blanks('t'))
+        self.assertEqual(self.board.get_invalid_words(self.lexicon), set())
+
+    def test_designated_and_unset_blanks(self):
+        self.assertTrue(self.board.apply_move(Move.fromstr('10E PAs?E')))
+        designations = self.board.infer_blanks(self.lexicon)
+        self.assertEqual(designations, ['s', 't'])
+        self.assertTrue(self.board.set_blanks(designations[1]))
+        self.assertEqual(self.board.get_challenge_words(), {'PASTE', 'FARMS'})
+        self.assertEqual(self.board.get_invalid_words(self.lexicon), set())
+
+    def test_cross_check(self):
+        self.assertTrue(self.board.apply_move(Move.fromstr('10E PAST?')))
+        self.assertEqual(self.board.infer_blanks(self.lexicon), ['a', 'e', 'y'])
+
+        # Below the last letter, each designation must also form a word downwards
+        self.board.undo_move()
+        self.assertTrue(self.board.apply_move(Move.fromstr('10E PASTE')))
+        self.assertTrue(self.board.apply_move(Move.fromstr('I11 ?')))
+        self.assertEqual(self.board.infer_blanks(self.lexicon), ['t'])
+
+    def test_two_blanks(self):
+        self.assertTrue(self.board.apply_move(Move.fromstr('10E PA??E')))
+        self.assertEqual(self.board.infer_blanks(self.lexicon), ['ss', 'st'])
+
+    def test_invalid(self):
+        self.assertTrue(self.board.apply_move(Move.fromstr('10E QAS?E')))
+        self.assertEqual(self.board.infer_blanks(self.lexicon), [])
+
+        self.board.undo_move()
+        self.assertTrue(self.board.apply_move(Move.fromstr('10E PASTE')))
+        self.assertEqual(self.board.infer_blanks(self.lexicon), [''])
+
+    def test_empty_board(self):
+        with self.assertRaises(ValueError):
+            Board().infer_blanks(self.lexicon)
+
+if __name__ == '__main__':
+    unittest.main()
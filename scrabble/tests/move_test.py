@@ -52,5 +52,39 @@ class TestDirection(unittest.TestCase):
         move = Move([Tile('T'), Tile('O')], [Pos(11, 2), Pos(12, 2)])
         self.assertEqual(move.direction, Direction.Vertical)
 
+class TestDerived(unittest.TestCase):
+    def test_mask(self):
+        move = Move.fromstr('H8 EGG')
+        self.assertEqual(move.mask, sum(1 << Pos(row, 7).index for row in [7, 8, 9]))
+        self.assertTrue(move.in_bounds)
+
+        out_of_bounds = Move([Tile('A'), Tile('B')], [Pos(14, 14), Pos(14, 15)])
+        self.assertFalse(out_of_bounds.in_bounds)
+        self.assertEqual(out_of_bounds.mask, 1 << Pos(14, 14).index)
+
+    def test_blanks(self):
+        move = Move.fromstr('8H ?A?')
+        self.assertEqual(move.n_of_unset_blanks, 2)
+        self.assertFalse(move.set_blanks('b'))
+        self.assertEqual(move.n_of_unset_blanks, 2)
+        self.assertTrue(move.set_blanks('bd'))
+        self.assertEqual(move.n_of_unset_blanks, 0)
+        self.assertEqual(move.format(), '8H bAd')
+
+    def test_mixed_blanks(self):
+        move = Move.fromstr('8E CA?t')
+        self.assertEqual(move.n_of_unset_blanks, 1)
+        self.assertTrue(move.set_blanks('r'))
+        self.assertEqual(move.format(), '8E CArt')
+
+    def test_invalid_direction(self):
+        move = Move([Tile('A'), Tile('B')], [Pos(1, 1), Pos(2, 2)])
+        self.assertFalse(move.is_valid)
+        with self.assertRaises(AssertionError):
+            move.direction
+
+    def test_slots(self):
+        self.assertFalse(hasattr(Move.fromstr('H8 EGG'), '__dict__'))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
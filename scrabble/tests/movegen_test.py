@@ -0,0 +1,96 @@
+import unittest
+from itertools import permutations
+
+from src.board import Board
+from src.move import Move
+from src.tile import Tile
+from src.board_pos import Pos, Direction
+from src.lexicon import Lexicon
+
+WORDS = [
+    'AA', 'AB', 'AD', 'AE', 'AG', 'AH', 'AI', 'AL', 'AM', 'AN', 'AR', 'AS', 'AT', 'BA', 'BE', 'BO', 'DA', 'DE', 'DO',
+    'ED', 'EH', 'EL', 'EM', 'EN', 'ER', 'ES', 'HA', 'HE', 'HI', 'HO', 'IN', 'IS', 'IT', 'MA', 'ME', 'MO', 'NA', 'NE',
+    'NO', 'OD', 'OE', 'OF', 'OH', 'OM', 'ON', 'OR', 'OS', 'PA', 'PE', 'RE', 'SO', 'TA', 'TO', 'EAT', 'EATS', 'ETA',
+    'FARM', 'FARMS', 'HORN', 'HORNS', 'MOB', 'NOT', 'PASTE', 'PASTES', 'RAT', 'RATE', 'RATES', 'SAT', 'SEA', 'SEAT',
+    'SET', 'TAE', 'TAR', 'TAS', 'TEA', 'TEAS', 'TES', 'ARE', 'ARES', 'ART', 'ARTS', 'EAR', 'EARS', 'ERA', 'ERAS',
+]
+
+def brute_force(board: Board, rack: str, lexicon: Lexicon):
+    """
+    Finds all legal moves by trying every ordering of every subset of the rack from every square in both directions
+    """
+    found = set()
+    for n in range(1, len(rack) + 1):
+        for letters in set(permutations(rack, n)):
+            for dir in Direction:
+                for start in range(Board.N_SQUARES):
+                    pos = Pos.fromindex(start)
+                    tiles, coords = [], []
+                    for letter in letters:
+                        while pos is not None and board.get_tile(pos) is not None:
+                            pos = pos.step(dir)
+                        if pos is None:
+                            break
+                        tiles.append(Tile(letter))
+                        coords.append(pos)
+                        pos = pos.step(dir)
+                    if len(tiles) < n:
+                        continue
+
+                    evaluation = board.evaluate(Move(tiles, coords))
+                    if evaluation.is_valid and all(word in lexicon for word in evaluation.words):
+                        found.add((repr(evaluation.move), tuple(coords), evaluation.score))
+    return found
+
+class TestGenerateMoves(unittest.TestCase):
+    def setUp(self):
+        self.lexicon = Lexicon.fromwords(WORDS)
+        self.board = Board()
+        for move in ['8E HORN', 'G6 FA.M', '10E PASTE']:
+            self.assertTrue(self.board.apply_move(Move.fromstr(move)))
+
+    def generated(self, rack: str):
+        return [(repr(e.move), tuple(e.move.coordinates), e.score) for e in self.board.generate_moves(rack, self.lexicon)]
+
+    def test_matches_brute_force(self):
+        for rack in ['EAT', 'SRE', 'OB']:
+            generated = self.generated(rack)
+            self.assertEqual(len(generated), len(set(generated)), "Moves should be generated once")
+            self.assertSetEqual(set(generated), brute_force(self.board, rack, self.lexicon))
+
+    def test_empty_board(self):
+        board = Board()
+        evaluations = list(board.generate_moves('TAE', self.lexicon))
+        self.assertTrue(all(Pos(7, 7) in e.move.coordinates for e in evaluations))
+        self.assertEqual(set(e.main_word for e in evaluations), set(['AE', 'AT', 'EAT', 'ETA', 'TA', 'TAE', 'TEA']))
+
+    def test_blank(self):
+        evaluations = list(self.board.generate_moves('?', self.lexicon))
+        self.assertTrue(all(e.move.n_of_unset_blanks == 0 for e in evaluations))
+        self.assertTrue(all(tile.is_blank for e in evaluations for tile, _ in e.move))
+        self.assertIn('HORNS', [e.main_word for e in evaluations])
+        self.assertTrue(all(e.words is not None and all(word in self.lexicon for word in e.words) for e in evaluations))
+
+    def test_undesignated_blank_on_board(self):
+        lexicon = Lexicon.fromwords(['AS', 'CAT', 'CATS', 'CUT', 'CUTS', 'SAT'])
+        board = Board()
+        self.assertTrue(board.apply_move(Move.fromstr('8G C?T')))
+        generated = sorted(e.move.format() for e in board.generate_moves('S', lexicon))
+        self.assertEqual(generated, ['8J S', '9H S']) # Through the blank as CATS or CUTS, and forming AS
+
+        self.assertTrue(board.set_blanks('a'))
+        self.assertEqual(sorted(e.move.format() for e in board.generate_moves('S', lexicon)), generated)
+
+    def test_invalid_rack(self):
+        # Raised by the call itself, before any move is generated
+        with self.assertRaises(ValueError):
+            self.board.generate_moves('', self.lexicon)
+
+        with self.assertRaises(ValueError):
+            self.board.generate_moves('ABCDEFGH', self.lexicon)
+
+        with self.assertRaises(ValueError):
+            self.board.generate_moves('A.', self.lexicon)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,157 @@
+import unittest
+import asyncio
+
+from src.board import Board
+from src.move import Move
+from src.session import SessionManager, TableEvent, EventType
+
+GAME = ['8E HORN', 'G6 FA.M', '9H E', '9I AT']
+
+async def play(manager: SessionManager, table, moves=GAME):
+    """
+    Fake event source feeding a table's moves to the manager as they are captured
+    """
+    for move in moves:
+        await manager.submit(TableEvent(table, EventType.Apply, Move.fromstr(move)))
+
+class TestSessionManager(unittest.IsolatedAsyncioTestCase):
+    async def test_many_tables(self):
+        manager = SessionManager(queue_size=2, batch_size=2)
+        for table in range(120):
+            manager.add_table(table)
+        subscription = manager.subscribe(maxsize=1000)
+
+        async with manager:
+            await asyncio.gather(*(play(manager, table) for table in manager.tables))
+
+        expected = Board()
+        for move in GAME:
+            self.assertTrue(expected.apply_move(Move.fromstr(move)))
+        for table in manager.tables:
+            self.assertEqual(manager.board(table).position_hash, expected.position_hash)
+            self.assertEqual(list(manager.board(table).moves()), list(expected.moves()))
+
+        updates = {}
+        for _ in range(120 * len(GAME)):
+            update = subscription.get_nowait()
+            self.assertTrue(update.ok)
+            updates.setdefault(update.table, []).append(update)
+        self.assertEqual(subscription.dropped, 0)
+        for table_updates in updates.values():
+            self.assertEqual([u.event.move.format() for u in table_updates], GAME)
+            self.assertEqual([u.n_moves for u in table_updates], [1, 2, 3, 4])
+            self.assertEqual([u.score for u in table_updates], [expected.get_score(n) for n in range(4)])
+
+    async def test_backpressure(self):
+        manager = SessionManager(queue_size=2)
+        manager.add_table('a')
+        manager.submit_nowait(TableEvent('a', EventType.Undo))
+        manager.submit_nowait(TableEvent('a', EventType.Undo))
+        with self.assertRaises(asyncio.QueueFull):
+            manager.submit_nowait(TableEvent('a', EventType.Undo))
+
+        # The producer waits until the worker makes room
+        producer = asyncio.create_task(manager.submit(TableEvent('a', EventType.Undo)))
+        await asyncio.sleep(0)
+        self.assertFalse(producer.done())
+        manager.start()
+        await producer
+        await manager.stop()
+
+    async def test_busy_table_does_not_stall_others(self):
+        manager = SessionManager(queue_size=1000, batch_size=4)
+        manager.add_table('busy')
+        manager.add_table('quiet')
+        subscription = manager.subscribe()
+        for _ in range(500):
+            manager.submit_nowait(TableEvent('busy', EventType.Undo))
+        manager.submit_nowait(TableEvent('quiet', EventType.Apply, Move.fromstr('8E HORN')))
+
+        async with manager:
+            pass
+
+        tables = []
+        while True:
+            try:
+                tables.append(subscription.get_nowait().table)
+            except asyncio.QueueEmpty:
+                break
+        self.assertEqual(len(tables), 501)
+        self.assertLess(tables.index('quiet'), 10)
+
+    async def test_corrections(self):
+        manager = SessionManager()
+        manager.add_table(1)
+        subscription = manager.subscribe()
+        async with manager:
+            await play(manager, 1, ['8E HORN', 'G6 FA.M', '9H E'])
+            await manager.submit(TableEvent(1, EventType.Retract, move_index=1))
+            await manager.submit(TableEvent(1, EventType.Replace, Move.fromstr('8E HORNS'), move_index=0))
+            await manager.submit(TableEvent(1, EventType.Apply, Move.fromstr('8E HORN')))
+
+        updates = [subscription.get_nowait() for _ in range(6)]
+        retraction, replacement, invalid = updates[3:]
+        self.assertTrue(retraction.ok)
+        self.assertEqual(retraction.n_moves, 2)
+        self.assertTrue(replacement.ok)
+        self.assertEqual(replacement.n_moves, 2)
+        self.assertFalse(invalid.ok)
+        self.assertIsNotNone(invalid.error)
+        self.assertEqual([m.format() for m in manager.board(1).moves()], ['8E HORNS', '9H E'])
+
+    async def test_errors_are_published(self):
+        manager = SessionManager()
+        manager.add_table(1)
+        subscription = manager.subscribe()
+        async with manager:
+            await manager.submit(TableEvent(1, EventType.Undo))
+            await manager.submit(TableEvent(1, EventType.Retract, move_index=3))
+        undo, retract = subscription.get_nowait(), subscription.get_nowait()
+        self.assertFalse(undo.ok)
+        self.assertFalse(retract.ok)
+        self.assertIsNone(undo.score)
+        with self.assertRaises(KeyError):
+            manager.submit_nowait(TableEvent(2, EventType.Undo))
+
+    async def test_malformed_events_rejected(self):
+        manager = SessionManager()
+        manager.add_table(1)
+        for event in [TableEvent(1, EventType.Apply), TableEvent(1, EventType.Retract), TableEvent(1, EventType.Replace, move_index=0)]:
+            with self.assertRaises(ValueError):
+                manager.submit_nowait(event)
+            with self.assertRaises(ValueError):
+                await manager.submit(event)
+
+    async def test_worker_survives_unexpected_errors(self):
+        class FaultyBoard(Board):
+            def undo_move(self):
+                raise KeyError('faulty')
+
+        manager = SessionManager()
+        manager.add_table(1, FaultyBoard())
+        subscription = manager.subscribe()
+        async with manager:
+            await manager.submit(TableEvent(1, EventType.Undo))
+            manager._queues[1].put_nowait(TableEvent(1, EventType.Apply)) # Bypasses validation
+            await play(manager, 1, GAME[:1])
+            await asyncio.wait_for(manager.join(), timeout=1)
+
+        undo, malformed, apply = [subscription.get_nowait() for _ in range(3)]
+        self.assertFalse(undo.ok)
+        self.assertIn('KeyError', undo.error)
+        self.assertFalse(malformed.ok)
+        self.assertTrue(apply.ok)
+        self.assertEqual(apply.n_moves, 1)
+
+    async def test_slow_subscriber_drops_oldest(self):
+        manager = SessionManager()
+        manager.add_table(1)
+        subscription = manager.subscribe(maxsize=2)
+        async with manager:
+            await play(manager, 1)
+        self.assertEqual(subscription.dropped, 2)
+        self.assertEqual(subscription.get_nowait().event.move.format(), GAME[2])
+        self.assertEqual(subscription.get_nowait().n_moves, 4)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,8 @@
 import unittest
+import copy
+import pickle
 
-from src.tile import Tile
+from src.tile import Tile, BLANK_FLAG, EMPTY_CODE, CODE_VALUES
  
 class TestInvalidTiles(unittest.TestCase):
     def test_lowercase_letter(self):
@@ -46,5 +48,59 @@ class TestFromString(unittest.TestCase):
         with self.assertRaises(ValueError):
             Tile.fromstr('.')
 
+class TestCode(unittest.TestCase):
+    def test_round_trip(self):
+        for tile_str in ['A', 'Q', 'Z', '?', 'c']:
+            tile = Tile.fromstr(tile_str)
+            self.assertEqual(Tile.fromcode(tile.code).format(), tile_str)
+
+    def test_blank_flag(self):
+        self.assertEqual(Tile('?').code, BLANK_FLAG)
+        self.assertEqual(Tile.fromstr('b').code, BLANK_FLAG | Tile('B').code)
+        self.assertEqual(CODE_VALUES[Tile.fromstr('z').code], 0)
+        self.assertEqual(CODE_VALUES[Tile('Z').code], 10)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            Tile.fromcode(EMPTY_CODE)
+
+        with self.assertRaises(ValueError):
+            Tile.fromcode(27)
+
+class TestInterning(unittest.TestCase):
+    def test_letters_shared(self):
+        self.assertIs(Tile('A'), Tile('a'))
+        self.assertIs(Tile.fromstr('Q'), Tile('Q'))
+        self.assertIs(Tile.fromcode(Tile('Z').code), Tile('Z'))
+        self.assertIs(copy.deepcopy(Tile('E')), Tile('E'))
+        self.assertIs(pickle.loads(pickle.dumps(Tile('E'))), Tile('E'))
+
+    def test_blanks_separate(self):
+        blank = Tile('?')
+        self.assertIsNot(blank, Tile('?'))
+        blank.set_letter('x')
+        self.assertFalse(Tile('?').is_set)
+        self.assertEqual(Tile.fromstr('x').code, blank.code)
+
+        for other in [copy.copy(blank), pickle.loads(pickle.dumps(blank))]:
+            self.assertIsNot(other, blank)
+            self.assertEqual(other.format(), 'x')
+
+    def test_immutable(self):
+        with self.assertRaises(AttributeError):
+            Tile('A')._letter = 'B'
+        with self.assertRaises(AttributeError):
+            Tile('?')._code = 1
+        with self.assertRaises(ValueError):
+            Tile('A').set_letter('b')
+        self.assertFalse(hasattr(Tile('A'), '__dict__'))
+
+    def test_precomputed(self):
+        for letter, value in Tile.LETTER_VALUES.items():
+            tile = Tile(letter)
+            self.assertEqual(tile.value, value)
+            self.assertEqual(tile.is_blank, letter == '?')
+            self.assertEqual(tile.is_set, letter != '?')
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file